@@ -9,6 +9,10 @@ from boxing.db import db
 from boxing.models.boxers_model import Boxers
 from boxing.models.ring_model import RingModel
 from boxing.models.user_model import Users
+from boxing.utils.api_utils import (
+    create_random_provider, get_random_provider, prefetcher, RandomOrgProvider, register_seed_header,
+    set_random_provider
+)
 from boxing.utils.logger import configure_logger
 
 
@@ -20,10 +24,23 @@ def create_app(config_class=ProductionConfig):
 
     app.config.from_object(config_class)
 
+    # Select where get_random draws from; an invalid setting fails here, before anything starts
+    if app.config.get("RANDOM_PROVIDER"):
+        set_random_provider(create_random_provider(app.config["RANDOM_PROVIDER"], seed=app.config.get("RANDOM_SEED")))
+
     db.init_app(app)  # Initialize db with app
     with app.app_context():
         db.create_all()  # Recreate all tables
 
+    # Keep random.org numbers ready so fights don't wait on the network
+    if isinstance(get_random_provider(), RandomOrgProvider) and app.config.get("RANDOM_PREFETCH_SIZE"):
+        prefetcher.size = app.config["RANDOM_PREFETCH_SIZE"]
+        prefetcher.start()
+
+    # Let load tests and replays pin a request's random draws with a seed header
+    if app.config.get("RANDOM_SEED_HEADER"):
+        register_seed_header(app, app.config["RANDOM_SEED_HEADER"])
+
     login_manager = LoginManager()
     login_manager.init_app(app)
     login_manager.login_view = "login"
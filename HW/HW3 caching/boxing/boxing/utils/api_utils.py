@@ -1,7 +1,20 @@
+from abc import ABC, abstractmethod
+import asyncio
+from collections import deque
+from concurrent.futures import Future
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
 import logging
 import os
+import random
+import secrets
+import threading
+from typing import Deque, Iterator, List, Optional, Union
+
+from flask import Flask, g, request
 import requests
 
+from boxing.utils.http_client import CircuitOpenError, http_client
 from boxing.utils.logger import configure_logger
 
 
@@ -11,46 +24,447 @@ configure_logger(logger)
 
 RANDOM_ORG_URL = os.getenv("RANDOM_ORG_URL",
                            "https://www.random.org/decimal-fractions/?num=1&dec=2&col=1&format=plain&rnd=new")
+RANDOM_ORG_BATCH_URL = os.getenv("RANDOM_ORG_BATCH_URL",
+                                 "https://www.random.org/decimal-fractions/?dec=2&col=1&format=plain&rnd=new")
+RANDOM_ORG_MAX_BATCH = 10_000  # The most numbers random.org returns per request
+RANDOM_PROVIDER = os.getenv("RANDOM_PROVIDER", "random.org")
+RANDOM_SEED = os.getenv("RANDOM_SEED")
+RANDOM_PREFETCH_SIZE = int(os.getenv("RANDOM_PREFETCH_SIZE", 100))
+RANDOM_PREFETCH_LOW_WATER = int(os.getenv("RANDOM_PREFETCH_LOW_WATER", 25))
+
+
+def _local_random() -> float:
+    """Returns a random float between 0 and 1, to two decimals like random.org, from the local CSPRNG."""
+    return secrets.randbelow(100) / 100
+
+
+def _fetch_randoms(url: str) -> List[float]:
+    """
+    Fetches the floats random.org lists, one per line, at a decimal-fractions URL.
+
+    Args:
+        url (str): The random.org URL, including num.
+
+    Returns:
+        List[float]: The random numbers.
+
+    Raises:
+        CircuitOpenError: If the circuit breaker is open.
+        ValueError: If the response from random.org is not a list of valid floats.
+        RuntimeError: If the request to random.org fails due to a timeout or other request-related error.
+    """
+    try:
+        logger.info(f"Fetching random numbers from {url}")
+
+        response = http_client.get(url, timeout=5)
+
+    except CircuitOpenError:
+        raise
+
+    except requests.exceptions.Timeout:
+        logger.error("Request to random.org timed out.")
+        raise RuntimeError("Request to random.org timed out.")
+
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Request to random.org failed: {e}")
+        raise RuntimeError(f"Request to random.org failed: {e}")
+
+    random_number_str = response.text.strip()
+    try:
+        random_numbers = [float(line) for line in random_number_str.split()]
+    except ValueError:
+        random_numbers = []
+    if not random_numbers:
+        logger.error(f"Invalid response from random.org: {random_number_str}")
+        raise ValueError(f"Invalid response from random.org: {random_number_str}")
+
+    logger.info(f"Successfully fetched {len(random_numbers)} random numbers")
+    return random_numbers
+
+
+class RandomPrefetcher:
+    """
+    Keeps a queue of random.org numbers filled from a background event loop.
+
+    start() runs an asyncio event loop on a daemon thread. Whenever the queue
+    drops to low_water, a fill is scheduled on that loop, which tops the queue
+    up to size with a single batched request. take() never waits: it pops a
+    ready number, or returns None when the queue is empty.
+
+    """
+
+    def __init__(self, size: int = RANDOM_PREFETCH_SIZE, low_water: int = RANDOM_PREFETCH_LOW_WATER):
+        """Initializes a stopped prefetcher with an empty queue.
+
+        Args:
+            size (int): The number of values the queue is topped up to.
+            low_water (int): The queue length at which a fill is scheduled.
+
+        """
+        if size <= 0:
+            raise ValueError("size must be a positive integer.")
+
+        self.size = size
+        self.low_water = low_water
+        self._queue: Deque[float] = deque()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._filling: Optional[Future] = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    def start(self) -> None:
+        """Starts the event loop thread and the first fill."""
+        with self._lock:
+            if self._loop is not None:
+                return
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever, name="random-prefetch", daemon=True)
+            self._thread.start()
+            self._schedule_fill()
+        logger.info(f"Started random number prefetcher (size {self.size})")
+
+    def stop(self) -> None:
+        """Stops the event loop thread. Values already queued are kept."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = self._filling = None
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+        logger.info("Stopped random number prefetcher")
+
+    def _schedule_fill(self) -> None:
+        """Schedules a fill on the event loop unless one is running. Must hold the lock."""
+        if self._loop is None or (self._filling is not None and not self._filling.done()):
+            return
+        self._filling = asyncio.run_coroutine_threadsafe(self.fill(), self._loop)
+
+    async def fill(self) -> int:
+        """
+        Tops the queue up to size with one request to random.org.
+
+        The request runs on a worker thread, so the event loop stays free. Failures are
+        logged and retried at the next take().
+
+        Returns:
+            int: The number of values added.
+        """
+        missing = self.size - len(self._queue)
+        if missing <= 0:
+            return 0
+        try:
+            random_numbers = await asyncio.to_thread(_fetch_randoms, f"{RANDOM_ORG_BATCH_URL}&num={missing}")
+        except (CircuitOpenError, RuntimeError, ValueError) as e:
+            logger.warning(f"Prefetching random numbers failed: {e}")
+            return 0
+        self._queue.extend(random_numbers)
+        return len(random_numbers)
+
+    def take(self) -> Optional[float]:
+        """Pops a prefetched number, or returns None if none is ready, scheduling a fill at low_water."""
+        with self._lock:
+            random_number = self._queue.popleft() if self._queue else None
+            if random_number is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            if len(self._queue) <= self.low_water:
+                self._schedule_fill()
+        return random_number
+
+
+# Started by the app when RANDOM_PREFETCH_SIZE is set
+prefetcher = RandomPrefetcher()
+
+
+def _fetch_random() -> float:
+    """Fetches one number from random.org, falling back to the local CSPRNG while the circuit is open."""
+    try:
+        random_number = _fetch_randoms(RANDOM_ORG_URL)[0]
+    except CircuitOpenError:
+        logger.warning("random.org circuit breaker is open; using the local generator")
+        return _local_random()
+
+    logger.debug(f"Received random number: {random_number:.3f}")
+    return random_number
+
+
+class RandomProvider(ABC):
+    """A source of random floats between 0 and 1, to two decimals."""
+
+    @abstractmethod
+    def random(self) -> float:
+        """Returns a random float between 0 and 1."""
+
+    def ready(self) -> Optional[float]:
+        """Returns a random float without waiting on the network, or None if none is ready."""
+        return self.random()
+
+    def randoms(self, n: int) -> List[float]:
+        """Returns n random floats between 0 and 1."""
+        return [self.random() for _ in range(n)]
+
+
+class LocalRandomProvider(RandomProvider):
+    """Draws random numbers from the operating system's CSPRNG."""
+
+    def random(self) -> float:
+        return _local_random()
+
+
+class SeededRandomProvider(RandomProvider):
+    """
+    Draws random numbers from a seeded pseudo-random generator.
+
+    The same seed always yields the same sequence, so fights can be reproduced
+    offline. Draws are serialized, so the sequence is only reproducible when
+    callers draw in the same order. Not suitable where unpredictability matters.
+
+    """
+
+    def __init__(self, seed: Union[int, str]):
+        """Initializes the generator.
+
+        Args:
+            seed (int | str): The seed.
+
+        """
+        self.seed = seed
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def random(self) -> float:
+        return self.randoms(1)[0]
+
+    def randoms(self, n: int) -> List[float]:
+        with self._lock:
+            return [self._random.randrange(100) / 100 for _ in range(n)]
+
+
+class RandomOrgProvider(RandomProvider):
+    """
+    Draws random numbers from random.org.
+
+    A number prefetched by the running prefetcher is used when one is ready;
+    otherwise one is fetched, from the local CSPRNG while the circuit is open.
+
+    """
+
+    def ready(self) -> Optional[float]:
+        if prefetcher.running:
+            return prefetcher.take()
+        return None
+
+    def random(self) -> float:
+        random_number = self.ready()
+        if random_number is not None:
+            return random_number
+        return _fetch_random()
+
+    def randoms(self, n: int) -> List[float]:
+        random_numbers: List[float] = []
+        while len(random_numbers) < n:
+            random_number = self.ready()
+            if random_number is None:
+                break
+            random_numbers.append(random_number)
+
+        # Whatever the prefetcher could not supply comes from one request
+        missing = n - len(random_numbers)
+        if missing:
+            try:
+                fetched = _fetch_randoms(f"{RANDOM_ORG_BATCH_URL}&num={missing}")
+            except CircuitOpenError:
+                logger.warning("random.org circuit breaker is open; using the local generator")
+                fetched = [_local_random() for _ in range(missing)]
+            if len(fetched) != missing:
+                logger.error(f"Expected {missing} random numbers from random.org but received {len(fetched)}")
+                raise ValueError(f"Invalid response from random.org: expected {missing} numbers, got {len(fetched)}")
+            random_numbers.extend(fetched)
+        return random_numbers
+
+
+def create_random_provider(name: Optional[str], seed: Union[int, str, None] = RANDOM_SEED) -> RandomProvider:
+    """
+    Creates the random provider with the given name.
+
+    Args:
+        name (str, optional): "random.org" (the default), "local" or "seeded".
+        seed (int | str, optional): The seed of the "seeded" provider. Defaults to $RANDOM_SEED.
+
+    Returns:
+        RandomProvider: The provider.
+
+    Raises:
+        ValueError: If the name is unknown, or "seeded" is given without a seed.
+    """
+    if name in (None, "", "random.org"):
+        return RandomOrgProvider()
+    if name == "local":
+        return LocalRandomProvider()
+    if name == "seeded":
+        if seed is None or seed == "":
+            raise ValueError("The seeded random provider needs a seed (set RANDOM_SEED).")
+        return SeededRandomProvider(seed)
+    raise ValueError(f"Unknown random provider: {name}")
+
+
+# Created from $RANDOM_PROVIDER on first use rather than at import, so a bad
+# setting is reported where the provider is configured (create_app) instead of
+# breaking every import of this module
+_provider: Optional[RandomProvider] = None
+_provider_lock = threading.Lock()
+
+# Overrides _provider within a seeded_random() block, e.g. for one request
+_scoped_provider: ContextVar[Optional[RandomProvider]] = ContextVar("scoped_random_provider", default=None)
+
+
+def set_random_provider(provider: Optional[RandomProvider]) -> None:
+    """Replaces the provider used by get_random. None recreates it from $RANDOM_PROVIDER on next use."""
+    global _provider
+    _provider = provider
+
+
+def get_random_provider() -> RandomProvider:
+    """
+    Returns the provider used by get_random in the current context.
+
+    Raises:
+        ValueError: If no provider was set and $RANDOM_PROVIDER is invalid.
+    """
+    global _provider
+    scoped = _scoped_provider.get()
+    if scoped is not None:
+        return scoped
+    provider = _provider
+    if provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = create_random_provider(RANDOM_PROVIDER, seed=RANDOM_SEED)
+            provider = _provider
+    return provider
+
+
+@contextmanager
+def seeded_random(seed: Union[int, str]) -> Iterator[SeededRandomProvider]:
+    """
+    Makes get_random draw from a generator seeded with seed until the block exits.
+
+    The override applies to the current thread (or context) only, so a request can be
+    replayed with its own seed without affecting requests running alongside it.
+
+    Args:
+        seed (int | str): The seed.
+
+    Yields:
+        SeededRandomProvider: The provider in use within the block.
+    """
+    provider = SeededRandomProvider(seed)
+    token = _scoped_provider.set(provider)
+    try:
+        yield provider
+    finally:
+        _scoped_provider.reset(token)
+
+
+def register_seed_header(app: Flask, header: str) -> None:
+    """
+    Makes requests carrying header draw their random numbers from a generator seeded with its value.
+
+    Load tests and replays use it to pin a request's draws; requests without the
+    header are unaffected.
+
+    Args:
+        app (Flask): The application.
+        header (str): The request header holding the seed, e.g. X-Random-Seed.
+    """
+    @app.before_request
+    def seed_request_random():
+        seed = request.headers.get(header)
+        if seed:
+            g.random_scope = ExitStack()
+            g.random_scope.enter_context(seeded_random(seed))
+
+    @app.teardown_request
+    def unseed_request_random(exc):
+        random_scope = g.pop("random_scope", None)
+        if random_scope is not None:
+            random_scope.close()
 
 
 def get_random() -> float:
     """
-    Fetches a random float between 0 and 1 from random.org.
+    Returns a random float between 0 and 1 from the configured provider.
+
+    By default the number comes from random.org: a prefetched one while the
+    prefetcher is running and has one ready, otherwise one fetched through the
+    shared pooled http_client, which retries transient failures. While its circuit
+    breaker is open random.org is not called and the number comes from the local
+    CSPRNG instead. With RANDOM_PROVIDER=seeded, or inside a seeded_random() block,
+    the number comes from the seeded generator and random.org is not called at all.
 
     Returns:
-        float: The random number fetched from random.org.
+        float: The random number.
 
     Raises:
         ValueError: If the response from random.org is not a valid float.
         RuntimeError: If the request to random.org fails due to a timeout or other request-related error.
 
     """
-    try:
-        logger.info(f"Fetching random number from {RANDOM_ORG_URL}")
+    return get_random_provider().random()
 
-        response = requests.get(RANDOM_ORG_URL, timeout=5)
 
-        # Check if the request was successful
-        response.raise_for_status()
+async def get_random_async() -> float:
+    """
+    Returns a random float between 0 and 1 like get_random, without blocking the event loop.
 
-        random_number_str = response.text.strip()
+    A seeded, local or prefetched number is returned at once; otherwise the request to
+    random.org runs on a worker thread.
 
-        try:
-            random_number = float(random_number_str)
-        except ValueError:
-            logger.error(f"Invalid response from random.org: {random_number_str}")
-            raise ValueError(f"Invalid response from random.org: {random_number_str}")
+    Returns:
+        float: The random number.
 
-        logger.debug(f"Received random number: {random_number:.3f}")
-        logger.info(f"Successfully fetched random number")
+    Raises:
+        ValueError: If the response from random.org is not a valid float.
+        RuntimeError: If the request to random.org fails due to a timeout or other request-related error.
 
+    """
+    provider = get_random_provider()
+    random_number = provider.ready()
+    if random_number is not None:
         return random_number
+    return await asyncio.to_thread(provider.random)
 
-    except requests.exceptions.Timeout:
-        logger.error("Request to random.org timed out.")
-        raise RuntimeError("Request to random.org timed out.")
 
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Request to random.org failed: {e}")
-        raise RuntimeError(f"Request to random.org failed: {e}")
+def get_random_batch(n: int) -> List[float]:
+    """
+    Returns n random floats between 0 and 1 from the configured provider.
 
+    The random.org provider uses prefetched numbers first and fetches the rest with
+    one request, falling back to the local CSPRNG while the circuit breaker is open.
+
+    Args:
+        n (int): The number of random numbers to return, at most RANDOM_ORG_MAX_BATCH.
+
+    Returns:
+        List[float]: The random numbers.
+
+    Raises:
+        ValueError: If n is out of range or the response from random.org is not valid.
+        RuntimeError: If the request to random.org fails due to a timeout or other request-related error.
+
+    """
+    if not 0 <= n <= RANDOM_ORG_MAX_BATCH:
+        raise ValueError(f"n must be between 0 and {RANDOM_ORG_MAX_BATCH}")
+    return get_random_provider().randoms(n)
@@ -13,8 +13,14 @@ class ProductionConfig():
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = False
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', "sqlite:////app/db/app.db")  # Production database URI from environment
+    RANDOM_PROVIDER = os.getenv("RANDOM_PROVIDER", "random.org")  # random.org (prefetched, CSPRNG fallback), local or seeded
+    RANDOM_SEED = os.getenv("RANDOM_SEED")  # Seed for RANDOM_PROVIDER=seeded
+    RANDOM_SEED_HEADER = os.getenv("RANDOM_SEED_HEADER")  # If set, e.g. X-Random-Seed, a request carrying it draws from that seed
+    RANDOM_PREFETCH_SIZE = int(os.getenv("RANDOM_PREFETCH_SIZE", 100))  # random.org numbers kept ready; 0 disables prefetching
 
 class TestConfig():
     """Testing configuration."""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'  # Use in-memory database for tests
+    RANDOM_PROVIDER = "local"  # Keep tests off the network
+    RANDOM_PREFETCH_SIZE = 0
@@ -1,7 +1,16 @@
+import asyncio
+
+from flask import Flask
 import pytest
 import requests
 
-from boxing.utils.api_utils import get_random
+from boxing.utils import api_utils
+from boxing.utils.api_utils import (
+    RANDOM_ORG_BATCH_URL, LocalRandomProvider, RandomOrgProvider, RandomPrefetcher, RandomProvider,
+    SeededRandomProvider, create_random_provider, get_random, get_random_async, get_random_batch,
+    get_random_provider, register_seed_header, seeded_random, set_random_provider
+)
+from boxing.utils.http_client import http_client
 
 
 RANDOM_NUMBER = 0.42
@@ -14,9 +23,22 @@ def mock_random_org(mocker):
     mock_response = mocker.Mock()
     # We are giving that object a text attribute
     mock_response.text = f"{RANDOM_NUMBER}"
-    mocker.patch("requests.get", return_value=mock_response)
+    mocker.patch.object(http_client.session, "get", return_value=mock_response)
     return mock_response
 
+@pytest.fixture(autouse=True)
+def reset_http_client(mocker):
+    """Closes the shared client's circuit breaker and skips retry backoff."""
+    mocker.patch("boxing.utils.http_client.time.sleep")
+    http_client.breaker.reset()
+    yield
+    http_client.breaker.reset()
+
+@pytest.fixture(autouse=True)
+def random_org_provider(monkeypatch):
+    """Draws from random.org whatever provider an app configured earlier."""
+    monkeypatch.setattr(api_utils, "_provider", RandomOrgProvider())
+
 def test_get_random(mock_random_org):
     """Test retrieving a random number from random.org.
 
@@ -27,14 +49,14 @@ def test_get_random(mock_random_org):
     assert result == RANDOM_NUMBER, f"Expected random number {RANDOM_NUMBER}, but got {result}"
 
     # Ensure that the correct URL was called
-    requests.get.assert_called_once_with("https://www.random.org/decimal-fractions/?num=1&dec=2&col=1&format=plain&rnd=new", timeout=5)
+    http_client.session.get.assert_called_once_with("https://www.random.org/decimal-fractions/?num=1&dec=2&col=1&format=plain&rnd=new", timeout=5)
 
 def test_get_random_request_failure(mocker):
     """Test handling of a request failure when calling random.org.
 
     """
     # Simulate a request failure
-    mocker.patch("requests.get", side_effect=requests.exceptions.RequestException("Connection error"))
+    mocker.patch.object(http_client.session, "get", side_effect=requests.exceptions.RequestException("Connection error"))
 
     with pytest.raises(RuntimeError, match="Request to random.org failed: Connection error"):
         get_random()
@@ -44,7 +66,7 @@ def test_get_random_timeout(mocker):
 
     """
     # Simulate a timeout
-    mocker.patch("requests.get", side_effect=requests.exceptions.Timeout)
+    mocker.patch.object(http_client.session, "get", side_effect=requests.exceptions.Timeout)
 
     with pytest.raises(RuntimeError, match="Request to random.org timed out."):
         get_random()
@@ -58,3 +80,204 @@ def test_get_random_invalid_response(mock_random_org):
 
     with pytest.raises(ValueError, match="Invalid response from random.org: invalid_response"):
         get_random()
+
+def test_get_random_retries_timeout(mocker, mock_random_org):
+    """Test that a timeout is retried before giving up.
+
+    """
+    mocker.patch.object(http_client.session, "get", side_effect=[requests.exceptions.Timeout, mock_random_org])
+
+    assert get_random() == RANDOM_NUMBER
+    assert http_client.session.get.call_count == 2
+
+def test_get_random_circuit_open(mocker):
+    """Test that an open circuit breaker falls back to the local generator without calling random.org.
+
+    """
+    mocker.patch.object(http_client.session, "get")
+    for _ in range(http_client.breaker.failure_threshold):
+        http_client.breaker.record_failure()
+
+    result = get_random()
+
+    assert 0 <= result < 1
+    http_client.session.get.assert_not_called()
+
+def test_get_random_seeded(mocker):
+    """Test the seeded provider makes get_random reproducible without calling random.org.
+
+    """
+    mocker.patch.object(http_client.session, "get")
+    set_random_provider(SeededRandomProvider(42))
+    first = [get_random() for _ in range(10)]
+    set_random_provider(SeededRandomProvider(42))
+    assert [get_random() for _ in range(10)] == first
+    assert all(0 <= number < 1 for number in first)
+    http_client.session.get.assert_not_called()
+
+def test_create_random_provider():
+    """Test providers are created by name, and a bad setting is reported.
+
+    """
+    assert isinstance(create_random_provider("random.org"), RandomOrgProvider)
+    assert isinstance(create_random_provider("local"), LocalRandomProvider)
+    assert isinstance(create_random_provider("seeded", seed="7"), SeededRandomProvider)
+    with pytest.raises(ValueError, match="needs a seed"):
+        create_random_provider("seeded", seed=None)
+    with pytest.raises(ValueError, match="Unknown random provider"):
+        create_random_provider("dice")
+
+def test_provider_is_abstract():
+    """Test a provider must implement random.
+
+    """
+    with pytest.raises(TypeError):
+        RandomProvider()
+
+def test_provider_created_on_first_use(monkeypatch):
+    """Test the provider is built from the environment when first needed.
+
+    """
+    monkeypatch.setattr(api_utils, "_provider", None)
+    monkeypatch.setattr(api_utils, "RANDOM_PROVIDER", "seeded")
+    monkeypatch.setattr(api_utils, "RANDOM_SEED", "7")
+    provider = get_random_provider()
+    assert isinstance(provider, SeededRandomProvider)
+    assert get_random_provider() is provider
+
+def test_seeded_random_scope(mock_random_org):
+    """Test a seeded_random block overrides random.org only until it exits.
+
+    """
+    with seeded_random("replay"):
+        first = [get_random() for _ in range(10)]
+    with seeded_random("replay") as provider:
+        assert get_random_provider() is provider
+        assert [get_random() for _ in range(10)] == first
+    http_client.session.get.assert_not_called()
+
+    assert get_random() == RANDOM_NUMBER
+
+def test_register_seed_header(mock_random_org):
+    """Test a request carrying the seed header draws from that seed, and one without it from random.org.
+
+    """
+    app = Flask(__name__)
+    register_seed_header(app, "X-Random-Seed")
+
+    @app.route("/draw")
+    def draw():
+        return str([get_random() for _ in range(5)])
+
+    client = app.test_client()
+    with seeded_random("replay"):
+        expected = str([get_random() for _ in range(5)])
+    assert client.get("/draw", headers={"X-Random-Seed": "replay"}).text == expected
+    assert client.get("/draw", headers={"X-Random-Seed": "replay"}).text == expected
+    http_client.session.get.assert_not_called()
+
+    assert client.get("/draw").text == str([RANDOM_NUMBER] * 5)
+
+@pytest.fixture
+def prefetcher(mocker):
+    """Fixture for a running prefetcher of three values, used by get_random."""
+    prefetcher = RandomPrefetcher(size=3, low_water=-1)
+    mocker.patch("boxing.utils.api_utils.prefetcher", prefetcher)
+    yield prefetcher
+    prefetcher.stop()
+
+def test_prefetcher_fills_queue(mock_random_org, prefetcher):
+    """Test the prefetcher fills its queue with one batched request on its event loop thread.
+
+    """
+    mock_random_org.text = "0.1\n0.2\n0.3"
+
+    prefetcher.start()
+    prefetcher._filling.result(timeout=5)
+
+    assert len(prefetcher) == 3
+    http_client.session.get.assert_called_once_with(f"{RANDOM_ORG_BATCH_URL}&num=3", timeout=5)
+
+    assert [get_random() for _ in range(3)] == [0.1, 0.2, 0.3]
+    assert get_random() == 0.1, "An empty queue should fall back to a direct request"
+    assert (prefetcher.hits, prefetcher.misses) == (3, 1)
+
+def test_prefetcher_fill_failure(mocker, prefetcher):
+    """Test a failed fill is logged and leaves the queue empty.
+
+    """
+    mocker.patch.object(http_client.session, "get", side_effect=requests.exceptions.RequestException("Connection error"))
+
+    assert asyncio.run(prefetcher.fill()) == 0
+    assert len(prefetcher) == 0
+
+def test_get_random_async(mock_random_org):
+    """Test get_random_async fetches a number from random.org.
+
+    """
+    assert asyncio.run(get_random_async()) == RANDOM_NUMBER
+
+def test_get_random_async_seeded(mock_random_org):
+    """Test get_random_async honors seeded_random without calling random.org.
+
+    """
+    with seeded_random(1):
+        expected = get_random()
+    with seeded_random(1):
+        assert asyncio.run(get_random_async()) == expected
+    http_client.session.get.assert_not_called()
+
+def test_get_random_batch(mock_random_org):
+    """Test get_random_batch fetches n numbers in one request.
+
+    """
+    mock_random_org.text = "0.1\n0.2\n0.3"
+
+    assert get_random_batch(3) == [0.1, 0.2, 0.3]
+    http_client.session.get.assert_called_once_with(f"{RANDOM_ORG_BATCH_URL}&num=3", timeout=5)
+
+def test_get_random_batch_uses_prefetched(mocker, mock_random_org, prefetcher):
+    """Test get_random_batch requests only the numbers the prefetch queue cannot supply.
+
+    """
+    mocker.patch.object(RandomPrefetcher, "running", new_callable=mocker.PropertyMock, return_value=True)
+    mocker.patch.object(prefetcher, "take", side_effect=[0.5, None])
+    mock_random_org.text = "0.1\n0.2"
+
+    assert get_random_batch(3) == [0.5, 0.1, 0.2]
+    http_client.session.get.assert_called_once_with(f"{RANDOM_ORG_BATCH_URL}&num=2", timeout=5)
+
+def test_get_random_batch_short_response(mock_random_org):
+    """Test a response with too few numbers is rejected.
+
+    """
+    mock_random_org.text = "0.1"
+
+    with pytest.raises(ValueError, match="expected 3 numbers, got 1"):
+        get_random_batch(3)
+
+def test_get_random_batch_circuit_open(mocker):
+    """Test get_random_batch uses the local generator while the circuit breaker is open.
+
+    """
+    mocker.patch.object(http_client.session, "get")
+    for _ in range(http_client.breaker.failure_threshold):
+        http_client.breaker.record_failure()
+
+    random_numbers = get_random_batch(3)
+    assert len(random_numbers) == 3
+    assert all(0 <= number < 1 for number in random_numbers)
+    http_client.session.get.assert_not_called()
+
+def test_get_random_batch_seeded(mock_random_org):
+    """Test get_random_batch honors seeded_random without calling random.org.
+
+    """
+    with seeded_random(9):
+        expected = [get_random() for _ in range(4)]
+    with seeded_random(9):
+        assert get_random_batch(4) == expected
+    assert get_random_batch(0) == []
+    with pytest.raises(ValueError, match="n must be between 0 and"):
+        get_random_batch(-1)
+    http_client.session.get.assert_not_called()
@@ -1,13 +1,25 @@
+from functools import wraps
+import json
+
 from dotenv import load_dotenv
-from flask import Flask, jsonify, make_response, Response, request
+from flask import Flask, g, jsonify, make_response, Response, request, stream_with_context
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
+from werkzeug.local import LocalProxy
 
 from config import ProductionConfig
 
 from playlist.db import db
-from playlist.models.song_model import Songs
-from playlist.models.playlist_model import PlaylistModel
+from playlist.models.leaderboard_model import song_leaderboard
+from playlist.models.song_model import (
+    DEFAULT_PAGE_SIZE, Songs, catalog_stats_cache, catalog_version, catalog_version_cache, iter_songs_from_csv,
+    play_count_buffer, song_cache
+)
+from playlist.models.playlist_registry import PLAYLIST_IDLE_SECONDS, PlaylistRegistry
+from playlist.models.playlist_store import create_playlist_store
 from playlist.models.user_model import Users
+from playlist.utils.api_utils import create_random_provider, register_seed_header, set_random_provider
+from playlist.utils.etag_utils import make_etag, not_modified
+from playlist.utils.http_client import http_client
 from playlist.utils.logger import configure_logger
 
 
@@ -29,10 +41,36 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     app.config.from_object(config_class)
 
+    # Select where get_random draws from; an invalid setting fails here, before anything starts
+    if app.config.get("RANDOM_PROVIDER"):
+        set_random_provider(create_random_provider(app.config["RANDOM_PROVIDER"], seed=app.config.get("RANDOM_SEED")))
+
     # Initialize database
     db.init_app(app)
     with app.app_context():
         db.create_all()
+        Songs.ensure_search_index()
+
+    # Configure the write-behind play count buffer
+    play_count_buffer.configure(
+        flush_threshold=app.config.get("PLAY_COUNT_FLUSH_THRESHOLD", 100),
+        flush_interval=app.config.get("PLAY_COUNT_FLUSH_INTERVAL", 5.0),
+        synchronous=app.config.get("PLAY_COUNT_SYNC_FLUSH", False)
+    )
+    if not play_count_buffer.synchronous:
+        play_count_buffer.start(app)
+
+    # Configure the shared song cache
+    song_cache.configure(
+        stale_seconds=app.config.get("SONG_CACHE_STALE_SECONDS", 0),
+        ttl_jitter=app.config.get("SONG_CACHE_TTL_JITTER", 0),
+    )
+    if app.config.get("CACHE_SWEEP_INTERVAL"):
+        song_cache.start_sweeper(app.config["CACHE_SWEEP_INTERVAL"])
+
+    # Let load tests and replays pin a request's random draws with a seed header
+    if app.config.get("RANDOM_SEED_HEADER"):
+        register_seed_header(app, app.config["RANDOM_SEED_HEADER"])
 
     # Initialize login manager
     login_manager = LoginManager()
@@ -50,7 +88,21 @@ def create_app(config_class=ProductionConfig) -> Flask:
             "message": "Authentication required"
         }), 401)
 
-    playlist_model = PlaylistModel()
+    # Each user has their own playlist; a request holds its user's lock while it runs
+    playlists = PlaylistRegistry(
+        idle_seconds=app.config.get("PLAYLIST_IDLE_SECONDS", PLAYLIST_IDLE_SECONDS),
+        store=create_playlist_store(app.config.get("PLAYLIST_STORE"), redis_url=app.config.get("REDIS_URL")),
+    )
+    playlist_model = LocalProxy(lambda: g.playlist_model)
+
+    def with_user_playlist(view):
+        """Runs view with playlist_model bound to the current user's playlist, locked."""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            with playlists.checkout(current_user.id) as model:
+                g.playlist_model = model
+                return view(*args, **kwargs)
+        return wrapper
 
     @app.route('/api/health', methods=['GET'])
     def healthcheck() -> Response:
@@ -243,6 +295,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
             with app.app_context():
                 Users.__table__.drop(db.engine)
                 Users.__table__.create(db.engine)
+            playlists.clear()
             app.logger.info("Users table recreated successfully")
             return make_response(jsonify({
                 "status": "success",
@@ -278,6 +331,11 @@ def create_app(config_class=ProductionConfig) -> Flask:
             with app.app_context():
                 Songs.__table__.drop(db.engine)
                 Songs.__table__.create(db.engine)
+            Songs.invalidate_catalog_stats()
+            song_leaderboard.invalidate()
+            song_cache.clear()
+            catalog_version.bump()
+            playlists.clear()
             app.logger.info("Songs table recreated successfully")
             return make_response(jsonify({
                 "status": "success",
@@ -304,6 +362,8 @@ def create_app(config_class=ProductionConfig) -> Flask:
             - year (int): The year the song was released.
             - genre (str): The genre of the song.
             - duration (int): The duration of the song in seconds.
+            - upsert (bool, optional): If true, update the genre and duration of an existing
+              song with the same artist, title and year instead of failing.
 
         Returns:
             JSON response indicating the success of the song addition.
@@ -333,6 +393,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
             year = data["year"]
             genre = data["genre"]
             duration = data["duration"]
+            upsert = data.get("upsert", False)
 
             if (
                 not isinstance(artist, str)
@@ -340,15 +401,16 @@ def create_app(config_class=ProductionConfig) -> Flask:
                 or not isinstance(year, int)
                 or not isinstance(genre, str)
                 or not isinstance(duration, int)
+                or not isinstance(upsert, bool)
             ):
                 app.logger.warning("Invalid input data types")
                 return make_response(jsonify({
                     "status": "error",
-                    "message": "Invalid input types: artist/title/genre should be strings, year and duration should be integers"
+                    "message": "Invalid input types: artist/title/genre should be strings, year and duration should be integers, upsert should be a boolean"
                 }), 400)
 
             app.logger.info(f"Adding song: {artist} - {title} ({year}), Genre: {genre}, Duration: {duration}s")
-            Songs.create_song(artist=artist, title=title, year=year, genre=genre, duration=duration)
+            Songs.create_song(artist=artist, title=title, year=year, genre=genre, duration=duration, upsert=upsert)
 
             app.logger.info(f"Song added successfully: {artist} - {title}")
             return make_response(jsonify({
@@ -365,6 +427,63 @@ def create_app(config_class=ProductionConfig) -> Flask:
             }), 500)
 
 
+    @app.route('/api/create-songs-bulk', methods=['POST'])
+    @login_required
+    def add_songs_bulk() -> Response:
+        """Route to add many songs to the catalog in one request.
+
+        Expected Input (one of):
+            - A JSON array of objects, each with artist, title, year, genre and duration.
+            - A CSV body (Content-Type: text/csv) with a header row naming those columns.
+              The body is parsed as it streams in.
+
+        Returns:
+            JSON response with a summary of the import and a per-row report. Each report
+            entry has the 1-indexed row number and a status of created, duplicate, invalid
+            or error.
+
+        Raises:
+            400 error if the body is neither a JSON array nor CSV.
+            500 error if there is an issue importing the songs.
+
+        """
+        app.logger.info("Received request to bulk add songs")
+
+        try:
+            if request.mimetype == "text/csv":
+                songs = iter_songs_from_csv(request.stream)
+            else:
+                songs = request.get_json(silent=True)
+                if not isinstance(songs, list):
+                    app.logger.warning("Bulk song import body is not a JSON array or CSV")
+                    return make_response(jsonify({
+                        "status": "error",
+                        "message": "Request body must be a JSON array of songs or a text/csv upload"
+                    }), 400)
+
+            report = Songs.bulk_create(songs)
+
+            summary = {status: 0 for status in ("created", "duplicate", "invalid", "error")}
+            for result in report:
+                summary[result["status"]] += 1
+
+            app.logger.info(f"Bulk song import finished: {summary}")
+            return make_response(jsonify({
+                "status": "success",
+                "message": f"Processed {len(report)} songs, {summary['created']} added",
+                "summary": summary,
+                "results": report
+            }), 200)
+
+        except Exception as e:
+            app.logger.error(f"Failed to bulk add songs: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while adding the songs",
+                "details": str(e)
+            }), 500)
+
+
     @app.route('/api/delete-song/<int:song_id>', methods=['DELETE'])
     @login_required
     def delete_song(song_id: int) -> Response:
@@ -385,7 +504,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
             app.logger.info(f"Received request to delete song with ID {song_id}")
 
             # Check if the song exists before attempting to delete
-            song = Songs.get_song_by_id(song_id)
+            song = Songs.get_cached_song_by_id(song_id)
             if not song:
                 app.logger.warning(f"Song with ID {song_id} not found.")
                 return make_response(jsonify({
@@ -394,6 +513,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
                 }), 400)
 
             Songs.delete_song(song_id)
+            playlists.remove_song(song_id)
             app.logger.info(f"Successfully deleted song with ID {song_id}")
 
             return make_response(jsonify({
@@ -415,19 +535,84 @@ def create_app(config_class=ProductionConfig) -> Flask:
     def get_all_songs() -> Response:
         """Route to retrieve all songs in the catalog (non-deleted), with an option to sort by play count.
 
-        Query Parameter:
+        Query Parameters:
             - sort_by_play_count (bool, optional): If true, sort songs by play count.
+            - after_id (int, optional): Return a single page of songs with IDs greater than this cursor.
+            - limit (int, optional): The maximum number of songs in the page.
+            - format (str, optional): If "ndjson", stream every song as newline-delimited JSON.
+
+        When after_id or limit is given, songs are returned one page at a time, ordered by ID,
+        together with the next_after_id cursor (null on the last page).
+
+        Responses carry an ETag that changes with every catalog write; a request whose
+        If-None-Match header matches it is answered with 304 without querying the database.
 
         Returns:
-            JSON response containing the list of songs.
+            JSON response containing the list of songs, or an NDJSON stream of songs.
 
         Raises:
+            304 if the client's copy, identified by If-None-Match, is still current.
+            400 error if the pagination parameters are invalid.
             500 error if there is an issue retrieving songs from the catalog.
 
         """
         try:
             # Extract query parameter for sorting by play count
             sort_by_play_count = request.args.get('sort_by_play_count', 'false').lower() == 'true'
+            stream = request.args.get('format', '').lower() == 'ndjson'
+            paginate = 'after_id' in request.args or 'limit' in request.args
+
+            if (stream or paginate) and sort_by_play_count:
+                app.logger.warning("sort_by_play_count cannot be combined with pagination or streaming")
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": "sort_by_play_count cannot be combined with after_id, limit or format=ndjson"
+                }), 400)
+
+            try:
+                after_id = int(request.args.get('after_id', 0))
+                limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+                if after_id < 0 or limit <= 0:
+                    raise ValueError
+            except ValueError:
+                app.logger.warning("Invalid pagination parameters")
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": "after_id must be a non-negative integer and limit a positive integer"
+                }), 400)
+
+            etag = make_etag(catalog_version)
+            cached = not_modified(etag)
+            if cached is not None:
+                app.logger.info("Catalog unchanged since the client's copy; returning 304")
+                return cached
+
+            if stream:
+                app.logger.info(f"Received request to stream the catalog as NDJSON (after_id={after_id})")
+
+                def generate():
+                    for song in Songs.iter_songs(after_id=after_id, batch_size=limit):
+                        yield json.dumps(song) + "\n"
+
+                response = Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+                response.set_etag(etag)
+                return response
+
+            if paginate:
+                app.logger.info(f"Received request to retrieve a catalog page (after_id={after_id}, limit={limit})")
+
+                songs, next_after_id = Songs.get_songs_page(after_id=after_id, limit=limit)
+
+                app.logger.info(f"Successfully retrieved {len(songs)} songs from the catalog")
+
+                response = make_response(jsonify({
+                    "status": "success",
+                    "message": "Songs retrieved successfully",
+                    "songs": songs,
+                    "next_after_id": next_after_id
+                }), 200)
+                response.set_etag(etag)
+                return response
 
             app.logger.info(f"Received request to retrieve all songs from catalog (sort_by_play_count={sort_by_play_count})")
 
@@ -435,11 +620,13 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
             app.logger.info(f"Successfully retrieved {len(songs)} songs from the catalog")
 
-            return make_response(jsonify({
+            response = make_response(jsonify({
                 "status": "success",
                 "message": "Songs retrieved successfully",
                 "songs": songs
             }), 200)
+            response.set_etag(etag)
+            return response
 
         except Exception as e:
             app.logger.error(f"Failed to retrieve songs: {e}")
@@ -469,7 +656,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
         try:
             app.logger.info(f"Received request to retrieve song with ID {song_id}")
 
-            song = Songs.get_song_by_id(song_id)
+            song = Songs.get_cached_song_by_id(song_id)
             if not song:
                 app.logger.warning(f"Song with ID {song_id} not found.")
                 return make_response(jsonify({
@@ -482,7 +669,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
             return make_response(jsonify({
                 "status": "success",
                 "message": "Song retrieved successfully",
-                "song": song
+                "song": song.to_dict()
             }), 200)
 
         except Exception as e:
@@ -535,7 +722,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
             app.logger.info(f"Received request to retrieve song by compound key: {artist}, {title}, {year}")
 
-            song = Songs.get_song_by_compound_key(artist, title, year)
+            song = Songs.get_cached_song_by_compound_key(artist, title, year)
             if not song:
                 app.logger.warning(f"Song not found: {artist} - {title} ({year})")
                 return make_response(jsonify({
@@ -548,7 +735,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
             return make_response(jsonify({
                 "status": "success",
                 "message": "Song retrieved successfully",
-                "song": song
+                "song": song.to_dict()
             }), 200)
 
         except Exception as e:
@@ -560,6 +747,75 @@ def create_app(config_class=ProductionConfig) -> Flask:
             }), 500)
 
 
+    @app.route('/api/search-songs', methods=['GET'])
+    @login_required
+    def search_songs() -> Response:
+        """Route to search the catalog by text, with optional facet filters.
+
+        Query Parameters:
+            - q (str, optional): Words to match against artist and title. Results are ranked by relevance.
+            - genre (str, optional): Only return songs of this genre.
+            - year_min, year_max (int, optional): Only return songs released within this range of years.
+            - duration_min, duration_max (int, optional): Only return songs within this range of durations (seconds).
+            - limit (int, optional): The maximum number of songs to return.
+            - offset (int, optional): The number of matching songs to skip.
+
+        Returns:
+            JSON response containing the matching songs and the next_offset for the following page
+            (null on the last page).
+
+        Raises:
+            400 error if a numeric parameter is invalid.
+            500 error if there is an issue searching the catalog.
+
+        """
+        try:
+            app.logger.info("Received request to search songs")
+
+            numeric = {}
+            for name in ("year_min", "year_max", "duration_min", "duration_max", "limit", "offset"):
+                value = request.args.get(name)
+                if value is None:
+                    continue
+                try:
+                    numeric[name] = int(value)
+                except ValueError:
+                    app.logger.warning(f"Invalid {name}: {value}")
+                    return make_response(jsonify({
+                        "status": "error",
+                        "message": f"{name} must be an integer"
+                    }), 400)
+
+            try:
+                songs, next_offset = Songs.search_songs(
+                    query=request.args.get('q'),
+                    genre=request.args.get('genre'),
+                    **numeric
+                )
+            except ValueError as e:
+                app.logger.warning(f"Invalid search parameters: {e}")
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": str(e)
+                }), 400)
+
+            app.logger.info(f"Search returned {len(songs)} songs")
+            return make_response(jsonify({
+                "status": "success",
+                "message": "Search completed successfully",
+                "songs": songs,
+                "next_offset": next_offset
+            }), 200)
+
+        except Exception as e:
+            app.logger.error(f"Failed to search songs: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while searching songs",
+                "details": str(e)
+            }), 500)
+
+
     @app.route('/api/get-random-song', methods=['GET'])
     @login_required
     def get_random_song() -> Response:
@@ -584,7 +840,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
                     "message": "No songs available in the catalog"
                 }), 400)
 
-            app.logger.info(f"Successfully retrieved random song: {song.title} by {song.artist}")
+            app.logger.info(f"Successfully retrieved random song: {song['title']} by {song['artist']}")
 
             return make_response(jsonify({
                 "status": "success",
@@ -610,6 +866,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     @app.route('/api/add-song-to-playlist', methods=['POST'])
     @login_required
+    @with_user_playlist
     def add_song_to_playlist() -> Response:
         """Route to add a song to the playlist by compound key (artist, title, year).
 
@@ -653,7 +910,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
                 }), 400)
 
             app.logger.info(f"Looking up song: {artist} - {title} ({year})")
-            song = Songs.get_song_by_compound_key(artist, title, year)
+            song = Songs.get_cached_song_by_compound_key(artist, title, year)
 
             if not song:
                 app.logger.warning(f"Song not found: {artist} - {title} ({year})")
@@ -662,7 +919,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
                     "message": f"Song '{title}' by {artist} ({year}) not found in catalog"
                 }), 400)
 
-            playlist_model.add_song_to_playlist(song)
+            playlist_model.add_song_to_playlist(song.id)
             app.logger.info(f"Successfully added song to playlist: {artist} - {title} ({year})")
 
             return make_response(jsonify({
@@ -681,6 +938,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     @app.route('/api/remove-song-from-playlist', methods=['DELETE'])
     @login_required
+    @with_user_playlist
     def remove_song_by_song_id() -> Response:
         """Route to remove a song from the playlist by compound key (artist, title, year).
 
@@ -724,7 +982,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
                 }), 400)
 
             app.logger.info(f"Looking up song to remove: {artist} - {title} ({year})")
-            song = Songs.get_song_by_compound_key(artist, title, year)
+            song = Songs.get_cached_song_by_compound_key(artist, title, year)
 
             if not song:
                 app.logger.warning(f"Song not found in catalog: {artist} - {title} ({year})")
@@ -752,6 +1010,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     @app.route('/api/remove-song-from-playlist-by-track-number/<int:track_number>', methods=['DELETE'])
     @login_required
+    @with_user_playlist
     def remove_song_by_track_number(track_number: int) -> Response:
         """Route to remove a song from the playlist by track number.
 
@@ -795,6 +1054,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     @app.route('/api/clear-playlist', methods=['POST'])
     @login_required
+    @with_user_playlist
     def clear_playlist() -> Response:
         """Route to clear all songs from the playlist.
 
@@ -834,6 +1094,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     @app.route('/api/play-current-song', methods=['POST'])
     @login_required
+    @with_user_playlist
     def play_current_song() -> Response:
         """Route to play the current song in the playlist.
 
@@ -883,11 +1144,12 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     @app.route('/api/play-entire-playlist', methods=['POST'])
     @login_required
+    @with_user_playlist
     def play_entire_playlist() -> Response:
         """Route to play all songs in the playlist.
 
         Returns:
-            JSON response indicating success of the operation.
+            JSON response indicating success of the operation, with a summary of the tracks played.
 
         Raises:
             400 error if the playlist is empty.
@@ -904,12 +1166,13 @@ def create_app(config_class=ProductionConfig) -> Flask:
                     "message": "Cannot play playlist: No songs available"
                 }), 400)
 
-            playlist_model.play_entire_playlist()
-            app.logger.info("Playing entire playlist")
+            summary = playlist_model.play_entire_playlist()
+            app.logger.info(f"Played entire playlist: {summary['tracks_played']} tracks")
 
             return make_response(jsonify({
                 "status": "success",
-                "message": "Playing entire playlist"
+                "message": "Playing entire playlist",
+                "summary": summary
             }), 200)
 
         except Exception as e:
@@ -923,11 +1186,12 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     @app.route('/api/play-rest-of-playlist', methods=['POST'])
     @login_required
+    @with_user_playlist
     def play_rest_of_playlist() -> Response:
         """Route to play the rest of the playlist from the current track.
 
         Returns:
-            JSON response indicating success of the operation.
+            JSON response indicating success of the operation, with a summary of the tracks played.
 
         Raises:
             400 error if the playlist is empty or if no current song is playing.
@@ -951,12 +1215,13 @@ def create_app(config_class=ProductionConfig) -> Flask:
                     "message": "No current song playing. Cannot continue playlist."
                 }), 400)
 
-            playlist_model.play_rest_of_playlist()
-            app.logger.info("Playing rest of the playlist")
+            summary = playlist_model.play_rest_of_playlist()
+            app.logger.info(f"Played rest of the playlist: {summary['tracks_played']} tracks")
 
             return make_response(jsonify({
                 "status": "success",
-                "message": "Playing rest of the playlist"
+                "message": "Playing rest of the playlist",
+                "summary": summary
             }), 200)
 
         except Exception as e:
@@ -970,6 +1235,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     @app.route('/api/rewind-playlist', methods=['POST'])
     @login_required
+    @with_user_playlist
     def rewind_playlist() -> Response:
         """Route to rewind the playlist to the first song.
 
@@ -1010,6 +1276,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     @app.route('/api/go-to-track-number/<int:track_number>', methods=['POST'])
     @login_required
+    @with_user_playlist
     def go_to_track_number(track_number: int) -> Response:
         """Route to set the playlist to start playing from a specific track number.
 
@@ -1059,6 +1326,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     @app.route('/api/go-to-random-track', methods=['POST'])
     @login_required
+    @with_user_playlist
     def go_to_random_track() -> Response:
         """Route to set the playlist to start playing from a random track number.
 
@@ -1106,26 +1374,39 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     @app.route('/api/get-all-songs-from-playlist', methods=['GET'])
     @login_required
+    @with_user_playlist
     def get_all_songs_from_playlist() -> Response:
         """Retrieve all songs in the playlist.
 
+        Responses carry an ETag that changes whenever the playlist or the catalog changes;
+        a request whose If-None-Match header matches it is answered with 304.
+
         Returns:
             JSON response containing the list of songs.
 
         Raises:
+            304 if the client's copy, identified by If-None-Match, is still current.
             500 error if there is an issue retrieving the playlist.
 
         """
         try:
             app.logger.info("Received request to retrieve all songs from the playlist.")
 
+            etag = make_etag(playlist_model.version, catalog_version)
+            cached = not_modified(etag)
+            if cached is not None:
+                app.logger.info("Playlist unchanged since the client's copy; returning 304")
+                return cached
+
             songs = playlist_model.get_all_songs()
 
             app.logger.info(f"Successfully retrieved {len(songs)} songs from the playlist.")
-            return make_response(jsonify({
+            response = make_response(jsonify({
                 "status": "success",
-                "songs": songs
+                "songs": [song.to_dict() for song in songs]
             }), 200)
+            response.set_etag(etag)
+            return response
 
         except Exception as e:
             app.logger.error(f"Failed to retrieve songs from playlist: {e}")
@@ -1138,6 +1419,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     @app.route('/api/get-song-from-playlist-by-track-number/<int:track_number>', methods=['GET'])
     @login_required
+    @with_user_playlist
     def get_song_by_track_number(track_number: int) -> Response:
         """Retrieve a song from the playlist by track number.
 
@@ -1160,7 +1442,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
             app.logger.info(f"Successfully retrieved song: {song.artist} - {song.title} (Track {track_number}).")
             return make_response(jsonify({
                 "status": "success",
-                "song": song
+                "song": song.to_dict()
             }), 200)
 
         except ValueError as e:
@@ -1181,6 +1463,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     @app.route('/api/get-current-song', methods=['GET'])
     @login_required
+    @with_user_playlist
     def get_current_song() -> Response:
         """Retrieve the current song being played.
 
@@ -1199,7 +1482,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
             app.logger.info(f"Successfully retrieved current song: {current_song.artist} - {current_song.title}.")
             return make_response(jsonify({
                 "status": "success",
-                "current_song": current_song
+                "current_song": current_song.to_dict()
             }), 200)
 
         except Exception as e:
@@ -1213,6 +1496,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     @app.route('/api/get-playlist-length-duration', methods=['GET'])
     @login_required
+    @with_user_playlist
     def get_playlist_length_and_duration() -> Response:
         """Retrieve the length (number of songs) and total duration of the playlist.
 
@@ -1254,6 +1538,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     @app.route('/api/move-song-to-beginning', methods=['POST'])
     @login_required
+    @with_user_playlist
     def move_song_to_beginning() -> Response:
         """Move a song to the beginning of the playlist.
 
@@ -1286,7 +1571,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
             artist, title, year = data["artist"], data["title"], data["year"]
             app.logger.info(f"Received request to move song to beginning: {artist} - {title} ({year})")
 
-            song = Songs.get_song_by_compound_key(artist, title, year)
+            song = Songs.get_cached_song_by_compound_key(artist, title, year)
             playlist_model.move_song_to_beginning(song.id)
 
             app.logger.info(f"Successfully moved song to beginning: {artist} - {title} ({year})")
@@ -1306,6 +1591,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     @app.route('/api/move-song-to-end', methods=['POST'])
     @login_required
+    @with_user_playlist
     def move_song_to_end() -> Response:
         """Move a song to the end of the playlist.
 
@@ -1338,7 +1624,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
             artist, title, year = data["artist"], data["title"], data["year"]
             app.logger.info(f"Received request to move song to end: {artist} - {title} ({year})")
 
-            song = Songs.get_song_by_compound_key(artist, title, year)
+            song = Songs.get_cached_song_by_compound_key(artist, title, year)
             playlist_model.move_song_to_end(song.id)
 
             app.logger.info(f"Successfully moved song to end: {artist} - {title} ({year})")
@@ -1358,6 +1644,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     @app.route('/api/move-song-to-track-number', methods=['POST'])
     @login_required
+    @with_user_playlist
     def move_song_to_track_number() -> Response:
         """Move a song to a specific track number in the playlist.
 
@@ -1390,7 +1677,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
             artist, title, year, track_number = data["artist"], data["title"], data["year"], data["track_number"]
             app.logger.info(f"Received request to move song to track number {track_number}: {artist} - {title} ({year})")
 
-            song = Songs.get_song_by_compound_key(artist, title, year)
+            song = Songs.get_cached_song_by_compound_key(artist, title, year)
             playlist_model.move_song_to_track_number(song.id, track_number)
 
             app.logger.info(f"Successfully moved song to track {track_number}: {artist} - {title} ({year})")
@@ -1410,6 +1697,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     @app.route('/api/swap-songs-in-playlist', methods=['POST'])
     @login_required
+    @with_user_playlist
     def swap_songs_in_playlist() -> Response:
         """Swap two songs in the playlist by their track numbers.
 
@@ -1459,6 +1747,63 @@ def create_app(config_class=ProductionConfig) -> Flask:
             }), 500)
 
 
+    @app.route('/api/playlist/batch', methods=['POST'])
+    @login_required
+    @with_user_playlist
+    def apply_playlist_batch() -> Response:
+        """Route to apply several playlist changes in one request, all or nothing.
+
+        Expected JSON Input:
+            - operations (list): The changes to apply in order, each one of
+                {"op": "add", "song_id": int}, {"op": "remove", "song_id": int},
+                {"op": "move", "song_id": int, "track_number": int} or
+                {"op": "swap", "song_id": int, "other_song_id": int}.
+
+        Returns:
+            JSON response with the number of operations applied, songs added and removed,
+            and the new playlist length.
+
+        Raises:
+            400 error if the input is malformed or any operation is invalid; the playlist is
+                left unchanged.
+            500 error if there is an issue applying the operations.
+
+        """
+        try:
+            app.logger.info("Received request to apply a batch of playlist operations")
+
+            data = request.get_json(silent=True)
+            operations = data.get("operations") if isinstance(data, dict) else None
+            if not isinstance(operations, list) or not operations:
+                app.logger.warning("Batch request without a list of operations")
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": "operations must be a non-empty list"
+                }), 400)
+
+            try:
+                summary = playlist_model.apply_operations(operations)
+            except ValueError as e:
+                app.logger.warning(f"Rejected playlist batch: {e}")
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": str(e)
+                }), 400)
+
+            app.logger.info(f"Applied {summary['operations']} playlist operations")
+            return make_response(jsonify({
+                "status": "success",
+                "summary": summary
+            }), 200)
+
+        except Exception as e:
+            app.logger.error(f"Failed to apply playlist batch: {e}")
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while applying the playlist operations",
+                "details": str(e)
+            }), 500)
+
 
     ############################################################
     #
@@ -1472,23 +1817,52 @@ def create_app(config_class=ProductionConfig) -> Flask:
         """
         Route to retrieve a leaderboard of songs sorted by play count.
 
+        Query Parameters:
+            - limit (int, optional): The number of songs to return. Defaults to the leaderboard size.
+            - offset (int, optional): The number of top-ranked songs to skip. Defaults to 0.
+
+        Responses carry an ETag that changes with every catalog write, including play
+        count flushes; a request whose If-None-Match header matches it is answered with 304.
+
         Returns:
             JSON response with a sorted leaderboard of songs.
 
         Raises:
+            304 if the client's copy, identified by If-None-Match, is still current.
+            400 error if limit or offset is invalid.
             500 error if there is an issue generating the leaderboard.
 
         """
         try:
             app.logger.info("Received request to generate song leaderboard")
 
-            leaderboard_data = Songs.get_all_songs(sort_by_play_count=True)
+            try:
+                limit = int(request.args.get('limit', song_leaderboard.size))
+                offset = int(request.args.get('offset', 0))
+                if limit <= 0 or offset < 0:
+                    raise ValueError
+            except ValueError:
+                app.logger.warning("Invalid leaderboard pagination parameters")
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": "limit must be a positive integer and offset a non-negative integer"
+                }), 400)
+
+            etag = make_etag(catalog_version)
+            cached = not_modified(etag)
+            if cached is not None:
+                app.logger.info("Leaderboard unchanged since the client's copy; returning 304")
+                return cached
+
+            leaderboard_data = song_leaderboard.get_leaderboard(limit=limit, offset=offset)
 
             app.logger.info(f"Successfully generated song leaderboard with {len(leaderboard_data)} entries")
-            return make_response(jsonify({
+            response = make_response(jsonify({
                 "status": "success",
                 "leaderboard": leaderboard_data
             }), 200)
+            response.set_etag(etag)
+            return response
 
         except Exception as e:
             app.logger.error(f"Failed to generate song leaderboard: {e}")
@@ -1498,6 +1872,28 @@ def create_app(config_class=ProductionConfig) -> Flask:
                 "details": str(e)
             }), 500)
 
+    @app.route('/api/cache-stats', methods=['GET'])
+    @login_required
+    def get_cache_stats() -> Response:
+        """
+        Route to retrieve the size and hit, miss, eviction and expiration counters of the
+        shared song cache, the catalog stats cache and the catalog version cache, the number of user playlists held, and
+        the request counters, circuit breaker state and latency of calls to random.org.
+
+        Returns:
+            JSON response with the cache statistics.
+
+        """
+        app.logger.info("Received request for cache statistics")
+        return make_response(jsonify({
+            "status": "success",
+            "song_cache": song_cache.stats(),
+            "catalog_stats_cache": catalog_stats_cache.stats(),
+            "catalog_version_cache": catalog_version_cache.stats(),
+            "playlists": playlists.stats(),
+            "upstream": http_client.stats()
+        }), 200)
+
     return app
 
 if __name__ == '__main__':
@@ -0,0 +1,81 @@
+"""Benchmark for reading a whole playlist with a cold song cache.
+
+Seeds an in-memory catalog, then times PlaylistModel.get_all_songs and
+get_playlist_duration right after the shared song cache is cleared, as happens
+at startup or once every entry's TTL has lapsed. The legacy approach (one
+cached lookup, and so one query, per track) is timed alongside for comparison.
+
+Run from the playlist directory:
+
+    python -m benchmarks.bench_playlist_cold_cache
+
+"""
+import logging
+import time
+
+from app import create_app
+from config import TestConfig
+from playlist.db import db
+from playlist.models.playlist_model import PlaylistModel
+from playlist.models.song_model import Songs, song_cache
+
+
+SIZES = [1_000, 10_000]
+ITERATIONS = 5
+
+
+def seed_catalog(size: int) -> None:
+    """Bulk-inserts size songs into the catalog."""
+    rows = [
+        {
+            "artist": f"Artist {i}",
+            "title": f"Title {i}",
+            "year": 1950 + i % 70,
+            "genre": "Rock",
+            "duration": 120 + i % 300,
+            "play_count": 0,
+        }
+        for i in range(size)
+    ]
+    db.session.execute(Songs.__table__.insert(), rows)
+    db.session.commit()
+
+
+def legacy_get_all_songs(playlist_model: PlaylistModel) -> list:
+    """The previous implementation: one cache lookup, and on a miss one query, per track."""
+    return [Songs.get_cached_song_by_id(song_id) for song_id in playlist_model.playlist]
+
+
+def cold_time_per_call(func, iterations: int) -> float:
+    """Returns the mean latency of func in milliseconds, clearing the song cache before each call."""
+    total = 0.0
+    for _ in range(iterations):
+        song_cache.clear()
+        start = time.perf_counter()
+        func()
+        total += time.perf_counter() - start
+    return total / iterations * 1000
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    app = create_app(TestConfig)
+
+    with app.app_context():
+        db.create_all()
+        seed_catalog(max(SIZES))
+
+        print(f"{'tracks':>8} {'get_all_songs (ms)':>20} {'duration (ms)':>15} {'legacy (ms)':>12}")
+        for size in SIZES:
+            playlist_model = PlaylistModel()
+            playlist_model.playlist = range(1, size + 1)
+
+            bulk = cold_time_per_call(playlist_model.get_all_songs, ITERATIONS)
+            duration = cold_time_per_call(playlist_model.get_playlist_duration, ITERATIONS)
+            legacy = cold_time_per_call(lambda: legacy_get_all_songs(playlist_model), ITERATIONS)
+
+            print(f"{size:>8} {bulk:20.3f} {duration:15.3f} {legacy:12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Benchmark for Songs.get_random_song as the catalog grows.
+
+Seeds an in-memory catalog of increasing size and times random song selection,
+once with contiguous IDs and once with every GAP_EVERY-th song deleted.
+random.org is replaced with a local generator so that only the database work is
+measured. The legacy approach (materialize the catalog, then index it) is timed
+alongside for comparison on the smaller catalogs.
+
+Run from the playlist directory:
+
+    python -m benchmarks.bench_random_song
+
+"""
+import logging
+import random
+import time
+from unittest import mock
+
+from app import create_app
+from config import TestConfig
+from playlist.db import db
+from playlist.models.song_model import Songs
+
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+LEGACY_MAX_SIZE = 100_000
+ITERATIONS = 200
+INSERT_CHUNK = 50_000
+GAP_EVERY = 10
+
+
+def seed_catalog(start: int, stop: int) -> None:
+    """Bulk-inserts songs numbered [start, stop) into the catalog."""
+    for chunk_start in range(start, stop, INSERT_CHUNK):
+        rows = [
+            {
+                "artist": f"Artist {i}",
+                "title": f"Title {i}",
+                "year": 1950 + i % 70,
+                "genre": "Rock",
+                "duration": 120 + i % 300,
+                "play_count": 0,
+            }
+            for i in range(chunk_start, min(chunk_start + INSERT_CHUNK, stop))
+        ]
+        db.session.execute(Songs.__table__.insert(), rows)
+    db.session.commit()
+    Songs.invalidate_catalog_stats()
+
+
+def punch_gaps(start: int, stop: int) -> None:
+    """Deletes every GAP_EVERY-th song among IDs [start + 1, stop], as a catalog with deletions would have."""
+    db.session.execute(
+        Songs.__table__.delete().where(
+            Songs.id > start, Songs.id <= stop, Songs.id % GAP_EVERY == 0
+        )
+    )
+    db.session.commit()
+    Songs.invalidate_catalog_stats()
+
+
+def legacy_random_song() -> dict:
+    """The previous implementation: load every song, then index one."""
+    all_songs = Songs.get_all_songs()
+    return all_songs[random.randint(1, len(all_songs)) - 1]
+
+
+def time_per_call(func, iterations: int) -> float:
+    """Returns the mean latency of func in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    app = create_app(TestConfig)
+
+    with app.app_context(), mock.patch(
+        "playlist.models.song_model.get_random", side_effect=lambda n: random.randint(1, n)
+    ):
+        for gaps in (False, True):
+            db.drop_all()
+            db.create_all()
+            seeded = 0
+
+            print(f"\n{'IDs with gaps' if gaps else 'Contiguous IDs'}")
+            print(f"{'songs':>10} {'get_random_song (ms)':>22} {'legacy (ms)':>12}")
+            for size in SIZES:
+                seed_catalog(seeded, size)
+                if gaps:
+                    punch_gaps(seeded, size)
+                seeded = size
+
+                # Warm the cached count so the steady-state cost is measured
+                Songs.get_catalog_stats()
+                current = time_per_call(Songs.get_random_song, ITERATIONS)
+                if size <= LEGACY_MAX_SIZE:
+                    legacy = f"{time_per_call(legacy_random_song, max(1, ITERATIONS // 100)):12.3f}"
+                else:
+                    legacy = f"{'skipped':>12}"
+
+                print(f"{size:>10} {current:22.3f} {legacy}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,8 +13,22 @@ class ProductionConfig():
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = False
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', "sqlite:////app/db/app.db")  # Production database URI from environment
+    PLAY_COUNT_FLUSH_THRESHOLD = int(os.getenv("PLAY_COUNT_FLUSH_THRESHOLD", 100))  # Buffered plays before a flush
+    PLAY_COUNT_FLUSH_INTERVAL = float(os.getenv("PLAY_COUNT_FLUSH_INTERVAL", 5))  # Max seconds between flushes
+    PLAY_COUNT_SYNC_FLUSH = False
+    SONG_CACHE_STALE_SECONDS = float(os.getenv("SONG_CACHE_STALE_SECONDS", 30))  # Serve expired songs this long while they reload
+    CACHE_SWEEP_INTERVAL = float(os.getenv("CACHE_SWEEP_INTERVAL", 30))  # Seconds between expired-entry sweeps
+    SONG_CACHE_TTL_JITTER = float(os.getenv("SONG_CACHE_TTL_JITTER", 0.1))  # Shorten each song's TTL by up to this fraction
+    PLAYLIST_IDLE_SECONDS = float(os.getenv("PLAYLIST_IDLE_SECONDS", 3600))  # Drop user playlists unused this long
+    PLAYLIST_STORE = os.getenv("PLAYLIST_STORE", "sqlite")  # Where playlists persist: sqlite, redis or memory (single worker only)
+    REDIS_URL = os.getenv("REDIS_URL")  # Server for PLAYLIST_STORE=redis, e.g. redis://localhost:6379/0
+    RANDOM_PROVIDER = os.getenv("RANDOM_PROVIDER", "random.org")  # random.org (pooled, CSPRNG fallback), local or seeded
+    RANDOM_SEED = os.getenv("RANDOM_SEED")  # Seed for RANDOM_PROVIDER=seeded
+    RANDOM_SEED_HEADER = os.getenv("RANDOM_SEED_HEADER")  # If set, e.g. X-Random-Seed, a request carrying it draws from that seed
 
 class TestConfig():
     """Testing configuration."""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'  # Use in-memory database for tests
+    PLAY_COUNT_SYNC_FLUSH = True  # Write play counts immediately so tests can read them back
+    RANDOM_PROVIDER = "local"  # Keep tests off the network
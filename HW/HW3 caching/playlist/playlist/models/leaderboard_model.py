@@ -0,0 +1,190 @@
+import heapq
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+
+from playlist.db import db
+from playlist.models.song_model import Songs, play_count_buffer
+from playlist.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+LEADERBOARD_SIZE = int(os.getenv("LEADERBOARD_SIZE", 100))
+LEADERBOARD_TTL = int(os.getenv("LEADERBOARD_TTL", 60))
+
+
+def _rank_key(song: Dict) -> tuple:
+    """Orders songs by play count, most played first, breaking ties by ID."""
+    return (-song["play_count"], song["id"])
+
+
+class SongLeaderboard:
+    """
+    A materialized top-N view of the most played songs.
+
+    The board is built lazily from the play_count index and then maintained
+    incrementally from flushed play count increments: songs already on the board
+    are updated in place, and songs outside it are merged in with one small query
+    on the next read. It is rebuilt when a song is deleted, when the catalog grows
+    while the board is not yet full, or when the TTL expires (which bounds
+    staleness from writes made outside the ORM).
+
+    """
+
+    def __init__(self, size: int = LEADERBOARD_SIZE, ttl_seconds: int = LEADERBOARD_TTL):
+        """Initializes an empty, stale leaderboard.
+
+        Args:
+            size (int): The number of songs kept on the board.
+            ttl_seconds (int): The maximum age of the board before it is rebuilt.
+
+        """
+        self.size = size
+        self.ttl_seconds = ttl_seconds
+
+        self._entries: Dict[int, Dict] = {}
+        self._ranked: Optional[List[Dict]] = None
+        self._candidates: Set[int] = set()
+        self._stale = True
+        self._expires = 0.0
+        self._engine = None
+        self._built_count = 0
+        self._lock = threading.RLock()
+
+    def invalidate(self) -> None:
+        """Marks the board stale so the next read rebuilds it from the database."""
+        with self._lock:
+            self._stale = True
+
+    def record_plays(self, deltas: Dict[int, int]) -> None:
+        """
+        Applies flushed play count increments to the board.
+
+        Args:
+            deltas (dict[int, int]): The number of new plays per song ID.
+        """
+        with self._lock:
+            if self._stale:
+                return
+            for song_id, delta in deltas.items():
+                if song_id in self._entries:
+                    self._entries[song_id]["play_count"] += delta
+                    self._ranked = None
+                else:
+                    self._candidates.add(song_id)
+
+    def get_leaderboard(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+        """
+        Returns songs ranked by play count, most played first.
+
+        Ranks within the board are served from memory. Requests reaching past the
+        board fall back to an indexed LIMIT/OFFSET query.
+
+        Args:
+            limit (int, optional): The maximum number of songs to return. Defaults to the board size.
+            offset (int): The number of top-ranked songs to skip. Defaults to 0.
+
+        Returns:
+            list[dict]: The ranked song dictionaries.
+
+        Raises:
+            ValueError: If limit is not positive or offset is negative.
+            SQLAlchemyError: If a database error occurs.
+        """
+        limit = self.size if limit is None else limit
+        if limit <= 0:
+            raise ValueError("limit must be a positive integer.")
+        if offset < 0:
+            raise ValueError("offset must be a non-negative integer.")
+
+        if offset + limit > self.size:
+            logger.info(f"Leaderboard request (offset {offset}, limit {limit}) exceeds the board; querying the database")
+            return self._query_top(limit=limit, offset=offset)
+
+        with self._lock:
+            self._refresh()
+            if self._ranked is None:
+                self._ranked = sorted(self._entries.values(), key=_rank_key)
+            return [dict(song) for song in self._ranked[offset:offset + limit]]
+
+    def _refresh(self) -> None:
+        """Rebuilds the board if it is stale, or merges in songs played since the last read."""
+        engine = db.engine
+        if (
+            self._stale
+            or self._engine is not engine
+            or self._expires <= time.time()
+            or (len(self._entries) < self.size and Songs.get_catalog_stats()[0] != self._built_count)
+        ):
+            self._rebuild(engine)
+            return
+
+        if not self._candidates:
+            return
+
+        query = Songs.column_query().filter(Songs.id.in_(self._candidates))
+        if len(self._entries) >= self.size:
+            threshold = min(song["play_count"] for song in self._entries.values())
+            query = query.filter(Songs.play_count >= threshold)
+        try:
+            rows = query.all()
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while updating the leaderboard: {e}")
+            raise
+
+        self._candidates.clear()
+        if not rows:
+            return
+
+        for row in rows:
+            self._entries[row.id] = row._asdict()
+        top = heapq.nsmallest(self.size, self._entries.values(), key=_rank_key)
+        self._entries = {song["id"]: song for song in top}
+        self._ranked = top
+        logger.debug(f"Merged {len(rows)} songs into the leaderboard")
+
+    def _rebuild(self, engine) -> None:
+        """Loads the top songs from the database using the play_count index."""
+        top = self._query_top(limit=self.size, offset=0)
+        self._entries = {song["id"]: song for song in top}
+        self._ranked = top
+        self._candidates.clear()
+        self._stale = False
+        self._engine = engine
+        self._expires = time.time() + self.ttl_seconds
+        self._built_count = Songs.get_catalog_stats()[0]
+        logger.info(f"Rebuilt leaderboard with {len(top)} songs")
+
+    @staticmethod
+    def _query_top(limit: int, offset: int) -> List[Dict]:
+        """Fetches a ranked slice of the catalog from the database."""
+        try:
+            rows = (
+                Songs.column_query()
+                .order_by(Songs.play_count.desc(), Songs.id)
+                .offset(offset)
+                .limit(limit)
+                .all()
+            )
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while ranking songs by play count: {e}")
+            raise
+        return [row._asdict() for row in rows]
+
+
+song_leaderboard = SongLeaderboard()
+play_count_buffer.add_flush_listener(song_leaderboard.record_plays)
+
+
+@event.listens_for(Songs, "after_delete")
+def _invalidate_leaderboard(mapper, connection, target) -> None:
+    """Rebuilds the board after a song is deleted, in case it was ranked."""
+    song_leaderboard.invalidate()
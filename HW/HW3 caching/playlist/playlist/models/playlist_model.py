@@ -1,74 +1,266 @@
 import logging
 import os
-import time
-from typing import List
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
 
-from playlist.models.song_model import Songs
+from playlist.models.playlist_store import PlaylistStore
+from playlist.models.song_model import SongSnapshot, Songs
 from playlist.utils.api_utils import get_random
+from playlist.utils.etag_utils import SharedVersion, VersionCounter, new_counter_name
+from playlist.utils.indexed_list import IndexedList
 from playlist.utils.logger import configure_logger
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
+# Operations accepted by apply_operations, and the most it applies in one call
+BATCH_OPERATIONS = ("add", "remove", "move", "swap")
+MAX_BATCH_OPERATIONS = int(os.getenv("PLAYLIST_BATCH_MAX_OPERATIONS", 1000))
+
+
 class PlaylistModel:
     """
     A class to manage a playlist of songs.
 
     """
 
-    def __init__(self):
+    def __init__(self, store: Optional[PlaylistStore] = None, owner: Optional[Hashable] = None):
         """Initializes the PlaylistModel with an empty playlist and the current track set to 1.
 
-        The playlist is a list of Songs, and the current track number is 1-indexed.
-        The TTL (Time To Live) for song caching is set to a default value from the environment variable "TTL",
-        which defaults to 60 seconds if not set.
+        The playlist is a list of song IDs, and the current track number is 1-indexed.
+        It is kept in an IndexedList, so membership checks and swaps are O(1) and position
+        lookups, removals and moves are O(log n) amortized rather than O(n).
+        Songs are read through the process-wide song cache shared with the catalog routes,
+        whose TTL is set by the environment variable "TTL" (60 seconds if not set).
+        The version counter is bumped whenever the songs or their order change. With a
+        store it is the stored version, which every worker sharing the store sees.
+
+        The total duration is kept as a running sum over the songs' durations, updated as
+        songs are added and removed and whenever a refreshed copy of a song is read. It is
+        rebuilt on the next read if the playlist list is modified directly.
+
+        If a store is given, the owner's stored playlist is loaded and every change to the
+        songs, their order or the current track is written through to it. sync() picks up
+        changes made by other processes sharing the store.
+
+        Args:
+            store (PlaylistStore, optional): Where the playlist is persisted. None keeps it in memory only.
+            owner (Hashable, optional): The key of this playlist in the store, e.g. the user ID.
 
         """
-        self.current_track_number = 1
-        self.playlist: List[int] = []
-        self._song_cache: dict[int, Songs] = {}
-        self._ttl: dict[int, float] = {}
-        self.ttl_seconds = int(os.getenv("TTL", 60))  # Default TTL is 60 seconds
+        self._store = store
+        self.owner = owner
+        self._store_version = 0
+        self._current_track_number = 1
+        self._playlist = IndexedList()
+        if store is not None:
+            self.version = SharedVersion(f"playlist{owner}", read=lambda: self._store_version)
+        else:
+            self.version = VersionCounter(new_counter_name("playlist"))
+        self._durations: Dict[int, int] = {}
+        self._total_duration = 0
+        self._durations_version: Optional[int] = self.playlist.membership_version
+        if store is not None:
+            self._load()
+
+    @property
+    def playlist(self) -> IndexedList:
+        """The song IDs in the playlist, in track order."""
+        return self._playlist
+
+    @playlist.setter
+    def playlist(self, song_ids: Iterable[int]) -> None:
+        self._playlist = IndexedList(song_ids)
+        # The running duration no longer matches; rebuild it on the next read
+        self._durations_version = None
+        self._persist("replace", list(self._playlist), self._current_track_number)
+
+    @property
+    def current_track_number(self) -> int:
+        """The 1-indexed track number of the song that plays next."""
+        return self._current_track_number
+
+    @current_track_number.setter
+    def current_track_number(self, track_number: int) -> None:
+        if track_number == self._current_track_number:
+            return
+        self._current_track_number = track_number
+        if self._store is not None:
+            self._store.set_current_track(self.owner, track_number)
 
+    ##################################################
+    # Persistence Functions
+    ##################################################
+
+    def _load(self) -> None:
+        """Replaces the in-memory playlist with the owner's stored playlist."""
+        state = self._store.load(self.owner)
+        self._playlist = IndexedList(state.song_ids)
+        self._durations_version = None
+        self._current_track_number = state.current_track_number
+        self._store_version = state.version
+        self.version.bump()
+        logger.info(f"Loaded playlist of {self.owner} with {len(state.song_ids)} songs (version {state.version})")
+
+    def _persist(self, operation: str, *args) -> None:
+        """
+        Applies a change already made in memory to the store, if there is one.
+
+        If the write fails, or the version it returns shows another process wrote in between,
+        the playlist is reloaded from the store so the two stay in step.
+
+        Args:
+            operation (str): The name of the PlaylistStore method to call.
+            *args: Its arguments after the owner.
+        """
+        if self._store is None:
+            return
+        try:
+            version = getattr(self._store, operation)(self.owner, *args)
+        except Exception as e:
+            logger.error(f"Failed to persist {operation} for playlist of {self.owner}: {e}")
+            self._load()
+            raise
+
+        if version != self._store_version + 1:
+            logger.info(f"Playlist of {self.owner} was changed by another process; reloading")
+            self._load()
+        else:
+            self._store_version = version
+
+    def _persist_position(self, song_id: int) -> None:
+        """Stores song_id's position as lying between its current neighbours."""
+        if self._store is None:
+            return
+        index = self.playlist.index(song_id)
+        after = self.playlist[index - 1] if index > 0 else None
+        before = self.playlist[index + 1] if index + 1 < len(self.playlist) else None
+        self._persist("place", song_id, after, before)
+
+    def sync(self) -> None:
+        """
+        Picks up changes other processes made to the stored playlist.
+
+        Reads only the stored version and current track; the songs are reloaded only
+        if the version differs from the one last loaded or written here.
+        """
+        if self._store is None:
+            return
+        version, current_track_number = self._store.head(self.owner)
+        if version != self._store_version:
+            logger.info(f"Playlist of {self.owner} changed in the store; reloading")
+            self._load()
+        else:
+            self._current_track_number = current_track_number
 
     ##################################################
     # Song Management Functions
     ##################################################
 
-    def _get_song_from_cache_or_db(self, song_id: int) -> Songs:
+    def _get_song_from_cache_or_db(self, song_id: int) -> SongSnapshot:
         """
-        Retrieves a song by ID, using the internal cache if possible.
+        Retrieves a song by ID, using the shared song cache if possible.
 
-        This method checks whether a cached version of the song is available
-        and still valid. If not, it queries the database, updates the cache, and returns the song.
+        If the song is not cached or its entry has expired, it is loaded from the
+        database and cached for every playlist and route in the process.
 
         Args:
             song_id (int): The unique ID of the song to retrieve.
 
         Returns:
-            Songs: The song object corresponding to the given ID.
+            SongSnapshot: An immutable snapshot of the song with the given ID.
 
         Raises:
             ValueError: If the song cannot be found in the database.
         """
-        now = time.time()
-
-        if song_id in self._song_cache and self._ttl.get(song_id, 0) > now:
-            logger.debug(f"Song ID {song_id} retrieved from cache")
-            return self._song_cache[song_id]
-
         try:
-            song = Songs.get_song_by_id(song_id)
-            logger.info(f"Song ID {song_id} loaded from DB")
+            song = Songs.get_cached_song_by_id(song_id)
         except ValueError as e:
             logger.error(f"Song ID {song_id} not found in DB: {e}")
             raise ValueError(f"Song ID {song_id} not found in database") from e
 
-        self._song_cache[song_id] = song
-        self._ttl[song_id] = now + self.ttl_seconds
+        self._refresh_durations([song])
         return song
 
+    def _get_songs_from_cache_or_db(self, song_ids: Iterable[int]) -> List[SongSnapshot]:
+        """
+        Retrieves several songs by ID, loading every uncached or expired song in one batched query.
+
+        Args:
+            song_ids (Iterable[int]): The IDs of the songs to retrieve.
+
+        Returns:
+            List[SongSnapshot]: The songs, in the order of song_ids.
+
+        Raises:
+            ValueError: If any of the songs cannot be found in the database.
+        """
+        song_ids = list(song_ids)
+        songs = Songs.get_cached_songs_by_ids(song_ids)
+        for song_id in song_ids:
+            if song_id not in songs:
+                logger.error(f"Song ID {song_id} not found in DB")
+                raise ValueError(f"Song ID {song_id} not found in database")
+
+        songs = [songs[song_id] for song_id in song_ids]
+        self._refresh_durations(songs)
+        return songs
+
+    ##################################################
+    # Running Duration Functions
+    ##################################################
+
+    def _refresh_durations(self, songs: Iterable[SongSnapshot]) -> None:
+        """Applies any duration changes seen in freshly read songs to the running total."""
+        for song in songs:
+            duration = self._durations.get(song.id)
+            if duration is not None and duration != song.duration:
+                logger.info(f"Duration of song ID {song.id} changed from {duration} to {song.duration} seconds")
+                self._durations[song.id] = song.duration
+                self._total_duration += song.duration - duration
+
+    def _update_durations(self, version_before: int, added: Optional[SongSnapshot] = None,
+                          removed_id: Optional[int] = None) -> None:
+        """
+        Applies one addition or removal to the running duration.
+
+        The update is only applied if the running duration matched the playlist before the
+        change (version_before); otherwise it is left to be rebuilt on the next read.
+        """
+        if self._durations_version != version_before:
+            return
+        if added is not None:
+            self._durations[added.id] = added.duration
+            self._total_duration += added.duration
+        if removed_id is not None:
+            self._total_duration -= self._durations.pop(removed_id)
+        self._durations_version = self.playlist.membership_version
+
+    def _rebuild_durations(self) -> None:
+        """Recomputes the running duration from the songs in the playlist."""
+        logger.info(f"Rebuilding the running duration of {len(self.playlist)} songs")
+        self._durations = {}
+        songs = self._get_songs_from_cache_or_db(self.playlist)
+        self._durations = {song.id: song.duration for song in songs}
+        self._total_duration = sum(self._durations.values())
+        self._durations_version = self.playlist.membership_version
+
+    def check_duration_consistency(self) -> bool:
+        """
+        Compares the running duration with a sum over the songs as stored in the database.
+
+        The songs are read straight from the database, bypassing the song cache. Intended
+        for tests and debugging.
+
+        Returns:
+            bool: True if the running duration matches the database.
+        """
+        expected = sum(song.duration for song in Songs.get_song_snapshots(self.playlist))
+        actual = self.get_playlist_duration()
+        if actual != expected:
+            logger.error(f"Running playlist duration {actual} does not match the database total {expected}")
+        return actual == expected
+
     def add_song_to_playlist(self, song_id: int) -> None:
         """
         Adds a song to the playlist by ID, using the cache or database lookup.
@@ -93,7 +285,11 @@ class PlaylistModel:
             logger.error(f"Failed to add song: {e}")
             raise
 
+        version_before = self.playlist.membership_version
         self.playlist.append(song.id)
+        self._update_durations(version_before, added=song)
+        self._persist_position(song.id)
+        self.version.bump()
         logger.info(f"Successfully added to playlist: {song.artist} - {song.title} ({song.year})")
 
 
@@ -110,13 +306,17 @@ class PlaylistModel:
         logger.info(f"Received request to remove song with ID {song_id}")
 
         self.check_if_empty()
-        song_id = self.validate_song_id(song_id)
+        song_id = self.validate_song_id(song_id, check_in_db=False)
 
         if song_id not in self.playlist:
             logger.warning(f"Song with ID {song_id} not found in the playlist")
             raise ValueError(f"Song with ID {song_id} not found in the playlist")
 
+        version_before = self.playlist.membership_version
         self.playlist.remove(song_id)
+        self._update_durations(version_before, removed_id=song_id)
+        self._persist("remove", song_id)
+        self.version.bump()
         logger.info(f"Successfully removed song with ID {song_id} from the playlist")
 
     def remove_song_by_track_number(self, track_number: int) -> None:
@@ -135,8 +335,13 @@ class PlaylistModel:
         track_number = self.validate_track_number(track_number)
         playlist_index = track_number - 1
 
-        logger.info(f"Successfully removed song at track number {track_number}")
+        version_before = self.playlist.membership_version
+        song_id = self.playlist[playlist_index]
         del self.playlist[playlist_index]
+        self._update_durations(version_before, removed_id=song_id)
+        self._persist("remove", song_id)
+        self.version.bump()
+        logger.info(f"Successfully removed song at track number {track_number}")
 
     def clear_playlist(self) -> None:
         """Clears all songs from the playlist.
@@ -153,6 +358,11 @@ class PlaylistModel:
             logger.warning("Clearing an empty playlist")
 
         self.playlist.clear()
+        self._durations = {}
+        self._total_duration = 0
+        self._durations_version = self.playlist.membership_version
+        self._persist("replace", [], self._current_track_number)
+        self.version.bump()
         logger.info("Successfully cleared the playlist")
 
 
@@ -161,46 +371,48 @@ class PlaylistModel:
     ##################################################
 
 
-    def get_all_songs(self) -> List[Songs]:
+    def get_all_songs(self) -> List[SongSnapshot]:
         """Returns a list of all songs in the playlist using cached song data.
 
+        Songs missing from the cache are loaded together in one batched query.
+
         Returns:
-            List[Song]: A list of all songs in the playlist.
+            List[SongSnapshot]: A list of all songs in the playlist.
 
         Raises:
             ValueError: If the playlist is empty.
         """
         self.check_if_empty()
         logger.info("Retrieving all songs in the playlist")
-        return [self._get_song_from_cache_or_db(song_id) for song_id in self.playlist]
+        return self._get_songs_from_cache_or_db(self.playlist)
 
-    def get_song_by_song_id(self, song_id: int) -> Songs:
+    def get_song_by_song_id(self, song_id: int) -> SongSnapshot:
         """Retrieves a song from the playlist by its song ID using the cache or DB.
 
         Args:
             song_id (int): The ID of the song to retrieve.
 
         Returns:
-            Song: The song with the specified ID.
+            SongSnapshot: The song with the specified ID.
 
         Raises:
             ValueError: If the playlist is empty or the song is not found.
         """
         self.check_if_empty()
-        song_id = self.validate_song_id(song_id)
+        song_id = self.validate_song_id(song_id, check_in_db=False)
         logger.info(f"Retrieving song with ID {song_id} from the playlist")
         song = self._get_song_from_cache_or_db(song_id)
         logger.info(f"Successfully retrieved song: {song.artist} - {song.title} ({song.year})")
         return song
 
-    def get_song_by_track_number(self, track_number: int) -> Songs:
+    def get_song_by_track_number(self, track_number: int) -> SongSnapshot:
         """Retrieves a song from the playlist by its track number (1-indexed).
 
         Args:
             track_number (int): The track number of the song to retrieve.
 
         Returns:
-            Song: The song at the specified track number.
+            SongSnapshot: The song at the specified track number.
 
         Raises:
             ValueError: If the playlist is empty or the track number is invalid.
@@ -215,11 +427,11 @@ class PlaylistModel:
         logger.info(f"Successfully retrieved song: {song.artist} - {song.title} ({song.year})")
         return song
 
-    def get_current_song(self) -> Songs:
+    def get_current_song(self) -> SongSnapshot:
         """Returns the current song being played.
 
         Returns:
-            Song: The currently playing song.
+            SongSnapshot: The currently playing song.
 
         Raises:
             ValueError: If the playlist is empty.
@@ -241,12 +453,18 @@ class PlaylistModel:
 
     def get_playlist_duration(self) -> int:
         """
-        Returns the total duration of the playlist in seconds using cached songs.
+        Returns the total duration of the playlist in seconds.
+
+        The running total is returned in O(1). If the playlist list was modified directly
+        since it was last updated, it is first rebuilt from the songs, loading any that are
+        not cached in one batched query.
 
         Returns:
             int: The total duration of all songs in the playlist in seconds.
         """
-        total_duration = sum(self._get_song_from_cache_or_db(song_id).duration for song_id in self.playlist)
+        if self._durations_version != self.playlist.membership_version:
+            self._rebuild_durations()
+        total_duration = self._total_duration
         logger.info(f"Retrieving total playlist duration: {total_duration} seconds")
         return total_duration
 
@@ -298,10 +516,11 @@ class PlaylistModel:
         """
         logger.info(f"Moving song with ID {song_id} to the beginning of the playlist")
         self.check_if_empty()
-        song_id = self.validate_song_id(song_id)
+        song_id = self.validate_song_id(song_id, check_in_db=False)
 
-        self.playlist.remove(song_id)
-        self.playlist.insert(0, song_id)
+        self.playlist.move(self.playlist.index(song_id), 0)
+        self._persist_position(song_id)
+        self.version.bump()
 
         logger.info(f"Successfully moved song with ID {song_id} to the beginning")
 
@@ -317,10 +536,11 @@ class PlaylistModel:
         """
         logger.info(f"Moving song with ID {song_id} to the end of the playlist")
         self.check_if_empty()
-        song_id = self.validate_song_id(song_id)
+        song_id = self.validate_song_id(song_id, check_in_db=False)
 
-        self.playlist.remove(song_id)
-        self.playlist.append(song_id)
+        self.playlist.move(self.playlist.index(song_id), -1)
+        self._persist_position(song_id)
+        self.version.bump()
 
         logger.info(f"Successfully moved song with ID {song_id} to the end")
 
@@ -337,13 +557,14 @@ class PlaylistModel:
         """
         logger.info(f"Moving song with ID {song_id} to track number {track_number}")
         self.check_if_empty()
-        song_id = self.validate_song_id(song_id)
+        song_id = self.validate_song_id(song_id, check_in_db=False)
         track_number = self.validate_track_number(track_number)
 
         playlist_index = track_number - 1
 
-        self.playlist.remove(song_id)
-        self.playlist.insert(playlist_index, song_id)
+        self.playlist.move(self.playlist.index(song_id), playlist_index)
+        self._persist_position(song_id)
+        self.version.bump()
 
         logger.info(f"Successfully moved song with ID {song_id} to track number {track_number}")
 
@@ -360,8 +581,7 @@ class PlaylistModel:
         """
         logger.info(f"Swapping songs with IDs {song1_id} and {song2_id}")
         self.check_if_empty()
-        song1_id = self.validate_song_id(song1_id)
-        song2_id = self.validate_song_id(song2_id)
+        song1_id, song2_id = self.validate_song_ids([song1_id, song2_id])
 
         if song1_id == song2_id:
             logger.error(f"Cannot swap a song with itself: {song1_id}")
@@ -369,11 +589,137 @@ class PlaylistModel:
 
         index1, index2 = self.playlist.index(song1_id), self.playlist.index(song2_id)
 
-        self.playlist[index1], self.playlist[index2] = self.playlist[index2], self.playlist[index1]
+        self.playlist.swap(index1, index2)
+        self._persist("swap", song1_id, song2_id)
+        self.version.bump()
 
         logger.info(f"Successfully swapped songs with IDs {song1_id} and {song2_id}")
 
 
+    ##################################################
+    # Batch Functions
+    ##################################################
+
+
+    def _parse_operation(self, number: int, operation: Dict[str, Any]) -> Tuple[str, int, Optional[int]]:
+        """Validates one batch operation, returning its name, song ID and track number or second song ID."""
+        if not isinstance(operation, dict):
+            raise ValueError(f"Operation {number} must be an object")
+
+        name = operation.get("op")
+        if name not in BATCH_OPERATIONS:
+            raise ValueError(f"Operation {number} has unknown op {name!r}; expected one of {', '.join(BATCH_OPERATIONS)}")
+
+        required = {"move": ["song_id", "track_number"], "swap": ["song_id", "other_song_id"]}.get(name, ["song_id"])
+        missing = [field for field in required if field not in operation]
+        if missing:
+            raise ValueError(f"Operation {number} ({name}) is missing: {', '.join(missing)}")
+
+        try:
+            song_id = self.validate_song_id(operation["song_id"], check_in_playlist=False, check_in_db=False)
+            argument = None
+            if name == "move":
+                argument = int(operation["track_number"])
+            elif name == "swap":
+                argument = self.validate_song_id(operation["other_song_id"], check_in_playlist=False, check_in_db=False)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Operation {number} ({name}) is invalid: {e}") from e
+        return name, song_id, argument
+
+    def apply_operations(self, operations: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Applies an ordered list of add, remove, move and swap operations atomically.
+
+        Each operation is a dictionary, e.g.:
+            {"op": "add", "song_id": 5}
+            {"op": "remove", "song_id": 5}
+            {"op": "move", "song_id": 5, "track_number": 1}
+            {"op": "swap", "song_id": 5, "other_song_id": 7}
+
+        The songs being added are checked against the database with one batched lookup
+        up front. The operations are then applied in order to a copy of the playlist, each
+        seeing the result of the ones before it, and the copy replaces the playlist (with a
+        single store write) only if every operation succeeds.
+
+        Args:
+            operations (List[Dict[str, Any]]): The operations to apply, in order.
+
+        Returns:
+            dict[str, int]: The number of operations applied, songs added and removed, and the
+                new playlist length.
+
+        Raises:
+            ValueError: If there are too many operations or any operation is invalid. The
+                playlist is left unchanged.
+        """
+        logger.info(f"Received request to apply {len(operations)} playlist operations")
+        if len(operations) > MAX_BATCH_OPERATIONS:
+            logger.error(f"Too many batch operations: {len(operations)}")
+            raise ValueError(f"A batch may contain at most {MAX_BATCH_OPERATIONS} operations")
+
+        parsed = [self._parse_operation(number, operation) for number, operation in enumerate(operations, start=1)]
+
+        add_ids = list(dict.fromkeys(song_id for name, song_id, _ in parsed if name == "add"))
+        songs = Songs.get_cached_songs_by_ids(add_ids) if add_ids else {}
+        missing = [song_id for song_id in add_ids if song_id not in songs]
+        if missing:
+            logger.error(f"Songs with ids {missing} not found in database")
+            raise ValueError(f"Songs with ids {missing} not found in database")
+
+        working = IndexedList(self.playlist)
+        for number, (name, song_id, argument) in enumerate(parsed, start=1):
+            try:
+                if name == "add":
+                    if song_id in working:
+                        raise ValueError(f"Song with ID {song_id} already exists in the playlist")
+                    working.append(song_id)
+                    continue
+                if song_id not in working:
+                    raise ValueError(f"Song with id {song_id} not found in playlist")
+                if name == "remove":
+                    working.remove(song_id)
+                elif name == "move":
+                    if not 1 <= argument <= len(working):
+                        raise ValueError(f"Invalid track number: {argument}")
+                    working.move(working.index(song_id), argument - 1)
+                else:
+                    if argument not in working:
+                        raise ValueError(f"Song with id {argument} not found in playlist")
+                    if argument == song_id:
+                        raise ValueError(f"Cannot swap a song with itself: {song_id}")
+                    working.swap(working.index(song_id), working.index(argument))
+            except ValueError as e:
+                logger.error(f"Batch operation {number} ({name}) failed; playlist left unchanged: {e}")
+                raise ValueError(f"Operation {number} ({name}) failed: {e}") from e
+
+        old = self.playlist
+        removed = [song_id for song_id in old if song_id not in working]
+        added = [songs[song_id] for song_id in add_ids if song_id in working and song_id not in old]
+
+        if self._durations_version == old.membership_version:
+            for song_id in removed:
+                self._total_duration -= self._durations.pop(song_id)
+            for song in added:
+                self._durations[song.id] = song.duration
+                self._total_duration += song.duration
+            self._durations_version = working.membership_version
+        else:
+            self._durations_version = None
+
+        self._playlist = working
+        self._persist("replace", list(working), self._current_track_number)
+        self.version.bump()
+
+        summary = {
+            "operations": len(parsed),
+            "added": len(added),
+            "removed": len(removed),
+            "playlist_length": len(working),
+        }
+        logger.info(f"Applied {len(parsed)} playlist operations: {len(added)} added, {len(removed)} removed")
+        return summary
+
+
     ##################################################
     # Playlist Playback Functions
     ##################################################
@@ -396,9 +742,46 @@ class PlaylistModel:
         self.current_track_number = (self.current_track_number % self.get_playlist_length()) + 1
         logger.info(f"Advanced to track number: {self.current_track_number}")
 
-    def play_entire_playlist(self) -> None:
+    def _play_tracks_from(self, track_number: int) -> Dict[str, int]:
+        """
+        Plays every track from track_number to the end of the playlist in one batch.
+
+        The tracks are looked up together through the song cache, their play counts are
+        incremented in one batched write, and the current track wraps back to 1, as it
+        would after playing the last track with play_current_song().
+
+        Args:
+            track_number (int): The first track to play (1-indexed).
+
+        Returns:
+            dict[str, int]: The first track played, the number of tracks played, their total
+                duration in seconds and the new current track number.
+
+        Raises:
+            ValueError: If any of the songs cannot be found in the database.
+        """
+        song_ids = self.playlist[track_number - 1:]
+        songs = self._get_songs_from_cache_or_db(song_ids)
+        Songs.update_play_counts(song_ids)
+        if songs:
+            self.current_track_number = 1
+
+        summary = {
+            "first_track": track_number,
+            "tracks_played": len(songs),
+            "duration": sum(song.duration for song in songs),
+            "current_track_number": self.current_track_number,
+        }
+        logger.info(f"Played {summary['tracks_played']} tracks from track number {track_number} "
+                    f"({summary['duration']} seconds)")
+        return summary
+
+    def play_entire_playlist(self) -> Dict[str, int]:
         """Plays all songs in the playlist from the beginning.
 
+        Returns:
+            dict[str, int]: A summary of the tracks played. See _play_tracks_from.
+
         Raises:
             ValueError: If the playlist is empty.
 
@@ -406,15 +789,14 @@ class PlaylistModel:
         self.check_if_empty()
         logger.info("Starting to play the entire playlist.")
 
-        self.current_track_number = 1
-        for _ in range(self.get_playlist_length()):
-            self.play_current_song()
-
-        logger.info("Finished playing the entire playlist.")
+        return self._play_tracks_from(1)
 
-    def play_rest_of_playlist(self) -> None:
+    def play_rest_of_playlist(self) -> Dict[str, int]:
         """Plays the remaining songs in the playlist from the current track onward.
 
+        Returns:
+            dict[str, int]: A summary of the tracks played. See _play_tracks_from.
+
         Raises:
             ValueError: If the playlist is empty.
 
@@ -422,10 +804,7 @@ class PlaylistModel:
         self.check_if_empty()
         logger.info(f"Playing the rest of the playlist from track number: {self.current_track_number}")
 
-        for _ in range(self.get_playlist_length() - self.current_track_number + 1):
-            self.play_current_song()
-
-        logger.info("Finished playing the rest of the playlist.")
+        return self._play_tracks_from(self.current_track_number)
 
     def rewind_playlist(self) -> None:
         """Resets the playlist to the first track.
@@ -451,7 +830,7 @@ class PlaylistModel:
     #
     ####################################################################################################
 
-    def validate_song_id(self, song_id: int, check_in_playlist: bool = True) -> int:
+    def validate_song_id(self, song_id: int, check_in_playlist: bool = True, check_in_db: bool = True) -> int:
         """
         Validates the given song ID.
 
@@ -459,6 +838,9 @@ class PlaylistModel:
             song_id (int): The song ID to validate.
             check_in_playlist (bool, optional): If True, verifies the ID is present in the playlist.
                                                 If False, skips that check. Defaults to True.
+            check_in_db (bool, optional): If True, verifies the song exists in the database.
+                                          Operations on songs already in the playlist pass False,
+                                          since songs are checked when they are added. Defaults to True.
 
         Returns:
             int: The validated song ID.
@@ -480,6 +862,9 @@ class PlaylistModel:
             logger.error(f"Song with id {song_id} not found in playlist")
             raise ValueError(f"Song with id {song_id} not found in playlist")
 
+        if not check_in_db:
+            return song_id
+
         try:
             self._get_song_from_cache_or_db(song_id)
         except Exception as e:
@@ -488,6 +873,27 @@ class PlaylistModel:
 
         return song_id
 
+    def validate_song_ids(self, song_ids: Iterable[int], check_in_playlist: bool = True) -> List[int]:
+        """
+        Validates several song IDs.
+
+        Args:
+            song_ids (Iterable[int]): The song IDs to validate.
+            check_in_playlist (bool, optional): If True, verifies every ID is present in the playlist.
+                                                Defaults to True.
+
+        Returns:
+            List[int]: The validated song IDs, in the given order.
+
+        Raises:
+            ValueError: If any song ID is not a non-negative integer,
+                        or not found in the playlist (if check_in_playlist=True).
+        """
+        return [
+            self.validate_song_id(song_id, check_in_playlist=check_in_playlist, check_in_db=False)
+            for song_id in song_ids
+        ]
+
     def validate_track_number(self, track_number: int) -> int:
         """
         Validates the given track number, ensuring it is within the playlist's range.
@@ -0,0 +1,206 @@
+from contextlib import contextmanager
+import logging
+import os
+import threading
+import time
+from typing import Dict, Hashable, Iterator, Optional
+
+from playlist.models.playlist_model import PlaylistModel
+from playlist.models.playlist_store import PlaylistStore
+from playlist.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+PLAYLIST_IDLE_SECONDS = float(os.getenv("PLAYLIST_IDLE_SECONDS", 3600))
+
+
+class _UserPlaylist:
+    """A user's playlist, the lock serializing access to it and its usage bookkeeping."""
+
+    __slots__ = ("model", "lock", "last_used", "pins", "discarded")
+
+    def __init__(self):
+        self.model: Optional[PlaylistModel] = None
+        self.lock = threading.RLock()
+        self.last_used = time.monotonic()
+        self.pins = 0
+        self.discarded = False
+
+
+class PlaylistRegistry:
+    """
+    A thread-safe registry of per-user playlists.
+
+    Each user gets their own PlaylistModel, created on first use. checkout()
+    holds that user's lock for the duration of the block, so concurrent
+    requests from one user are applied one at a time while requests from
+    different users run in parallel. Playlists that have not been checked out
+    for idle_seconds are dropped; a playlist that is checked out, or waiting
+    to be, is never dropped.
+
+    With a store, playlists are loaded from it on first use and written through
+    to it, and each checkout first picks up changes made by other processes.
+    Dropping an idle playlist then only frees memory.
+
+    """
+
+    def __init__(self, idle_seconds: float = PLAYLIST_IDLE_SECONDS, store: Optional[PlaylistStore] = None):
+        """Initializes an empty registry.
+
+        Args:
+            idle_seconds (float): How long a playlist may go unused before it is dropped.
+            store (PlaylistStore, optional): Where playlists are persisted. None keeps them in memory only.
+
+        """
+        if idle_seconds <= 0:
+            raise ValueError("idle_seconds must be positive.")
+
+        self.idle_seconds = idle_seconds
+        self.store = store
+        self._playlists: Dict[Hashable, _UserPlaylist] = {}
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+        self.evictions = 0
+
+    @contextmanager
+    def checkout(self, user_id: Hashable) -> Iterator[PlaylistModel]:
+        """
+        Yields the user's playlist, holding the user's lock until the block exits.
+
+        Idle playlists of other users are dropped at most once per idle_seconds.
+
+        Args:
+            user_id (Hashable): The ID of the user whose playlist is needed.
+
+        Yields:
+            PlaylistModel: The user's playlist, created empty if they have none.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_sweep >= self.idle_seconds:
+                self._evict_idle(now)
+            entry = self._playlists.get(user_id)
+            if entry is None:
+                logger.info(f"Creating playlist for user {user_id}")
+                entry = self._playlists[user_id] = _UserPlaylist()
+            entry.pins += 1
+
+        try:
+            with entry.lock:
+                if entry.model is None:
+                    entry.model = PlaylistModel(store=self.store, owner=user_id)
+                else:
+                    entry.model.sync()
+                yield entry.model
+        finally:
+            with self._lock:
+                entry.pins -= 1
+                entry.last_used = time.monotonic()
+                if entry.discarded and not entry.pins and self._playlists.get(user_id) is entry:
+                    del self._playlists[user_id]
+
+    def _evict_idle(self, now: float) -> None:
+        """Drops unpinned playlists idle for idle_seconds or more. Must hold the lock."""
+        idle = [
+            user_id for user_id, entry in self._playlists.items()
+            if not entry.pins and now - entry.last_used >= self.idle_seconds
+        ]
+        for user_id in idle:
+            del self._playlists[user_id]
+        self.evictions += len(idle)
+        self._last_sweep = now
+        if idle:
+            logger.info(f"Dropped {len(idle)} idle playlists")
+
+    def evict_idle(self) -> int:
+        """
+        Drops every playlist that is not checked out and has been idle for idle_seconds.
+
+        Returns:
+            int: The number of playlists dropped.
+        """
+        with self._lock:
+            before = self.evictions
+            self._evict_idle(time.monotonic())
+            return self.evictions - before
+
+    def discard(self, user_id: Hashable) -> None:
+        """
+        Drops a user's playlist.
+
+        A playlist that is checked out, or waiting to be, is dropped when the last
+        checkout is released, so requests from the user never hold two copies at once.
+
+        Args:
+            user_id (Hashable): The ID of the user whose playlist is dropped.
+        """
+        with self._lock:
+            entry = self._playlists.get(user_id)
+            if entry is None:
+                return
+            if entry.pins:
+                entry.discarded = True
+            else:
+                del self._playlists[user_id]
+
+    def remove_song(self, song_id: int) -> int:
+        """
+        Removes a song deleted from the catalog from every playlist.
+
+        Playlists held here are changed under their user's lock, which keeps their
+        running durations in step. With a store, the song is then removed from the
+        stored playlists of every other user; processes holding those pick the
+        change up on their next checkout.
+
+        Args:
+            song_id (int): The ID of the deleted song.
+
+        Returns:
+            int: The number of playlists the song was removed from.
+        """
+        with self._lock:
+            entries = list(self._playlists.values())
+
+        removed = 0
+        for entry in entries:
+            with entry.lock:
+                if entry.model is not None and song_id in entry.model.playlist:
+                    entry.model.remove_song_by_song_id(song_id)
+                    removed += 1
+        if self.store is not None:
+            removed += self.store.remove_song_everywhere(song_id)
+        if removed:
+            logger.info(f"Removed deleted song {song_id} from {removed} playlists")
+        return removed
+
+    def clear(self) -> None:
+        """Drops every playlist, including those in the store. Checked out playlists are dropped when released."""
+        with self._lock:
+            for user_id, entry in list(self._playlists.items()):
+                if entry.pins:
+                    entry.discarded = True
+                else:
+                    del self._playlists[user_id]
+            if self.store is not None:
+                self.store.clear_all()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._playlists)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the number of playlists held and the eviction counter.
+
+        Returns:
+            dict[str, int]: The size, active (checked out) count and evictions.
+        """
+        with self._lock:
+            return {
+                "size": len(self._playlists),
+                "active": sum(1 for entry in self._playlists.values() if entry.pins),
+                "evictions": self.evictions,
+            }
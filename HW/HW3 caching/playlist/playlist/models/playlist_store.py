@@ -0,0 +1,437 @@
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+import logging
+from typing import Dict, Hashable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import Connection, bindparam, delete, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from playlist.db import db
+from playlist.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# Spacing between the ordering keys of neighbouring tracks. A track can be placed
+# between two neighbours without touching any other row until their keys are
+# adjacent integers, after which the owner's keys are spread out again.
+POSITION_GAP = 1 << 16
+
+
+class PlaylistState(NamedTuple):
+    """A stored playlist: its song IDs in track order, current track and version."""
+
+    song_ids: List[int]
+    current_track_number: int
+    version: int
+
+
+def _key_between(lower: Optional[int], upper: Optional[int]) -> Optional[int]:
+    """
+    Returns an ordering key strictly between two neighbours' keys.
+
+    Args:
+        lower (int, optional): The key of the preceding track, or None at the start.
+        upper (int, optional): The key of the following track, or None at the end.
+
+    Returns:
+        int | None: The new key, or None if the neighbours' keys are adjacent.
+    """
+    if lower is None and upper is None:
+        return POSITION_GAP
+    if lower is None:
+        return upper - POSITION_GAP
+    if upper is None:
+        return lower + POSITION_GAP
+    if upper - lower > 1:
+        return (lower + upper) // 2
+    return None
+
+
+class PlaylistStore(ABC):
+    """
+    Persists per-owner playlist state outside the process.
+
+    Tracks are ordered by sparse integer keys, so adding, removing, moving or
+    swapping tracks writes one or two rows rather than rewriting the list.
+    Every change to the tracks increments the owner's version, which lets a
+    process holding a copy of the playlist tell cheaply whether another
+    process has changed it. Changing the current track does not.
+
+    """
+
+    @abstractmethod
+    def load(self, owner: Hashable) -> PlaylistState:
+        """Returns the owner's playlist, or an empty one at version 0 if none is stored."""
+
+    @abstractmethod
+    def head(self, owner: Hashable) -> Tuple[int, int]:
+        """Returns the owner's version and current track number without reading the tracks."""
+
+    @abstractmethod
+    def place(self, owner: Hashable, song_id: int, after: Optional[int], before: Optional[int]) -> int:
+        """
+        Adds song_id, or moves it if already present, between two neighbouring tracks.
+
+        Args:
+            owner (Hashable): The playlist owner.
+            song_id (int): The song to add or move.
+            after (int, optional): The song that should precede it, or None for the first track.
+            before (int, optional): The song that should follow it, or None for the last track.
+
+        Returns:
+            int: The owner's new version.
+        """
+
+    @abstractmethod
+    def remove(self, owner: Hashable, song_id: int) -> int:
+        """Removes song_id from the owner's playlist and returns the new version."""
+
+    @abstractmethod
+    def swap(self, owner: Hashable, song1_id: int, song2_id: int) -> int:
+        """Exchanges the positions of two songs and returns the new version."""
+
+    @abstractmethod
+    def replace(self, owner: Hashable, song_ids: Iterable[int], current_track_number: int) -> int:
+        """Overwrites the owner's playlist and returns the new version."""
+
+    @abstractmethod
+    def set_current_track(self, owner: Hashable, track_number: int) -> None:
+        """Stores the owner's current track number."""
+
+    @abstractmethod
+    def remove_song_everywhere(self, song_id: int) -> int:
+        """
+        Removes song_id from every owner's playlist, bumping the version of each one it was in.
+
+        Args:
+            song_id (int): The song to remove, e.g. one deleted from the catalog.
+
+        Returns:
+            int: The number of playlists the song was removed from.
+        """
+
+    @abstractmethod
+    def clear_all(self) -> None:
+        """Removes every owner's playlist."""
+
+
+class PlaylistHead(db.Model):
+    """The version and current track of a stored playlist."""
+
+    __tablename__ = "PlaylistHeads"
+
+    owner = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    current_track_number = db.Column(db.Integer, nullable=False, default=1)
+
+
+class PlaylistEntry(db.Model):
+    """A track of a stored playlist, ordered within its owner's playlist by position."""
+
+    __tablename__ = "PlaylistEntries"
+    __table_args__ = (
+        db.Index("idx_playlist_entries_owner_position", "owner", "position"),
+    )
+
+    owner = db.Column(db.String(64), primary_key=True)
+    song_id = db.Column(db.Integer, primary_key=True)
+    position = db.Column(db.BigInteger, nullable=False)
+
+
+class SQLitePlaylistStore(PlaylistStore):
+    """
+    Stores playlists in the application database, one row per track.
+
+    Each call runs in its own transaction on a dedicated connection from the
+    engine, so it never commits or rolls back the caller's session. Versions
+    are incremented in the database, so concurrent writers never lose a bump.
+    It must be used inside an application context.
+
+    """
+
+    @contextmanager
+    def _transaction(self, action: str) -> Iterator[Connection]:
+        """Yields a connection whose transaction commits when the block exits, logging any database error."""
+        try:
+            with db.engine.begin() as connection:
+                yield connection
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while {action}: {e}")
+            raise
+
+    def _ensure_head(self, connection: Connection, owner: str) -> None:
+        """Creates the owner's head row at version 0 unless it exists."""
+        connection.execute(
+            sqlite_insert(PlaylistHead).values(owner=owner, version=0, current_track_number=1)
+            .on_conflict_do_nothing(index_elements=["owner"])
+        )
+
+    def _bump(self, connection: Connection, owner: str) -> int:
+        """Increments the owner's version in the database and returns the new value."""
+        self._ensure_head(connection, owner)
+        return connection.execute(
+            update(PlaylistHead)
+            .where(PlaylistHead.owner == owner)
+            .values(version=PlaylistHead.version + 1)
+            .returning(PlaylistHead.version)
+        ).scalar_one()
+
+    def _set_positions(self, connection: Connection, owner: str, positions: Dict[int, int]) -> None:
+        """Sets the ordering keys of the owner's tracks with one executemany."""
+        connection.execute(
+            update(PlaylistEntry)
+            .where(PlaylistEntry.owner == owner, PlaylistEntry.song_id == bindparam("entry_song_id"))
+            .values(position=bindparam("entry_position")),
+            [{"entry_song_id": song_id, "entry_position": key} for song_id, key in positions.items()],
+        )
+
+    def _ordered_song_ids(self, connection: Connection, owner: str) -> List[int]:
+        return list(connection.execute(
+            select(PlaylistEntry.song_id)
+            .where(PlaylistEntry.owner == owner)
+            .order_by(PlaylistEntry.position, PlaylistEntry.song_id)
+        ).scalars())
+
+    def load(self, owner: Hashable) -> PlaylistState:
+        owner = str(owner)
+        with self._transaction(f"loading the playlist of {owner}") as connection:
+            head = connection.execute(
+                select(PlaylistHead.version, PlaylistHead.current_track_number).where(PlaylistHead.owner == owner)
+            ).first()
+            song_ids = self._ordered_song_ids(connection, owner)
+        if head is None:
+            return PlaylistState([], 1, 0)
+        return PlaylistState(song_ids, head.current_track_number, head.version)
+
+    def head(self, owner: Hashable) -> Tuple[int, int]:
+        owner = str(owner)
+        with self._transaction(f"reading the playlist version of {owner}") as connection:
+            head = connection.execute(
+                select(PlaylistHead.version, PlaylistHead.current_track_number).where(PlaylistHead.owner == owner)
+            ).first()
+        return (0, 1) if head is None else (head.version, head.current_track_number)
+
+    def _respace(self, connection: Connection, owner: str) -> None:
+        """Spreads the owner's ordering keys POSITION_GAP apart."""
+        song_ids = self._ordered_song_ids(connection, owner)
+        self._set_positions(
+            connection, owner, {song_id: number * POSITION_GAP for number, song_id in enumerate(song_ids, start=1)}
+        )
+        logger.info(f"Respaced the {len(song_ids)} track positions of playlist {owner}")
+
+    def _neighbour_keys(self, connection: Connection, owner: str, after: Optional[int],
+                        before: Optional[int]) -> Tuple[Optional[int], Optional[int]]:
+        neighbours = [song_id for song_id in (after, before) if song_id is not None]
+        keys = dict(connection.execute(
+            select(PlaylistEntry.song_id, PlaylistEntry.position)
+            .where(PlaylistEntry.owner == owner, PlaylistEntry.song_id.in_(neighbours))
+        ).all()) if neighbours else {}
+        return keys.get(after), keys.get(before)
+
+    def place(self, owner: Hashable, song_id: int, after: Optional[int], before: Optional[int]) -> int:
+        owner = str(owner)
+        with self._transaction(f"placing song {song_id} in the playlist of {owner}") as connection:
+            key = _key_between(*self._neighbour_keys(connection, owner, after, before))
+            if key is None:
+                self._respace(connection, owner)
+                key = _key_between(*self._neighbour_keys(connection, owner, after, before))
+
+            connection.execute(
+                sqlite_insert(PlaylistEntry).values(owner=owner, song_id=song_id, position=key)
+                .on_conflict_do_update(index_elements=["owner", "song_id"], set_={"position": key})
+            )
+            return self._bump(connection, owner)
+
+    def remove(self, owner: Hashable, song_id: int) -> int:
+        owner = str(owner)
+        with self._transaction(f"removing song {song_id} from the playlist of {owner}") as connection:
+            connection.execute(
+                delete(PlaylistEntry).where(PlaylistEntry.owner == owner, PlaylistEntry.song_id == song_id)
+            )
+            return self._bump(connection, owner)
+
+    def swap(self, owner: Hashable, song1_id: int, song2_id: int) -> int:
+        owner = str(owner)
+        with self._transaction(f"swapping songs {song1_id} and {song2_id} of {owner}") as connection:
+            key1, key2 = self._neighbour_keys(connection, owner, song1_id, song2_id)
+            self._set_positions(connection, owner, {song1_id: key2, song2_id: key1})
+            return self._bump(connection, owner)
+
+    def replace(self, owner: Hashable, song_ids: Iterable[int], current_track_number: int) -> int:
+        owner = str(owner)
+        entries = [
+            {"owner": owner, "song_id": song_id, "position": number * POSITION_GAP}
+            for number, song_id in enumerate(song_ids, start=1)
+        ]
+        with self._transaction(f"replacing the playlist of {owner}") as connection:
+            connection.execute(delete(PlaylistEntry).where(PlaylistEntry.owner == owner))
+            if entries:
+                connection.execute(insert(PlaylistEntry), entries)
+            version = self._bump(connection, owner)
+            connection.execute(
+                update(PlaylistHead).where(PlaylistHead.owner == owner)
+                .values(current_track_number=current_track_number)
+            )
+        return version
+
+    def set_current_track(self, owner: Hashable, track_number: int) -> None:
+        owner = str(owner)
+        with self._transaction(f"setting the current track of {owner}") as connection:
+            self._ensure_head(connection, owner)
+            connection.execute(
+                update(PlaylistHead).where(PlaylistHead.owner == owner).values(current_track_number=track_number)
+            )
+
+    def remove_song_everywhere(self, song_id: int) -> int:
+        with self._transaction(f"removing song {song_id} from every playlist") as connection:
+            owners = list(connection.execute(
+                delete(PlaylistEntry).where(PlaylistEntry.song_id == song_id).returning(PlaylistEntry.owner)
+            ).scalars())
+            for owner in owners:
+                self._bump(connection, owner)
+        return len(owners)
+
+    def clear_all(self) -> None:
+        with self._transaction("deleting all playlists") as connection:
+            connection.execute(delete(PlaylistEntry))
+            connection.execute(delete(PlaylistHead))
+
+
+class RedisPlaylistStore(PlaylistStore):
+    """
+    Stores playlists in Redis, or any server speaking its protocol.
+
+    Each owner has a sorted set of song IDs scored by ordering key and a hash
+    holding the version and current track. Writes are sent as one MULTI/EXEC
+    transaction. Requires the optional redis package.
+
+    """
+
+    def __init__(self, client, prefix: str = "playlist"):
+        """Initializes the store.
+
+        Args:
+            client: A redis.Redis client (or compatible).
+            prefix (str): The prefix of every key the store writes.
+
+        """
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "playlist") -> "RedisPlaylistStore":
+        """Creates a store connected to the server at url, e.g. redis://localhost:6379/0."""
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("The redis package is required for the Redis playlist store") from e
+        return cls(redis.Redis.from_url(url), prefix=prefix)
+
+    def _keys(self, owner: Hashable) -> Tuple[str, str]:
+        return f"{self.prefix}:{owner}:tracks", f"{self.prefix}:{owner}:head"
+
+    def load(self, owner: Hashable) -> PlaylistState:
+        tracks, head = self._keys(owner)
+        pipe = self.client.pipeline(transaction=True)
+        pipe.zrange(tracks, 0, -1)
+        pipe.hmget(head, "version", "current_track_number")
+        song_ids, (version, current) = pipe.execute()
+        return PlaylistState([int(song_id) for song_id in song_ids], int(current or 1), int(version or 0))
+
+    def head(self, owner: Hashable) -> Tuple[int, int]:
+        version, current = self.client.hmget(self._keys(owner)[1], "version", "current_track_number")
+        return int(version or 0), int(current or 1)
+
+    def _write(self, owner: Hashable, commands) -> int:
+        """Runs commands(pipe, tracks_key) and bumps the version in one transaction."""
+        tracks, head = self._keys(owner)
+        pipe = self.client.pipeline(transaction=True)
+        commands(pipe, tracks)
+        pipe.hincrby(head, "version", 1)
+        return int(pipe.execute()[-1])
+
+    def _neighbour_keys(self, tracks: str, after: Optional[int], before: Optional[int]) -> Tuple[Optional[int], Optional[int]]:
+        neighbours = [song_id for song_id in (after, before) if song_id is not None]
+        scores = dict(zip(neighbours, self.client.zmscore(tracks, neighbours))) if neighbours else {}
+        keys = [scores.get(song_id) for song_id in (after, before)]
+        return tuple(None if key is None else int(key) for key in keys)
+
+    def place(self, owner: Hashable, song_id: int, after: Optional[int], before: Optional[int]) -> int:
+        tracks = self._keys(owner)[0]
+        key = _key_between(*self._neighbour_keys(tracks, after, before))
+        if key is None:
+            song_ids = self.client.zrange(tracks, 0, -1)
+            self.client.zadd(tracks, {song: number * POSITION_GAP for number, song in enumerate(song_ids, start=1)})
+            logger.info(f"Respaced the {len(song_ids)} track positions of playlist {owner}")
+            key = _key_between(*self._neighbour_keys(tracks, after, before))
+        return self._write(owner, lambda pipe, tracks: pipe.zadd(tracks, {song_id: key}))
+
+    def remove(self, owner: Hashable, song_id: int) -> int:
+        return self._write(owner, lambda pipe, tracks: pipe.zrem(tracks, song_id))
+
+    def swap(self, owner: Hashable, song1_id: int, song2_id: int) -> int:
+        tracks = self._keys(owner)[0]
+        score1, score2 = self.client.zmscore(tracks, [song1_id, song2_id])
+        return self._write(owner, lambda pipe, tracks: pipe.zadd(tracks, {song1_id: score2, song2_id: score1}))
+
+    def replace(self, owner: Hashable, song_ids: Iterable[int], current_track_number: int) -> int:
+        mapping = {song_id: number * POSITION_GAP for number, song_id in enumerate(song_ids, start=1)}
+        head = self._keys(owner)[1]
+
+        def commands(pipe, tracks):
+            pipe.delete(tracks)
+            if mapping:
+                pipe.zadd(tracks, mapping)
+            pipe.hset(head, "current_track_number", current_track_number)
+
+        return self._write(owner, commands)
+
+    def set_current_track(self, owner: Hashable, track_number: int) -> None:
+        self.client.hset(self._keys(owner)[1], "current_track_number", track_number)
+
+    def remove_song_everywhere(self, song_id: int) -> int:
+        removed = 0
+        suffix = ":tracks"
+        for tracks in self.client.scan_iter(match=f"{self.prefix}:*{suffix}"):
+            if isinstance(tracks, bytes):
+                tracks = tracks.decode()
+            if self.client.zscore(tracks, song_id) is None:
+                continue
+            owner = tracks[len(self.prefix) + 1:-len(suffix)]
+            self._write(owner, lambda pipe, tracks: pipe.zrem(tracks, song_id))
+            removed += 1
+        return removed
+
+    def clear_all(self) -> None:
+        keys = list(self.client.scan_iter(match=f"{self.prefix}:*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+def create_playlist_store(backend: Optional[str], redis_url: Optional[str] = None) -> Optional[PlaylistStore]:
+    """
+    Creates the playlist store named by backend.
+
+    Args:
+        backend (str, optional): "sqlite", "redis", or "memory"/None to keep playlists in process memory only.
+        redis_url (str, optional): The server URL for the Redis store.
+
+    Returns:
+        PlaylistStore | None: The store, or None for in-memory playlists.
+
+    Raises:
+        ValueError: If the backend is unknown or the Redis store has no URL.
+    """
+    if backend in (None, "", "memory"):
+        return None
+    if backend == "sqlite":
+        return SQLitePlaylistStore()
+    if backend == "redis":
+        if not redis_url:
+            raise ValueError("REDIS_URL must be set to use the Redis playlist store.")
+        return RedisPlaylistStore.from_url(redis_url)
+    raise ValueError(f"Unknown playlist store: {backend}")
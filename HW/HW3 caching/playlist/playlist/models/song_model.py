@@ -1,17 +1,151 @@
+from collections import Counter
+import codecs
+import csv
 import logging
+import os
 
+from flask import current_app
+from sqlalchemy import event, func, select, text, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session, object_session
 
 from playlist.db import db
 from playlist.utils.logger import configure_logger
 from playlist.utils.api_utils import get_random
-from typing import List, Dict
+from playlist.utils.cache import TTLCache
+from playlist.utils.etag_utils import SharedVersion
+from playlist.utils.play_count_buffer import PlayCountBuffer
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
+# Page size limits for keyset-paginated catalog reads
+DEFAULT_PAGE_SIZE = int(os.getenv("CATALOG_PAGE_SIZE", 100))
+MAX_PAGE_SIZE = int(os.getenv("CATALOG_MAX_PAGE_SIZE", 1000))
+
+# Rows per transaction for bulk imports. Each row binds three parameters in the
+# duplicate probe, so this stays under SQLite's default 999-variable limit.
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", 300))
+
+# IDs bound per "id IN (...)" query, kept under SQLite's default 999-variable limit.
+ID_BATCH_SIZE = int(os.getenv("ID_BATCH_SIZE", 900))
+
+# Process-wide read-through cache of songs, shared by the routes and every
+# PlaylistModel. Keys are ("id", song_id) -> SongSnapshot and
+# ("key", artist, title, year) -> song_id.
+SONG_CACHE_SIZE = int(os.getenv("SONG_CACHE_SIZE", 10000))
+SONG_CACHE_TTL = int(os.getenv("TTL", 60))
+song_cache = TTLCache(max_entries=SONG_CACHE_SIZE, ttl_seconds=SONG_CACHE_TTL)
+
+
+class CatalogVersion(db.Model):
+    """A single-row counter of catalog changes, kept in the database so every worker sees it."""
+
+    __tablename__ = "CatalogVersion"
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+
+def _increment_catalog_version(connection) -> int:
+    """Increments the stored catalog version in connection's transaction and returns it."""
+    table = CatalogVersion.__table__
+    statement = sqlite_insert(table).values(id=1, version=1)
+    statement = statement.on_conflict_do_update(index_elements=["id"], set_={"version": table.c.version + 1})
+    return connection.execute(statement.returning(table.c.version)).scalar_one()
+
+
+# The catalog version last read by this process, reused for CATALOG_VERSION_TTL
+# seconds so conditional GETs are answered without a query. Writes made here
+# clear it when they commit; writes by other workers are seen within the TTL.
+# Keyed by engine like catalog_stats_cache.
+CATALOG_VERSION_TTL = float(os.getenv("CATALOG_VERSION_TTL", 1))
+catalog_version_cache = TTLCache(max_entries=1, ttl_seconds=CATALOG_VERSION_TTL)
+
+
+def _read_catalog_version() -> int:
+    """Returns the stored catalog version, 0 if the catalog has never changed, using a cached value when fresh."""
+    engine = db.engine
+    version = catalog_version_cache.get(engine)
+    if version is None:
+        version = db.session.execute(select(CatalogVersion.version).where(CatalogVersion.id == 1)).scalar() or 0
+        catalog_version_cache.set(engine, version)
+    return version
+
+
+def _bump_stored_catalog_version() -> int:
+    """Increments the stored catalog version in its own transaction."""
+    with db.engine.begin() as connection:
+        version = _increment_catalog_version(connection)
+    catalog_version_cache.clear()
+    return version
+
+
+# Bumped on every catalog write made through this module (inserts, updates,
+# deletes and play count flushes); read endpoints derive their ETags from it.
+# It lives in the database, so an ETag issued by one worker stays valid on
+# another and goes stale when any worker changes the catalog.
+catalog_version = SharedVersion("catalog", read=_read_catalog_version, bump=_bump_stored_catalog_version)
+
+# SQLite FTS5 index over artist and title. It is an external-content table, so
+# the text lives only in Songs; triggers keep the index in step with it.
+SEARCH_INDEX_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS songs_fts USING fts5(
+        artist, title, content='Songs', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS songs_fts_ai AFTER INSERT ON Songs BEGIN
+        INSERT INTO songs_fts(rowid, artist, title) VALUES (new.id, new.artist, new.title);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS songs_fts_ad AFTER DELETE ON Songs BEGIN
+        INSERT INTO songs_fts(songs_fts, rowid, artist, title) VALUES ('delete', old.id, old.artist, old.title);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS songs_fts_au AFTER UPDATE OF artist, title ON Songs BEGIN
+        INSERT INTO songs_fts(songs_fts, rowid, artist, title) VALUES ('delete', old.id, old.artist, old.title);
+        INSERT INTO songs_fts(rowid, artist, title) VALUES (new.id, new.artist, new.title);
+    END""",
+]
+
+# Cached (count, min_id, max_id) of the catalog, used for random selection.
+# Invalidated whenever a song is inserted or deleted through the ORM; the TTL
+# bounds staleness from writes made outside of it. Keyed by engine so a value
+# computed against one database is never served for another.
+CATALOG_STATS_TTL = int(os.getenv("CATALOG_STATS_TTL", 60))
+catalog_stats_cache = TTLCache(max_entries=1, ttl_seconds=CATALOG_STATS_TTL)
+
+# Random IDs drawn for get_random_song before it falls back to a random offset.
+# Each draw hits with probability count / (max_id - min_id + 1).
+RANDOM_SONG_ATTEMPTS = int(os.getenv("RANDOM_SONG_ATTEMPTS", 8))
+
+
+class SongSnapshot(NamedTuple):
+    """An immutable copy of a song's fields, detached from any database session.
+
+    This is what the song cache holds: a plain tuple with no per-instance __dict__
+    or ORM state, so it is small, safe to share between threads and requests, and
+    reading it never touches the database.
+    """
+
+    id: int
+    artist: str
+    title: str
+    year: int
+    genre: str
+    duration: int
+    play_count: int
+
+    def to_dict(self) -> Dict:
+        """Returns the song's fields as a dictionary."""
+        return self._asdict()
+
+    def update_play_count(self) -> None:
+        """Increments the song's play count in the database. See Songs.update_play_count."""
+        Songs.update_play_count(self)
+
+
 class Songs(db.Model):
     """Represents a song in the catalog.
 
@@ -23,6 +157,13 @@ class Songs(db.Model):
     """
 
     __tablename__ = "Songs"
+    __table_args__ = (
+        db.UniqueConstraint("artist", "title", "year", name="uq_songs_artist_title_year"),
+        db.Index("idx_songs_play_count", "play_count"),
+        db.Index("idx_songs_year", "year"),
+        db.Index("idx_songs_genre", "genre"),
+        db.Index("idx_songs_duration", "duration"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     artist = db.Column(db.String, nullable=False)
@@ -50,16 +191,22 @@ class Songs(db.Model):
             raise ValueError("Duration must be a positive integer.")
 
     @classmethod
-    def create_song(cls, artist: str, title: str, year: int, genre: str, duration: int) -> None:
+    def create_song(cls, artist: str, title: str, year: int, genre: str, duration: int, upsert: bool = False) -> None:
         """
         Creates a new song in the songs table using SQLAlchemy.
 
+        Duplicates are rejected by the unique (artist, title, year) constraint, so each call
+        issues a single INSERT. In upsert mode the INSERT uses ON CONFLICT to update the genre
+        and duration of an existing song instead.
+
         Args:
             artist (str): The artist's name.
             title (str): The song title.
             year (int): The year the song was released.
             genre (str): The song genre.
             duration (int): The duration of the song in seconds.
+            upsert (bool, optional): If True, update the existing song with the same compound key
+                                     rather than raising. Defaults to False.
 
         Raises:
             ValueError: If any field is invalid or if a song with the same compound key already exists.
@@ -81,11 +228,26 @@ class Songs(db.Model):
             raise
 
         try:
-            # Check for existing song with same compound key (artist, title, year)
-            existing = Songs.query.filter_by(artist=artist.strip(), title=title.strip(), year=year).first()
-            if existing:
-                logger.error(f"Song already exists: {artist} - {title} ({year})")
-                raise ValueError(f"Song with artist '{artist}', title '{title}', and year {year} already exists.")
+            if upsert:
+                statement = sqlite_insert(cls.__table__).values(
+                    artist=song.artist,
+                    title=song.title,
+                    year=song.year,
+                    genre=song.genre,
+                    duration=song.duration,
+                    play_count=0
+                )
+                statement = statement.on_conflict_do_update(
+                    index_elements=["artist", "title", "year"],
+                    set_={"genre": statement.excluded.genre, "duration": statement.excluded.duration}
+                )
+                song_id = db.session.execute(statement.returning(cls.id)).scalar_one()
+                db.session.commit()
+                cls.invalidate_catalog_stats()
+                cls.invalidate_cached_song(song_id)
+                catalog_version.bump()
+                logger.info(f"Song successfully upserted: {artist} - {title} ({year})")
+                return
 
             db.session.add(song)
             db.session.commit()
@@ -101,6 +263,123 @@ class Songs(db.Model):
             db.session.rollback()
             raise
 
+    @classmethod
+    def bulk_create(cls, songs: Iterable[Dict], chunk_size: int = BULK_CHUNK_SIZE) -> List[Dict]:
+        """
+        Creates many songs at once, committing them in chunked transactions.
+
+        Each song is validated with validate(). Duplicates are detected with a single
+        set-based query per chunk (and against earlier rows in the same chunk), and
+        the remaining songs in the chunk are inserted with one executemany INSERT.
+        The input is consumed lazily, so it may be a generator over a large upload.
+
+        Args:
+            songs (Iterable[dict]): Dictionaries with artist, title, year, genre and duration keys.
+            chunk_size (int): The number of rows per transaction.
+
+        Returns:
+            list[dict]: One entry per input row, in input order, with the 1-indexed "row", a
+                "status" of "created", "duplicate", "invalid" or "error", and a "message"
+                for rows that were not created.
+
+        Raises:
+            ValueError: If chunk_size is not positive.
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer.")
+
+        logger.info(f"Received request to bulk create songs (chunk size {chunk_size})")
+
+        report = []
+        chunk = []
+        for row_number, data in enumerate(songs, start=1):
+            chunk.append((row_number, data))
+            if len(chunk) >= chunk_size:
+                report.extend(cls._bulk_create_chunk(chunk))
+                chunk = []
+        if chunk:
+            report.extend(cls._bulk_create_chunk(chunk))
+
+        created = sum(1 for result in report if result["status"] == "created")
+        logger.info(f"Bulk create finished: {created} of {len(report)} songs created")
+        return report
+
+    @classmethod
+    def _bulk_create_chunk(cls, chunk: List[Tuple[int, Dict]]) -> List[Dict]:
+        """
+        Validates, de-duplicates and inserts one chunk of a bulk import in a single transaction.
+
+        Args:
+            chunk (list[tuple[int, dict]]): Pairs of row number and song data.
+
+        Returns:
+            list[dict]: The per-row results for the chunk, in row order.
+        """
+        results = {}
+        candidates = {}
+
+        for row_number, data in chunk:
+            try:
+                song = cls(
+                    artist=_strip(data["artist"]),
+                    title=_strip(data["title"]),
+                    year=data["year"],
+                    genre=_strip(data["genre"]),
+                    duration=data["duration"]
+                )
+                song.validate()
+            except KeyError as e:
+                results[row_number] = {"row": row_number, "status": "invalid", "message": f"Missing required field: {e}"}
+                continue
+            except (TypeError, ValueError) as e:
+                results[row_number] = {"row": row_number, "status": "invalid", "message": str(e)}
+                continue
+
+            key = (song.artist, song.title, song.year)
+            if key in candidates:
+                results[row_number] = {"row": row_number, "status": "duplicate", "message": _duplicate_message(*key)}
+                continue
+            candidates[key] = (row_number, song)
+
+        try:
+            if candidates:
+                existing = {
+                    tuple(row) for row in
+                    db.session.query(cls.artist, cls.title, cls.year)
+                    .filter(tuple_(cls.artist, cls.title, cls.year).in_(list(candidates)))
+                    .all()
+                }
+                for key in existing:
+                    row_number, _ = candidates.pop(key)
+                    results[row_number] = {"row": row_number, "status": "duplicate", "message": _duplicate_message(*key)}
+
+            if candidates:
+                db.session.execute(cls.__table__.insert(), [
+                    {
+                        "artist": song.artist,
+                        "title": song.title,
+                        "year": song.year,
+                        "genre": song.genre,
+                        "duration": song.duration,
+                        "play_count": 0,
+                    }
+                    for _, song in candidates.values()
+                ])
+                db.session.commit()
+                cls.invalidate_catalog_stats()
+                catalog_version.bump()
+
+            for row_number, _ in candidates.values():
+                results[row_number] = {"row": row_number, "status": "created"}
+
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while bulk creating songs: {e}")
+            db.session.rollback()
+            for row_number, _ in candidates.values():
+                results[row_number] = {"row": row_number, "status": "error", "message": str(e)}
+
+        return [results[row_number] for row_number, _ in chunk]
+
     @classmethod
     def delete_song(cls, song_id: int) -> None:
         """
@@ -123,6 +402,7 @@ class Songs(db.Model):
 
             db.session.delete(song)
             db.session.commit()
+            play_count_buffer.discard(song_id)
             logger.info(f"Successfully deleted song with ID {song_id}")
 
         except SQLAlchemyError as e:
@@ -197,10 +477,296 @@ class Songs(db.Model):
             )
             raise
 
+    def to_dict(self) -> Dict:
+        """Returns the song's fields as a dictionary."""
+        return {
+            "id": self.id,
+            "artist": self.artist,
+            "title": self.title,
+            "year": self.year,
+            "genre": self.genre,
+            "duration": self.duration,
+            "play_count": self.play_count,
+        }
+
     @classmethod
+    def get_song_snapshot(cls, song_id: int) -> SongSnapshot:
+        """
+        Loads an immutable snapshot of a song by ID with a column-only query.
 
-    def get_all_songs(cls, sort_by_play_count: bool = False) -> List[Dict]:
+        Args:
+            song_id (int): The ID of the song to retrieve.
+
+        Returns:
+            SongSnapshot: The song's fields.
+
+        Raises:
+            ValueError: If no song with the given ID is found.
+            SQLAlchemyError: If a database error occurs.
+        """
+        try:
+            row = cls.column_query().filter(cls.id == song_id).one_or_none()
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while retrieving song by ID {song_id}: {e}")
+            raise
+
+        if row is None:
+            logger.info(f"Song with ID {song_id} not found")
+            raise ValueError(f"Song with ID {song_id} not found")
+
+        return SongSnapshot(*row)
+
+    @classmethod
+    def get_song_snapshot_by_compound_key(cls, artist: str, title: str, year: int) -> SongSnapshot:
+        """
+        Loads an immutable snapshot of a song by its compound key with a column-only query.
+
+        Args:
+            artist (str): The artist of the song.
+            title (str): The title of the song.
+            year (int): The year the song was released.
+
+        Returns:
+            SongSnapshot: The song's fields.
+
+        Raises:
+            ValueError: If no matching song is found.
+            SQLAlchemyError: If a database error occurs.
+        """
+        try:
+            row = (
+                cls.column_query()
+                .filter(cls.artist == artist.strip(), cls.title == title.strip(), cls.year == year)
+                .one_or_none()
+            )
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error while retrieving song by compound key "
+                f"(artist '{artist}', title '{title}', year {year}): {e}"
+            )
+            raise
+
+        if row is None:
+            logger.info(f"Song with artist '{artist}', title '{title}', and year {year} not found")
+            raise ValueError(f"Song with artist '{artist}', title '{title}', and year {year} not found")
+
+        return SongSnapshot(*row)
+
+    @classmethod
+    def get_song_snapshots(cls, song_ids: Iterable[int]) -> List[SongSnapshot]:
+        """
+        Loads snapshots of many songs by ID with one "id IN (...)" query per ID_BATCH_SIZE IDs.
+
+        Args:
+            song_ids (Iterable[int]): The IDs of the songs to retrieve.
+
+        Returns:
+            list[SongSnapshot]: The songs that exist, in no particular order.
+
+        Raises:
+            SQLAlchemyError: If a database error occurs.
+        """
+        song_ids = list(song_ids)
+        try:
+            songs = [
+                SongSnapshot(*row)
+                for batch in _batches(song_ids, ID_BATCH_SIZE)
+                for row in cls.column_query().filter(cls.id.in_(batch)).all()
+            ]
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while retrieving {len(song_ids)} songs by ID: {e}")
+            raise
+
+        logger.info(f"Loaded {len(songs)} of {len(song_ids)} requested songs from the database")
+        return songs
+
+    @classmethod
+    def get_cached_song_by_id(cls, song_id: int) -> SongSnapshot:
+        """
+        Retrieves a song by ID through the shared song cache.
+
+        On a miss the song is loaded with get_song_snapshot and cached. A recently expired
+        entry may be served while it is reloaded in the background (see TTLCache.get_or_load).
+
+        Args:
+            song_id (int): The ID of the song to retrieve.
+
+        Returns:
+            SongSnapshot: The song's fields.
+
+        Raises:
+            ValueError: If no song with the given ID is found.
+            SQLAlchemyError: If a database error occurs.
+        """
+        app = current_app._get_current_object()
+
+        def refresh() -> SongSnapshot:
+            with app.app_context():
+                return cls.get_song_snapshot(song_id)
+
+        return song_cache.get_or_load(("id", song_id), lambda: cls.get_song_snapshot(song_id), refresh=refresh)
+
+    @classmethod
+    def get_cached_songs_by_ids(cls, song_ids: Iterable[int]) -> Dict[int, SongSnapshot]:
+        """
+        Retrieves many songs by ID through the shared song cache.
+
+        Every ID that is missing from the cache or has expired is loaded with
+        get_song_snapshots in batched queries, rather than one query per song, and cached.
+
+        Args:
+            song_ids (Iterable[int]): The IDs of the songs to retrieve.
+
+        Returns:
+            dict[int, SongSnapshot]: The songs found, keyed by ID. IDs that do not exist are left out.
+
+        Raises:
+            SQLAlchemyError: If a database error occurs.
+        """
+        songs = {}
+        missing = []
+        for song_id in dict.fromkeys(song_ids):
+            song = song_cache.get(("id", song_id))
+            if song is None:
+                missing.append(song_id)
+            else:
+                songs[song_id] = song
+
+        if missing:
+            logger.debug(f"{len(missing)} of {len(songs) + len(missing)} songs not cached; loading them in bulk")
+            for song in cls.get_song_snapshots(missing):
+                song_cache.set(("id", song.id), song)
+                songs[song.id] = song
+
+        return songs
+
+    @classmethod
+    def get_cached_song_by_compound_key(cls, artist: str, title: str, year: int) -> SongSnapshot:
+        """
+        Retrieves a song by its compound key (artist, title, year) through the shared song cache.
+
+        The cache maps the compound key to the song ID, so the song itself is cached once.
+
+        Args:
+            artist (str): The artist of the song.
+            title (str): The title of the song.
+            year (int): The year the song was released.
+
+        Returns:
+            SongSnapshot: The fields of the song matching the provided compound key.
+
+        Raises:
+            ValueError: If no matching song is found.
+            SQLAlchemyError: If a database error occurs.
+        """
+        key = ("key", artist.strip(), title.strip(), year)
+
+        song_id = song_cache.get(key)
+        if song_id is not None:
+            try:
+                song = cls.get_cached_song_by_id(song_id)
+            except ValueError:
+                song = None
+            # The song may have been deleted or renamed since the key was cached
+            if song is not None and (song.artist, song.title, song.year) == key[1:]:
+                return song
+            song_cache.pop(key)
+
+        song = cls.get_song_snapshot_by_compound_key(artist, title, year)
+        song_cache.set(("id", song.id), song)
+        song_cache.set(key, song.id)
+        return song
+
+    @classmethod
+    def invalidate_cached_song(cls, song_id: int) -> None:
+        """Drops a song from the shared song cache so the next read reloads it."""
+        song = song_cache.pop(("id", song_id))
+        if song is not None:
+            song_cache.pop(("key", song.artist, song.title, song.year))
+
+    @classmethod
+    def column_query(cls):
+        """Builds a column-only query over the song fields.
+
+        Selecting plain columns skips ORM identity-map bookkeeping, which keeps
+        large catalog reads cheap.
+
+        Returns:
+            Query: A query yielding rows with the song fields.
+        """
+        return db.session.query(
+            cls.id, cls.artist, cls.title, cls.year, cls.genre, cls.duration, cls.play_count
+        )
+
+    @classmethod
+    def get_songs_page(cls, after_id: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[Dict], Optional[int]]:
+        """
+        Retrieves one page of the catalog using keyset pagination on the song ID.
+
+        Args:
+            after_id (int): Only songs with an ID greater than this are returned. Defaults to 0.
+            limit (int): The maximum number of songs to return, capped at MAX_PAGE_SIZE.
+
+        Returns:
+            tuple[list[dict], int | None]: The songs in the page ordered by ID, and the cursor
+                to pass as after_id for the next page (None if this is the last page).
 
+        Raises:
+            ValueError: If after_id is negative or limit is not positive.
+            SQLAlchemyError: If any database error occurs.
+        """
+        if after_id < 0:
+            raise ValueError("after_id must be a non-negative integer.")
+        if limit <= 0:
+            raise ValueError("limit must be a positive integer.")
+        limit = min(limit, MAX_PAGE_SIZE)
+
+        logger.info(f"Retrieving catalog page after ID {after_id} (limit {limit})")
+
+        try:
+            # Fetch one extra row to know whether another page follows
+            rows = (
+                cls.column_query()
+                .filter(cls.id > after_id)
+                .order_by(cls.id)
+                .limit(limit + 1)
+                .all()
+            )
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while retrieving catalog page after ID {after_id}: {e}")
+            raise
+
+        songs = [row._asdict() for row in rows[:limit]]
+        next_after_id = songs[-1]["id"] if len(rows) > limit else None
+
+        logger.info(f"Retrieved {len(songs)} songs from the catalog (next cursor: {next_after_id})")
+        return songs, next_after_id
+
+    @classmethod
+    def iter_songs(cls, after_id: int = 0, batch_size: int = DEFAULT_PAGE_SIZE) -> Iterator[Dict]:
+        """
+        Lazily yields every song in the catalog, in ID order, one page at a time.
+
+        Only a single page of rows is held in memory at once, so memory use stays
+        flat regardless of the size of the catalog.
+
+        Args:
+            after_id (int): Start after this song ID. Defaults to 0.
+            batch_size (int): The number of rows fetched per query.
+
+        Yields:
+            dict: A dictionary representing a song.
+
+        Raises:
+            SQLAlchemyError: If any database error occurs.
+        """
+        cursor = after_id
+        while cursor is not None:
+            songs, cursor = cls.get_songs_page(after_id=cursor, limit=batch_size)
+            yield from songs
+
+    @classmethod
+    def get_all_songs(cls, sort_by_play_count: bool = False) -> List[Dict]:
         """
         Retrieves all songs from the catalog as dictionaries.
 
@@ -216,28 +782,17 @@ class Songs(db.Model):
         logger.info("Attempting to retrieve all songs from the catalog")
 
         try:
-            query = cls.query
+            query = cls.column_query()
             if sort_by_play_count:
                 query = query.order_by(cls.play_count.desc())
 
-            songs = query.all()
+            rows = query.all()
 
-            if not songs:
+            if not rows:
                 logger.warning("The song catalog is empty.")
                 return []
 
-            results = [
-                {
-                    "id": song.id,
-                    "artist": song.artist,
-                    "title": song.title,
-                    "year": song.year,
-                    "genre": song.genre,
-                    "duration": song.duration,
-                    "play_count": song.play_count,
-                }
-                for song in songs
-            ]
+            results = [row._asdict() for row in rows]
 
             logger.info(f"Retrieved {len(results)} songs from the catalog")
             return results
@@ -247,47 +802,397 @@ class Songs(db.Model):
             raise
 
     @classmethod
-    def get_random_song(cls) -> dict:
+    def search_songs(
+        cls,
+        query: Optional[str] = None,
+        genre: Optional[str] = None,
+        year_min: Optional[int] = None,
+        year_max: Optional[int] = None,
+        duration_min: Optional[int] = None,
+        duration_max: Optional[int] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        offset: int = 0
+    ) -> Tuple[List[Dict], Optional[int]]:
         """
-        Retrieves a random song from the catalog as a dictionary.
+        Searches the catalog by artist and title text, optionally filtered by facets.
+
+        Text is matched through the songs_fts full-text index: every word must appear in
+        the artist or title, with prefix matching, and results are ranked by relevance
+        (bm25). Without text, matching songs are returned in ID order. Facet filters use
+        the genre, year and duration indexes.
+
+        Args:
+            query (str, optional): Free-text search over artist and title.
+            genre (str, optional): Only return songs of this genre.
+            year_min (int, optional): Only return songs released in or after this year.
+            year_max (int, optional): Only return songs released in or before this year.
+            duration_min (int, optional): Only return songs at least this many seconds long.
+            duration_max (int, optional): Only return songs at most this many seconds long.
+            limit (int): The maximum number of songs to return, capped at MAX_PAGE_SIZE.
+            offset (int): The number of matching songs to skip.
 
         Returns:
-            dict: A randomly selected song dictionary.
+            tuple[list[dict], int | None]: The matching songs, and the offset of the next page
+                (None if this is the last page).
+
+        Raises:
+            ValueError: If limit is not positive or offset is negative.
+            SQLAlchemyError: If any database error occurs.
         """
-        all_songs = cls.get_all_songs()
+        if limit <= 0:
+            raise ValueError("limit must be a positive integer.")
+        if offset < 0:
+            raise ValueError("offset must be a non-negative integer.")
+        limit = min(limit, MAX_PAGE_SIZE)
+
+        logger.info(
+            f"Searching songs: query={query!r}, genre={genre!r}, year={year_min}-{year_max}, "
+            f"duration={duration_min}-{duration_max}, limit={limit}, offset={offset}"
+        )
+
+        conditions = []
+        params = {"limit": limit + 1, "offset": offset}
+        facets = [
+            ("s.genre = :genre", "genre", genre),
+            ("s.year >= :year_min", "year_min", year_min),
+            ("s.year <= :year_max", "year_max", year_max),
+            ("s.duration >= :duration_min", "duration_min", duration_min),
+            ("s.duration <= :duration_max", "duration_max", duration_max),
+        ]
+        for condition, name, value in facets:
+            if value is not None:
+                conditions.append(condition)
+                params[name] = value
+
+        match = _fts_match_expression(query) if query else None
+        if match:
+            conditions.insert(0, "songs_fts MATCH :match")
+            params["match"] = match
+            source = "songs_fts JOIN Songs AS s ON s.id = songs_fts.rowid"
+            order_by = "bm25(songs_fts), s.id"
+        else:
+            source = "Songs AS s"
+            order_by = "s.id"
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        statement = text(
+            f"SELECT s.id, s.artist, s.title, s.year, s.genre, s.duration, s.play_count "
+            f"FROM {source} {where} ORDER BY {order_by} LIMIT :limit OFFSET :offset"
+        )
 
-        if not all_songs:
-            logger.warning("Cannot retrieve random song because the song catalog is empty.")
-            raise ValueError("The song catalog is empty.")
+        try:
+            rows = db.session.execute(statement, params).all()
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while searching songs: {e}")
+            raise
 
-        index = get_random(len(all_songs))
-        logger.info(f"Random index selected: {index} (total songs: {len(all_songs)})")
+        songs = [row._asdict() for row in rows[:limit]]
+        next_offset = offset + limit if len(rows) > limit else None
 
-        return all_songs[index - 1]
+        logger.info(f"Found {len(songs)} songs (next offset: {next_offset})")
+        return songs, next_offset
+
+    @classmethod
+    def ensure_search_index(cls) -> None:
+        """
+        Creates the full-text search index and its triggers if they are missing.
+
+        db.create_all only fires the table's after_create hook for new tables, so this
+        covers databases created before the index existed. A newly created index is
+        populated from the existing songs.
+
+        Raises:
+            SQLAlchemyError: If any database error occurs.
+        """
+        with db.engine.begin() as connection:
+            _create_search_index(connection)
+
+    @classmethod
+    def get_catalog_stats(cls) -> Tuple[int, Optional[int], Optional[int]]:
+        """
+        Returns the number of songs and the smallest and largest song IDs, using a cached value when fresh.
+
+        Returns:
+            tuple[int, int | None, int | None]: The song count, minimum ID and maximum ID.
+
+        Raises:
+            SQLAlchemyError: If any database error occurs.
+        """
+        engine = db.engine
+        stats = catalog_stats_cache.get(engine)
+        if stats is not None:
+            return stats
+
+        try:
+            count, min_id, max_id = db.session.query(func.count(cls.id), func.min(cls.id), func.max(cls.id)).one()
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while counting songs: {e}")
+            raise
+
+        stats = (count, min_id, max_id)
+        catalog_stats_cache.set(engine, stats)
+        logger.debug(f"Refreshed catalog stats: {count} songs (IDs {min_id}-{max_id})")
+        return stats
+
+    @classmethod
+    def invalidate_catalog_stats(cls) -> None:
+        """Discards the cached catalog stats so the next read recounts the songs table."""
+        catalog_stats_cache.clear()
+
+    @classmethod
+    def get_random_song(cls) -> dict:
+        """
+        Retrieves a random song from the catalog as a dictionary.
+
+        A random ID is drawn between the cached lowest and highest IDs and looked up by
+        primary key; if no song has that ID (it was deleted), another is drawn, up to
+        RANDOM_SONG_ATTEMPTS times. Only if every draw misses is the song at a random
+        offset below the cached count read instead. Every song is equally likely either
+        way, and unless the IDs are mostly gaps the cost does not grow with the catalog.
+        Only a single row is ever loaded.
+
+        Returns:
+            dict: A randomly selected song dictionary.
+
+        Raises:
+            ValueError: If the catalog is empty.
+            SQLAlchemyError: If any database error occurs.
+        """
+        for attempt in range(2):
+            count, min_id, max_id = cls.get_catalog_stats()
+
+            if not count:
+                # The cached count may predate writes made outside the ORM
+                if attempt == 0:
+                    cls.invalidate_catalog_stats()
+                    continue
+                logger.warning("Cannot retrieve random song because the song catalog is empty.")
+                raise ValueError("The song catalog is empty.")
+
+            try:
+                for _ in range(RANDOM_SONG_ATTEMPTS):
+                    song_id = min_id + get_random(max_id - min_id + 1) - 1
+                    row = cls.column_query().filter(cls.id == song_id).first()
+                    if row is not None:
+                        logger.info(f"Random song ID selected: {song_id} (IDs {min_id}-{max_id})")
+                        return row._asdict()
+
+                offset = get_random(count) - 1
+                logger.info(f"Random IDs missed {RANDOM_SONG_ATTEMPTS} times; selecting song at offset {offset}")
+                row = cls.column_query().order_by(cls.id).offset(offset).first()
+            except SQLAlchemyError as e:
+                logger.error(f"Database error while retrieving random song: {e}")
+                raise
+
+            if row is not None:
+                return row._asdict()
+
+            logger.info("Catalog stats were stale; recounting songs")
+            cls.invalidate_catalog_stats()
+
+        logger.warning("Cannot retrieve random song because the song catalog is empty.")
+        raise ValueError("The song catalog is empty.")
 
     def update_play_count(self) -> None:
         """
         Increments the play count of the current song instance.
 
+        The increment goes through the shared write-behind play_count_buffer, which applies
+        it atomically in the database (play_count = play_count + delta) on its next flush.
+
         Raises:
-            ValueError: If the song does not exist in the database.
+            ValueError: If the buffer flushes synchronously and the song does not exist in the database.
             SQLAlchemyError: If any database error occurs.
         """
 
         logger.info(f"Attempting to update play count for song with ID {self.id}")
 
-        try:
-            song = Songs.query.get(self.id)
-            if not song:
-                logger.warning(f"Cannot update play count: Song with ID {self.id} not found.")
-                raise ValueError(f"Song with ID {self.id} not found")
+        updated = play_count_buffer.increment(self.id)
 
-            song.play_count += 1
-            db.session.commit()
+        if play_count_buffer.synchronous and not updated:
+            logger.warning(f"Cannot update play count: Song with ID {self.id} not found.")
+            raise ValueError(f"Song with ID {self.id} not found")
 
-            logger.info(f"Play count incremented for song with ID: {self.id}")
+        logger.info(f"Play count incremented for song with ID: {self.id}")
 
-        except SQLAlchemyError as e:
-            logger.error(f"Database error while updating play count for song with ID {self.id}: {e}")
-            db.session.rollback()
-            raise
+    @staticmethod
+    def update_play_counts(song_ids: Iterable[int]) -> None:
+        """
+        Increments the play counts of several songs, once per occurrence of each ID.
+
+        The increments are added to the play_count_buffer together, so a flush writes
+        them all in one batched UPDATE and transaction.
+
+        Args:
+            song_ids (Iterable[int]): The IDs of the songs played.
+
+        Raises:
+            ValueError: If the buffer flushes synchronously and any of the songs does not exist.
+            SQLAlchemyError: If any database error occurs.
+        """
+        counts = Counter(song_ids)
+        if not counts:
+            return
+
+        logger.info(f"Updating play counts for {len(counts)} songs ({sum(counts.values())} plays)")
+        updated = play_count_buffer.increment_many(counts)
+
+        if play_count_buffer.synchronous and updated != len(counts):
+            logger.warning(f"Cannot update play counts: {len(counts) - (updated or 0)} songs not found.")
+            raise ValueError(f"{len(counts) - (updated or 0)} of {len(counts)} songs not found")
+
+
+# Shared write-behind buffer for play count increments. Flush settings are
+# applied from the app config in create_app.
+play_count_buffer = PlayCountBuffer(Songs.__table__)
+
+
+def _invalidate_played_songs(deltas: Dict[int, int]) -> None:
+    """Drops songs whose play counts were just flushed from the shared song cache."""
+    for song_id in deltas:
+        Songs.invalidate_cached_song(song_id)
+    catalog_version.bump()
+
+
+play_count_buffer.add_flush_listener(_invalidate_played_songs)
+
+
+# Mapper events fire when a change is flushed, before it is committed. A read in
+# another session between the two still sees the old row and may cache it again,
+# so the caches are invalidated once more when the session commits. The songs to
+# drop are collected in the session's info under this key; None stands for the
+# catalog stats. Any entry also clears the cached catalog version.
+_STALE_AT_COMMIT = "stale_song_cache_keys"
+
+
+def _invalidate_at_commit(target, song_id: Optional[int]) -> None:
+    """Marks a song (or, for None, the catalog stats) for invalidation when target's session commits."""
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_STALE_AT_COMMIT, set()).add(song_id)
+
+
+@event.listens_for(Songs, "after_insert")
+@event.listens_for(Songs, "after_delete")
+def _invalidate_catalog_stats(mapper, connection, target) -> None:
+    """Keeps the cached catalog stats in step with inserts and deletes."""
+    Songs.invalidate_catalog_stats()
+    _invalidate_at_commit(target, None)
+
+
+@event.listens_for(Songs, "after_update")
+@event.listens_for(Songs, "after_delete")
+def _invalidate_cached_song(mapper, connection, target) -> None:
+    """Drops updated and deleted songs from the shared song cache."""
+    Songs.invalidate_cached_song(target.id)
+    _invalidate_at_commit(target, target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_songs(session) -> None:
+    """Drops songs cached again between the flush and the commit of their changes, and the cached catalog version."""
+    stale = session.info.pop(_STALE_AT_COMMIT, ())
+    if stale:
+        catalog_version_cache.clear()
+    for song_id in stale:
+        if song_id is None:
+            Songs.invalidate_catalog_stats()
+        else:
+            Songs.invalidate_cached_song(song_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_songs(session) -> None:
+    """Nothing rolled back needs invalidating at the next commit."""
+    session.info.pop(_STALE_AT_COMMIT, None)
+
+
+@event.listens_for(Songs, "after_insert")
+@event.listens_for(Songs, "after_update")
+@event.listens_for(Songs, "after_delete")
+def _bump_catalog_version(mapper, connection, target) -> None:
+    """Changes the catalog ETag whenever a song is written through the ORM, in the same transaction."""
+    _increment_catalog_version(connection)
+    _invalidate_at_commit(target, None)
+
+
+def _strip(value):
+    """Strips surrounding whitespace from strings, leaving other values untouched."""
+    return value.strip() if isinstance(value, str) else value
+
+
+def _batches(items: List, size: int) -> Iterator[List]:
+    """Splits a list into consecutive slices of at most size items."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _duplicate_message(artist: str, title: str, year: int) -> str:
+    """Builds the error message reported for a song whose compound key already exists."""
+    return f"Song with artist '{artist}', title '{title}', and year {year} already exists."
+
+
+def iter_songs_from_csv(stream: Iterable[bytes], encoding: str = "utf-8") -> Iterator[Dict]:
+    """
+    Lazily parses a CSV upload into song dictionaries for bulk_create.
+
+    The first line must be a header naming the artist, title, year, genre and duration
+    columns. Year and duration are converted to integers where possible; values that
+    cannot be converted are passed through so validation reports them.
+
+    Args:
+        stream (Iterable[bytes]): A binary stream, read line by line.
+        encoding (str): The text encoding of the upload.
+
+    Yields:
+        dict: The song fields from one CSV row.
+    """
+    for row in csv.DictReader(codecs.iterdecode(stream, encoding)):
+        for field in ("year", "duration"):
+            try:
+                row[field] = int(row[field])
+            except (KeyError, TypeError, ValueError):
+                pass
+        yield row
+
+
+def _fts_match_expression(query: str) -> Optional[str]:
+    """
+    Turns free text into an FTS5 MATCH expression.
+
+    Each word is quoted, so FTS5 operators in user input are matched literally,
+    and marked as a prefix so partial words match.
+
+    Returns:
+        str | None: The expression, or None if the text contains no words.
+    """
+    terms = ['"' + word.replace('"', '""') + '"*' for word in query.split()]
+    return " ".join(terms) or None
+
+
+def _create_search_index(connection) -> None:
+    """Creates the songs_fts index and triggers, populating the index if it is new."""
+    if connection.dialect.name != "sqlite":
+        return
+
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'songs_fts'")
+    ).first()
+    for statement in SEARCH_INDEX_DDL:
+        connection.execute(text(statement))
+    if not exists:
+        connection.execute(text("INSERT INTO songs_fts(songs_fts) VALUES ('rebuild')"))
+        logger.info("Created full-text search index for songs")
+
+
+@event.listens_for(Songs.__table__, "after_create")
+def _create_search_index_with_table(target, connection, **kw) -> None:
+    """Creates the search index alongside the songs table."""
+    _create_search_index(connection)
+
+
+@event.listens_for(Songs.__table__, "after_drop")
+def _drop_search_index_with_table(target, connection, **kw) -> None:
+    """Drops the search index with the songs table; its triggers are dropped with the table."""
+    if connection.dialect.name == "sqlite":
+        connection.execute(text("DROP TABLE IF EXISTS songs_fts"))
@@ -1,60 +1,382 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
 import logging
 import os
+import random
+import secrets
+import threading
+from typing import Deque, Iterator, List, Optional, Union
+
+from flask import Flask, g, request
 import requests
 
+from playlist.utils.http_client import http_client
 from playlist.utils.logger import configure_logger
 
 
-RANDOM_ORG_BASE_URL = os.getenv("RANDOM_ORG_BASE_URL",
-                                "https://www.random.org/integers/?num=1&min=1&col=1&base=10&format=plain&rnd=new")
+# Integers are fetched uniformly from [0, RANDOM_ORG_RANGE) and reduced to 1..max
+# by rejection sampling, so one pool serves every max.
+RANDOM_ORG_RANGE = 1_000_000_000
+RANDOM_ORG_INTEGERS_URL = os.getenv(
+    "RANDOM_ORG_INTEGERS_URL",
+    f"https://www.random.org/integers/?min=0&max={RANDOM_ORG_RANGE - 1}&col=1&base=10&format=plain&rnd=new"
+)
+RANDOM_POOL_SIZE = int(os.getenv("RANDOM_POOL_SIZE", 500))
+RANDOM_POOL_LOW_WATER = int(os.getenv("RANDOM_POOL_LOW_WATER", 100))
+RANDOM_PROVIDER = os.getenv("RANDOM_PROVIDER", "random.org")
+RANDOM_SEED = os.getenv("RANDOM_SEED")
 
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
-def get_random(max: int) -> int:
+class RandomProvider(ABC):
+    """A source of random integers."""
+
+    @abstractmethod
+    def randint(self, max: int) -> int:
+        """Returns a random integer between 1 and max inclusive."""
+
+    def randints(self, n: int, max: int) -> List[int]:
+        """Returns n random integers between 1 and max inclusive."""
+        return [self.randint(max) for _ in range(n)]
+
+
+class LocalRandomProvider(RandomProvider):
+    """Draws random integers from the operating system's CSPRNG."""
+
+    def randint(self, max: int) -> int:
+        if max < 1:
+            raise ValueError("max must be at least 1")
+        return secrets.randbelow(max) + 1
+
+
+class SeededRandomProvider(RandomProvider):
+    """
+    Draws random integers from a seeded pseudo-random generator.
+
+    The same seed always yields the same sequence, so runs can be reproduced
+    offline. Draws are serialized, so the sequence is only reproducible when
+    callers draw in the same order. Not suitable where unpredictability matters.
+
+    """
+
+    def __init__(self, seed: Union[int, str]):
+        """Initializes the generator.
+
+        Args:
+            seed (int | str): The seed.
+
+        """
+        self.seed = seed
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def randint(self, max: int) -> int:
+        return self.randints(1, max)[0]
+
+    def randints(self, n: int, max: int) -> List[int]:
+        if max < 1:
+            raise ValueError("max must be at least 1")
+        with self._lock:
+            return [self._random.randint(1, max) for _ in range(n)]
+
+
+class RandomOrgProvider(RandomProvider):
     """
-    Fetches a random integer between 1 and max inclusive from random.org.
+    Draws random integers from a pool prefetched from random.org.
+
+    The pool is filled pool_size integers per request. Once it drops to
+    low_water, a background thread refills it, so callers never wait on the
+    network. While the pool is empty (at startup, or while random.org is
+    unreachable) integers come from the fallback provider instead.
+
+    """
+
+    def __init__(self, url: str = RANDOM_ORG_INTEGERS_URL, pool_size: int = RANDOM_POOL_SIZE,
+                 low_water: int = RANDOM_POOL_LOW_WATER, timeout: float = 5,
+                 fallback: Optional[RandomProvider] = None):
+        """Initializes the provider with an empty pool.
+
+        Args:
+            url (str): The random.org integers URL (or a stand-in), without num. It must return one
+                integer in [0, RANDOM_ORG_RANGE) per line.
+            pool_size (int): The number of integers fetched per request.
+            low_water (int): The pool size at which a background refill starts.
+            timeout (float): The request timeout in seconds.
+            fallback (RandomProvider, optional): Used while the pool is empty. Defaults to the local CSPRNG.
+
+        """
+        if pool_size <= 0:
+            raise ValueError("pool_size must be a positive integer.")
+
+        self.url = url
+        self.pool_size = pool_size
+        self.low_water = low_water
+        self.timeout = timeout
+        self.fallback = fallback or LocalRandomProvider()
+
+        self._pool: Deque[int] = deque()
+        self._lock = threading.Lock()
+        self._refilling = False
+        self.fallbacks = 0
+
+    def __len__(self) -> int:
+        return len(self._pool)
+
+    def fetch(self) -> List[int]:
+        """
+        Fetches pool_size random integers from random.org.
+
+        The request goes through the shared pooled http_client, which retries transient
+        failures and stops calling random.org while its circuit breaker is open.
+
+        Returns:
+            List[int]: The integers, each in [0, RANDOM_ORG_RANGE).
+
+        Raises:
+            RuntimeError: If the request to random.org fails.
+            ValueError: If the response from random.org is not a list of valid integers.
+        """
+        url = f"{self.url}&num={self.pool_size}"
+
+        try:
+            logger.info(f"Fetching {self.pool_size} random numbers from {url}")
+
+            response = http_client.get(url, timeout=self.timeout)
+
+        except requests.exceptions.Timeout:
+            logger.error("Request to random.org timed out.")
+            raise RuntimeError("Request to random.org timed out.")
+
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Request to random.org failed: {e}")
+            raise RuntimeError(f"Request to random.org failed: {e}")
+
+        lines = response.text.split()
+        try:
+            numbers = [int(line) for line in lines]
+        except ValueError:
+            logger.error(f"Invalid response from random.org: {response.text.strip()[:100]}")
+            raise ValueError(f"Invalid response from random.org: {response.text.strip()[:100]}")
+        if not numbers or not all(0 <= number < RANDOM_ORG_RANGE for number in numbers):
+            logger.error(f"Out-of-range response from random.org: {response.text.strip()[:100]}")
+            raise ValueError(f"Invalid response from random.org: {response.text.strip()[:100]}")
+
+        logger.info(f"Received {len(numbers)} random numbers")
+        return numbers
+
+    def refill(self) -> int:
+        """
+        Fetches a batch of integers into the pool, waiting for the request.
+
+        Returns:
+            int: The pool size after the refill.
+
+        Raises:
+            RuntimeError: If the request to random.org fails.
+            ValueError: If the response from random.org is invalid.
+        """
+        numbers = self.fetch()
+        with self._lock:
+            self._pool.extend(numbers)
+            return len(self._pool)
+
+    def _refill_in_background(self) -> None:
+        try:
+            self.refill()
+        except (RuntimeError, ValueError) as e:
+            logger.warning(f"Background refill of the random pool failed: {e}")
+        finally:
+            with self._lock:
+                self._refilling = False
+
+    def _take(self, count: int = 1) -> List[int]:
+        """Pops up to count integers from the pool, starting a background refill at the low-water mark."""
+        with self._lock:
+            numbers = [self._pool.popleft() for _ in range(min(count, len(self._pool)))]
+            start_refill = len(self._pool) <= self.low_water and not self._refilling
+            if start_refill:
+                self._refilling = True
+
+        if start_refill:
+            threading.Thread(target=self._refill_in_background, name="random-refill", daemon=True).start()
+        return numbers
+
+    def randint(self, max: int) -> int:
+        return self.randints(1, max)[0]
+
+    def randints(self, n: int, max: int) -> List[int]:
+        if max < 1:
+            raise ValueError("max must be at least 1")
+
+        # Values at or above limit would make some results more likely than others
+        limit = RANDOM_ORG_RANGE - RANDOM_ORG_RANGE % max
+        results: List[int] = []
+        while len(results) < n:
+            numbers = self._take(n - len(results))
+            if not numbers:
+                missing = n - len(results)
+                self.fallbacks += missing
+                logger.info(f"Random pool is empty; drawing {missing} numbers from the local generator")
+                results.extend(self.fallback.randint(max) for _ in range(missing))
+                break
+            results.extend(number % max + 1 for number in numbers if number < limit)
+        return results
+
+
+def create_random_provider(name: Optional[str], seed: Union[int, str, None] = RANDOM_SEED) -> RandomProvider:
+    """
+    Creates the random provider with the given name.
 
     Args:
-        max (int): The upper bound (inclusive) for the random number.
+        name (str, optional): "random.org" (the default), "local" or "seeded".
+        seed (int | str, optional): The seed of the "seeded" provider. Defaults to $RANDOM_SEED.
 
     Returns:
-        int: A random number between 1 and max.
+        RandomProvider: The provider.
+
+    Raises:
+        ValueError: If the name is unknown, or "seeded" is given without a seed.
+    """
+    if name in (None, "", "random.org"):
+        return RandomOrgProvider()
+    if name == "local":
+        return LocalRandomProvider()
+    if name == "seeded":
+        if seed is None or seed == "":
+            raise ValueError("The seeded random provider needs a seed (set RANDOM_SEED).")
+        return SeededRandomProvider(seed)
+    raise ValueError(f"Unknown random provider: {name}")
+
+
+# Created from $RANDOM_PROVIDER on first use rather than at import, so a bad
+# setting is reported where the provider is configured (create_app) instead of
+# breaking every import of this module
+_provider: Optional[RandomProvider] = None
+_provider_lock = threading.Lock()
+
+# Overrides _provider within a seeded_random() block, e.g. for one request
+_scoped_provider: ContextVar[Optional[RandomProvider]] = ContextVar("scoped_random_provider", default=None)
+
+
+def set_random_provider(provider: Optional[RandomProvider]) -> None:
+    """Replaces the provider used by get_random. None recreates it from $RANDOM_PROVIDER on next use."""
+    global _provider
+    _provider = provider
+
+
+def get_random_provider() -> RandomProvider:
+    """
+    Returns the provider used by get_random in the current context.
 
     Raises:
-        RuntimeError: If the request to random.org fails.
-        ValueError: If the response from random.org is not a valid integer.
+        ValueError: If no provider was set and $RANDOM_PROVIDER is invalid.
     """
-    if max < 1:
-        raise ValueError("max must be at least 1")
+    global _provider
+    scoped = _scoped_provider.get()
+    if scoped is not None:
+        return scoped
+    provider = _provider
+    if provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = create_random_provider(RANDOM_PROVIDER, seed=RANDOM_SEED)
+            provider = _provider
+    return provider
 
-    # Construct the full URL dynamically
-    url = f"{RANDOM_ORG_BASE_URL}&max={max}"
 
+@contextmanager
+def seeded_random(seed: Union[int, str]) -> Iterator[SeededRandomProvider]:
+    """
+    Makes get_random draw from a generator seeded with seed until the block exits.
+
+    The override applies to the current thread (or context) only, so a request can be
+    replayed with its own seed without affecting requests running alongside it.
+
+    Args:
+        seed (int | str): The seed.
+
+    Yields:
+        SeededRandomProvider: The provider in use within the block.
+    """
+    provider = SeededRandomProvider(seed)
+    token = _scoped_provider.set(provider)
     try:
-        # Log the request to random.org
-        logger.info(f"Fetching random number from {url}")
+        yield provider
+    finally:
+        _scoped_provider.reset(token)
 
-        response = requests.get(url, timeout=5)
-        response.raise_for_status()
 
-        random_number_str = response.text.strip()
+def register_seed_header(app: Flask, header: str) -> None:
+    """
+    Makes requests carrying header draw their random numbers from a generator seeded with its value.
 
-        try:
-            random_number = int(random_number_str)
-        except ValueError:
-            logger.error(f"Invalid response from random.org: {random_number_str}")
-            raise ValueError(f"Invalid response from random.org: {random_number_str}")
+    Load tests and replays use it to pin a request's draws; requests without the
+    header are unaffected.
 
-        logger.info(f"Received random number: {random_number}")
-        return random_number
+    Args:
+        app (Flask): The application.
+        header (str): The request header holding the seed, e.g. X-Random-Seed.
+    """
+    @app.before_request
+    def seed_request_random():
+        seed = request.headers.get(header)
+        if seed:
+            g.random_scope = ExitStack()
+            g.random_scope.enter_context(seeded_random(seed))
+
+    @app.teardown_request
+    def unseed_request_random(exc):
+        random_scope = g.pop("random_scope", None)
+        if random_scope is not None:
+            random_scope.close()
 
-    except requests.exceptions.Timeout:
-        logger.error("Request to random.org timed out.")
-        raise RuntimeError("Request to random.org timed out.")
 
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Request to random.org failed: {e}")
-        raise RuntimeError(f"Request to random.org failed: {e}")
+def get_random(max: int) -> int:
+    """
+    Returns a random integer between 1 and max inclusive from the configured provider.
+
+    By default integers come from a pool prefetched from random.org and refilled in
+    the background, falling back to the local CSPRNG while the pool is empty. Inside
+    a seeded_random() block they come from that block's seeded generator.
+
+    Args:
+        max (int): The upper bound (inclusive) for the random number.
+
+    Returns:
+        int: A random number between 1 and max.
+
+    Raises:
+        ValueError: If max is less than 1.
+    """
+    random_number = get_random_provider().randint(max)
+    logger.info(f"Random number between 1 and {max}: {random_number}")
+    return random_number
+
+
+def get_random_batch(n: int, max: int) -> List[int]:
+    """
+    Returns n random integers between 1 and max inclusive from the configured provider.
+
+    The random.org provider takes all n from its prefetched pool at once, so a batch
+    costs at most the same upstream requests as n single draws, usually none.
+
+    Args:
+        n (int): The number of integers to return.
+        max (int): The upper bound (inclusive) for each number.
+
+    Returns:
+        List[int]: The random numbers.
+
+    Raises:
+        ValueError: If n is negative or max is less than 1.
+    """
+    if n < 0:
+        raise ValueError("n must not be negative")
+    random_numbers = get_random_provider().randints(n, max)
+    logger.info(f"Drew {n} random numbers between 1 and {max}")
+    return random_numbers
@@ -0,0 +1,359 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from playlist.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class _Flight:
+    """An in-progress load that concurrent callers for the same key wait on."""
+
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+class TTLCache:
+    """
+    A thread-safe, size-bounded cache whose entries expire after a time-to-live.
+
+    Entries are kept in least-recently-used order; once max_entries is reached,
+    adding a new entry evicts the least recently used one. Expired entries are
+    dropped when they are next looked up, by sweep(), and by the optional
+    background sweeper started with start_sweeper().
+
+    With stale_seconds > 0, get_or_load() keeps serving an expired entry for up
+    to stale_seconds past its TTL while a background thread reloads it
+    (stale-while-revalidate), so callers never wait on a reload of a hot key.
+
+    Concurrent get_or_load() misses on the same key are coalesced: one caller
+    runs the loader and the others wait for its result (single-flight). With
+    ttl_jitter > 0 each entry's TTL is shortened by a random fraction of up to
+    ttl_jitter, so entries cached together do not all expire together.
+
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 60, stale_seconds: float = 0,
+                 ttl_jitter: float = 0):
+        """Initializes an empty cache.
+
+        Args:
+            max_entries (int): The maximum number of entries held at once.
+            ttl_seconds (float): How long an entry stays fresh after it is set.
+            stale_seconds (float): How long past its TTL get_or_load may serve an entry while
+                it is reloaded in the background. 0 disables stale-while-revalidate.
+            ttl_jitter (float): The largest fraction (0 to 1) by which an entry's TTL is
+                randomly shortened. 0 disables jitter.
+
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be a positive integer.")
+        if not 0 <= ttl_jitter < 1:
+            raise ValueError("ttl_jitter must be at least 0 and less than 1.")
+
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.ttl_jitter = ttl_jitter
+
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing: Dict[Hashable, object] = {}
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stop_event: Optional[threading.Event] = None
+        self._thread: Optional[threading.Thread] = None
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.coalesced = 0
+
+    def configure(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None,
+                  stale_seconds: Optional[float] = None, ttl_jitter: Optional[float] = None) -> None:
+        """Updates the cache settings. Arguments left as None keep their current value."""
+        with self._lock:
+            if max_entries is not None:
+                if max_entries <= 0:
+                    raise ValueError("max_entries must be a positive integer.")
+                self.max_entries = max_entries
+                self._evict()
+            if ttl_seconds is not None:
+                self.ttl_seconds = ttl_seconds
+            if stale_seconds is not None:
+                self.stale_seconds = stale_seconds
+            if ttl_jitter is not None:
+                if not 0 <= ttl_jitter < 1:
+                    raise ValueError("ttl_jitter must be at least 0 and less than 1.")
+                self.ttl_jitter = ttl_jitter
+
+    def _expiry(self) -> float:
+        """Returns the expiry time for an entry set now, applying TTL jitter."""
+        ttl = self.ttl_seconds
+        if self.ttl_jitter:
+            ttl *= 1 - random.uniform(0, self.ttl_jitter)
+        return time.monotonic() + ttl
+
+    def _is_dead(self, expires: float, now: float) -> bool:
+        """True once an entry is past both its TTL and its stale window."""
+        return expires + self.stale_seconds <= now
+
+    def _evict(self) -> None:
+        """Drops least recently used entries until the cache fits. Must hold the lock."""
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self.evictions += 1
+            logger.debug(f"Evicted {evicted!r} from cache")
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns the value cached under key, or default if it is missing or expired.
+
+        Args:
+            key (Hashable): The cache key.
+            default (Any): The value returned on a miss.
+
+        Returns:
+            Any: The cached value or default.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires = entry
+            now = time.monotonic()
+            if expires <= now:
+                if self._is_dead(expires, now):
+                    del self._entries[key]
+                    self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any],
+                    refresh: Optional[Callable[[], Any]] = None) -> Any:
+        """
+        Returns the value cached under key, loading and caching it on a miss.
+
+        If the entry has expired but is still within stale_seconds of its TTL, the stale
+        value is returned at once and refresh (or loader) is run on a background thread
+        to replace it. A refresh that raises removes the entry instead.
+
+        On a miss, only one caller per key runs loader; concurrent callers for the same
+        key wait for it and receive its value, or its exception.
+
+        Args:
+            key (Hashable): The cache key.
+            loader (Callable): Computes the value on a miss. Exceptions propagate to the caller.
+            refresh (Callable, optional): Computes the value on a background thread. Defaults to loader.
+
+        Returns:
+            Any: The cached, stale or freshly loaded value.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            now = time.monotonic()
+            if entry is not None:
+                value, expires = entry
+                if expires > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                if not self._is_dead(expires, now):
+                    self._entries.move_to_end(key)
+                    self.stale_hits += 1
+                    token = None
+                    if key not in self._refreshing:
+                        token = self._refreshing[key] = object()
+                else:
+                    del self._entries[key]
+                    self.expirations += 1
+                    entry = None
+            if entry is None:
+                self.misses += 1
+                flight = self._inflight.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._inflight[key] = _Flight()
+                else:
+                    self.coalesced += 1
+
+        if entry is not None:
+            if token is not None:
+                self._refresh_in_background(key, refresh or loader, token)
+            return value
+
+        if not leader:
+            logger.debug(f"Waiting for the in-flight load of {key!r}")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            with self._lock:
+                # Skip caching if the key was popped or cleared while loading
+                if self._inflight.get(key) is flight:
+                    self._store(key, flight.value)
+            return flight.value
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+            flight.done.set()
+
+    def _refresh_in_background(self, key: Hashable, loader: Callable[[], Any], token: object) -> None:
+        """Schedules a reload of key on the cache's worker thread."""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+        self._executor.submit(self._refresh, key, loader, token)
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Any], token: object) -> None:
+        """Reloads key, unless the entry was removed or replaced while the reload ran."""
+        try:
+            value = loader()
+        except Exception as e:
+            logger.warning(f"Background refresh of {key!r} failed; dropping the entry: {e}")
+            with self._lock:
+                if self._refreshing.get(key) is token:
+                    del self._refreshing[key]
+                    self._entries.pop(key, None)
+            return
+
+        with self._lock:
+            if self._refreshing.get(key) is not token:
+                return
+            del self._refreshing[key]
+            self._store(key, value)
+        logger.debug(f"Refreshed {key!r} in the background")
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Caches value under key for ttl_seconds, evicting the least recently used entry if full.
+
+        Any in-flight get_or_load of the key will not overwrite this value.
+
+        Args:
+            key (Hashable): The cache key.
+            value (Any): The value to cache.
+        """
+        with self._lock:
+            self._refreshing.pop(key, None)
+            self._inflight.pop(key, None)
+            self._store(key, value)
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        """Inserts or replaces an entry as most recently used. Must hold the lock."""
+        self._entries[key] = (value, self._expiry())
+        self._entries.move_to_end(key)
+        self._evict()
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Removes key from the cache, returning its value (even if expired) or default."""
+        with self._lock:
+            self._refreshing.pop(key, None)
+            self._inflight.pop(key, None)
+            entry = self._entries.pop(key, None)
+            return default if entry is None else entry[0]
+
+    def clear(self) -> None:
+        """Removes every entry. The counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._refreshing.clear()
+            self._inflight.clear()
+
+    def sweep(self) -> int:
+        """
+        Removes every entry that is past its TTL and stale window.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        with self._lock:
+            now = time.monotonic()
+            expired = [key for key, (_, expires) in self._entries.items() if self._is_dead(expires, now)]
+            for key in expired:
+                del self._entries[key]
+            self.expirations += len(expired)
+
+        if expired:
+            logger.debug(f"Swept {len(expired)} expired entries from cache")
+        return len(expired)
+
+    def start_sweeper(self, interval: float) -> None:
+        """
+        Starts a daemon thread that calls sweep() every interval seconds.
+
+        Args:
+            interval (float): The number of seconds between sweeps.
+        """
+        self.stop_sweeper()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run_sweeper, args=(interval, self._stop_event), name="cache-sweeper", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Started cache sweeper (interval {interval}s)")
+
+    def stop_sweeper(self) -> None:
+        """Stops the background sweeper, if running."""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self._stop_event = None
+        logger.info("Stopped cache sweeper")
+
+    def _run_sweeper(self, interval: float, stop_event: threading.Event) -> None:
+        while not stop_event.wait(interval):
+            self.sweep()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the cache's size and counters.
+
+        Returns:
+            dict[str, int]: The size, max_entries, hits, misses, stale_hits, coalesced (misses that
+                waited on another caller's load), evictions and expirations.
+        """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale_hits": self.stale_hits,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
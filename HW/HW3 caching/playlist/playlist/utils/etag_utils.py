@@ -0,0 +1,150 @@
+import itertools
+import logging
+import threading
+import uuid
+from typing import Callable, Optional, Union
+
+from flask import Response, make_response, request
+
+from playlist.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# Distinguishes counters of this process from those of other workers or of a
+# previous run, so an ETag built from them is never reused for different content.
+_PROCESS_TOKEN = uuid.uuid4().hex[:12]
+
+
+class VersionCounter:
+    """
+    A thread-safe counter bumped every time the data it guards changes.
+
+    The value lives in this process only, so ETags built from it carry a per-process
+    token and only validate on the worker that issued them. Use SharedVersion for
+    data that several workers change.
+
+    """
+
+    shared = False
+
+    def __init__(self, name: str):
+        """Initializes the counter at version 0.
+
+        Args:
+            name (str): A short label included in ETags derived from the counter.
+
+        """
+        self.name = name
+        self._value = 0
+        self._lock = threading.Lock()
+
+    @property
+    def value(self) -> int:
+        """The current version."""
+        with self._lock:
+            return self._value
+
+    def bump(self) -> int:
+        """
+        Records a change and returns the new version.
+
+        Returns:
+            int: The new version.
+        """
+        with self._lock:
+            self._value += 1
+            return self._value
+
+
+class SharedVersion:
+    """
+    A version kept where every worker can read it, such as a database row.
+
+    ETags built only from shared versions validate on any worker and across restarts,
+    so a change made by one worker is never answered with 304 by another.
+
+    """
+
+    shared = True
+
+    def __init__(self, name: str, read: Callable[[], int], bump: Optional[Callable[[], int]] = None):
+        """Initializes the version.
+
+        Args:
+            name (str): A short label included in ETags derived from the version. It must
+                mean the same thing on every worker.
+            read (Callable): Returns the current version from the shared storage.
+            bump (Callable, optional): Increments the stored version and returns it. None if
+                the storage increments it itself with every write.
+
+        """
+        self.name = name
+        self._read = read
+        self._bump = bump
+
+    @property
+    def value(self) -> int:
+        """The current version, read from the shared storage."""
+        return self._read()
+
+    def bump(self) -> int:
+        """
+        Records a change and returns the new version.
+
+        Returns:
+            int: The new version.
+        """
+        if self._bump is None:
+            return self.value
+        return self._bump()
+
+
+# Names the counters of objects created at runtime (e.g. each PlaylistModel)
+_instance_ids = itertools.count(1)
+
+
+def new_counter_name(prefix: str) -> str:
+    """Returns a counter name that is unique within the process, e.g. "playlist3"."""
+    return f"{prefix}{next(_instance_ids)}"
+
+
+def make_etag(*counters: Union[VersionCounter, SharedVersion]) -> str:
+    """
+    Builds a strong ETag from the current value of one or more version counters.
+
+    The ETag carries this process's token unless every counter is shared.
+
+    Args:
+        *counters (VersionCounter | SharedVersion): The counters the response body depends on.
+
+    Returns:
+        str: The ETag value, without quotes.
+    """
+    versions = "-".join(f"{counter.name}.{counter.value}" for counter in counters)
+    if all(counter.shared for counter in counters):
+        return versions
+    return f"{_PROCESS_TOKEN}-{versions}"
+
+
+def not_modified(etag: str) -> Optional[Response]:
+    """
+    Returns a 304 response if the request's If-None-Match header matches etag.
+
+    Must be called inside a request context, before the response body is built.
+
+    Args:
+        etag (str): The current ETag of the requested resource.
+
+    Returns:
+        Response | None: An empty 304 response, or None if the client's copy is stale.
+    """
+    if not request.if_none_match.contains(etag):
+        return None
+
+    logger.debug(f"ETag {etag} matched; responding 304 Not Modified")
+    response = make_response("", 304)
+    response.set_etag(etag)
+    return response
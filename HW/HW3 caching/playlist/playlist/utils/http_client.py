@@ -0,0 +1,235 @@
+from collections import deque
+import logging
+import os
+import random
+import threading
+import time
+from typing import Deque, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from playlist.utils.logger import configure_logger
+
+
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", 10))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", 2))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", 0.1))
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", 2.0))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", 5))
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", 30))
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of sending a request while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Stops calls to an upstream after repeated failures.
+
+    After failure_threshold consecutive failed calls the breaker opens and
+    calls are refused for reset_seconds. It then lets a single trial call
+    through: success closes it again, failure reopens it.
+
+    """
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 reset_seconds: float = CIRCUIT_RESET_SECONDS):
+        """Initializes a closed breaker.
+
+        Args:
+            failure_threshold (int): The number of consecutive failures that opens the breaker.
+            reset_seconds (float): How long the breaker stays open before allowing a trial call.
+
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """The breaker's state: closed, open or half-open."""
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_seconds:
+                return "half-open"
+            return "open"
+
+    def allow(self) -> bool:
+        """Returns True if a call may be made now."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_seconds or self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("Upstream recovered; closing circuit breaker")
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning(f"Opening circuit breaker after {self._failures} consecutive failures")
+                self._opened_at = time.monotonic()
+
+    def reset(self) -> None:
+        """Closes the breaker and forgets past failures."""
+        self.record_success()
+
+
+class HttpClient:
+    """
+    A pooled HTTP client with bounded retries and a circuit breaker.
+
+    Requests share one requests.Session, so connections (and their TLS sessions)
+    are kept alive and reused. Timeouts, connection errors and 5xx responses are
+    retried up to max_retries times with jittered exponential backoff; a call
+    that still fails counts against the circuit breaker, and while the breaker
+    is open calls fail immediately with CircuitOpenError. Upstream latency and
+    outcomes are recorded for stats().
+
+    """
+
+    def __init__(self, pool_size: int = HTTP_POOL_SIZE, max_retries: int = HTTP_MAX_RETRIES,
+                 backoff_base: float = HTTP_BACKOFF_BASE, backoff_max: float = HTTP_BACKOFF_MAX,
+                 breaker: Optional[CircuitBreaker] = None):
+        """Initializes the client.
+
+        Args:
+            pool_size (int): The maximum number of connections kept open per host.
+            max_retries (int): The number of retries after a failed attempt.
+            backoff_base (float): The backoff before the first retry, in seconds. Doubles per retry.
+            backoff_max (float): The longest backoff, in seconds.
+            breaker (CircuitBreaker, optional): The breaker guarding the upstream.
+
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=1000)
+        self.requests = 0
+        self.failures = 0
+        self.retries = 0
+        self.short_circuits = 0
+
+    def _backoff(self, attempt: int) -> float:
+        """Returns a random delay of up to backoff_base * 2^attempt, capped at backoff_max."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _attempt(self, url: str, timeout: float) -> requests.Response:
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, timeout=timeout)
+            response.raise_for_status()
+            return response
+        finally:
+            with self._lock:
+                self.requests += 1
+                self._latencies.append(time.perf_counter() - start)
+
+    def get(self, url: str, timeout: float = 5) -> requests.Response:
+        """
+        Sends a GET request, retrying transient failures.
+
+        Args:
+            url (str): The URL to fetch.
+            timeout (float): The timeout of each attempt, in seconds.
+
+        Returns:
+            requests.Response: The successful response.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open.
+            requests.exceptions.RequestException: If the last attempt failed. Any other
+                exception is also counted as a failed call before it propagates.
+        """
+        if not self.breaker.allow():
+            with self._lock:
+                self.short_circuits += 1
+            raise CircuitOpenError(f"Circuit breaker open; not calling {url}")
+
+        succeeded = False
+        try:
+            attempt = 0
+            while True:
+                try:
+                    response = self._attempt(url, timeout)
+                except requests.exceptions.RequestException as e:
+                    status = getattr(e.response, "status_code", None)
+                    retryable = status is None or status >= 500
+                    if not retryable or attempt >= self.max_retries:
+                        raise
+                    delay = self._backoff(attempt)
+                    attempt += 1
+                    with self._lock:
+                        self.retries += 1
+                    logger.warning(f"Request to {url} failed ({e}); retry {attempt} of {self.max_retries} in {delay:.2f}s")
+                    time.sleep(delay)
+                else:
+                    succeeded = True
+                    return response
+        finally:
+            # Every call the breaker let through records its outcome, whatever it raised,
+            # so a half-open trial always ends
+            if succeeded:
+                self.breaker.record_success()
+            else:
+                with self._lock:
+                    self.failures += 1
+                self.breaker.record_failure()
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Returns upstream call counters and latency over the most recent 1000 requests.
+
+        Returns:
+            dict: The requests, failures, retries, short_circuits, breaker state and the
+                average, p95 and maximum latency in milliseconds.
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = {
+                "requests": self.requests,
+                "failures": self.failures,
+                "retries": self.retries,
+                "short_circuits": self.short_circuits,
+            }
+        stats["circuit"] = self.breaker.state
+        if latencies:
+            stats["latency_ms"] = {
+                "avg": round(1000 * sum(latencies) / len(latencies), 2),
+                "p95": round(1000 * latencies[int(0.95 * (len(latencies) - 1))], 2),
+                "max": round(1000 * latencies[-1], 2),
+            }
+        return stats
+
+
+# Shared client for calls to random.org
+http_client = HttpClient()
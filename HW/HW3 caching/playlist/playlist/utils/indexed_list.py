@@ -0,0 +1,298 @@
+from collections.abc import MutableSequence
+from itertools import chain
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Tuple, Union
+
+
+# Target number of items per block. Blocks are split once they hold twice this
+# and merged into a neighbour once they hold less than half of it.
+DEFAULT_LOAD = 256
+
+
+class _Block:
+    """A contiguous run of items and its position in IndexedList._blocks."""
+
+    __slots__ = ("items", "number")
+
+    def __init__(self, items: List[Hashable], number: int):
+        self.items = items
+        self.number = number
+
+
+class IndexedList(MutableSequence):
+    """
+    A list of unique items supporting fast membership, position lookup and moves.
+
+    Items are stored in blocks of load / 2 to 2 * load items, with a Fenwick
+    (binary indexed) tree over the block sizes and an item -> block index.
+    Membership is a dict lookup; a block's offset is a prefix sum of the tree, and
+    the block holding a position is found by descending it; so reading, inserting,
+    removing or moving the item at a position touches one or two blocks and
+    O(log n) tree nodes.
+
+    Membership and swap are O(1). Position lookup, insert, remove and move are
+    O(load + log n), plus an O(n / load) rebuild of the tree whenever a block is
+    split or merged, which happens at most once every load / 2 changes. With the
+    fixed default load that is O(log n) amortized for playlists of up to millions
+    of entries.
+
+    membership_version is incremented whenever an item is added or removed (but
+    not when items are moved or swapped), so owners can cheaply tell whether
+    aggregates they keep over the items are still current.
+
+    """
+
+    def __init__(self, items: Optional[Iterable[Hashable]] = None, load: int = DEFAULT_LOAD):
+        """Initializes the list, optionally from an iterable of unique items.
+
+        Args:
+            items (Iterable, optional): The initial items.
+            load (int): The target number of items per block.
+
+        Raises:
+            ValueError: If items contains duplicates.
+
+        """
+        self._load = load
+        self._blocks: List[_Block] = []
+        # Fenwick tree over the block sizes, 1-indexed: _tree[i] sums blocks (i - (i & -i), i]
+        self._tree: List[int] = [0]
+        self._block_of: Dict[Hashable, _Block] = {}
+        self._len = 0
+        self.membership_version = 0
+        if items is not None:
+            self.extend(items)
+
+    ##################################################
+    # Internal block bookkeeping
+    ##################################################
+
+    def _check_new(self, value: Hashable) -> None:
+        if value in self._block_of:
+            raise ValueError(f"{value!r} is already in the list")
+
+    def _normalize(self, index: int) -> int:
+        """Converts a possibly negative index into a position, raising IndexError if out of range."""
+        return range(self._len)[index]
+
+    def _locate(self, position: int) -> Tuple[_Block, int]:
+        """Returns the block holding position and the offset within it."""
+        tree = self._tree
+        number = 0
+        step = 1 << (len(tree) - 1).bit_length() - 1
+        while step:
+            # Skip whole blocks while they end at or before position
+            if number + step < len(tree) and tree[number + step] <= position:
+                number += step
+                position -= tree[number]
+            step >>= 1
+        return self._blocks[number], position
+
+    def _offset(self, number: int) -> int:
+        """Returns the position of the first item of block number."""
+        tree = self._tree
+        offset = 0
+        while number:
+            offset += tree[number]
+            number &= number - 1
+        return offset
+
+    def _resize(self, number: int, delta: int) -> None:
+        """Records that block number gained delta items."""
+        tree = self._tree
+        number += 1
+        while number < len(tree):
+            tree[number] += delta
+            number += number & -number
+
+    def _rebuild(self) -> None:
+        """Renumbers the blocks and rebuilds the tree after blocks were added or removed."""
+        tree = [0] * (len(self._blocks) + 1)
+        for number, block in enumerate(self._blocks):
+            block.number = number
+            node = number + 1
+            tree[node] += len(block.items)
+            parent = node + (node & -node)
+            if parent < len(tree):
+                tree[parent] += tree[node]
+        self._tree = tree
+
+    def _insert_at(self, position: int, value: Hashable) -> None:
+        """Inserts value so that it ends up at position (0 <= position <= len)."""
+        if not self._blocks:
+            self._blocks.append(_Block([], 0))
+            self._rebuild()
+
+        if position == self._len:
+            block = self._blocks[-1]
+            offset = len(block.items)
+        else:
+            block, offset = self._locate(position)
+
+        block.items.insert(offset, value)
+        self._block_of[value] = block
+        self._len += 1
+        self._resize(block.number, 1)
+
+        if len(block.items) > 2 * self._load:
+            self._split(block)
+
+    def _pop_at(self, position: int) -> Hashable:
+        """Removes and returns the item at position (0 <= position < len)."""
+        block, offset = self._locate(position)
+        value = block.items.pop(offset)
+        del self._block_of[value]
+        self._len -= 1
+        self._resize(block.number, -1)
+
+        if not block.items:
+            del self._blocks[block.number]
+            self._rebuild()
+        elif len(block.items) < self._load // 2:
+            self._merge(block)
+        return value
+
+    def _split(self, block: _Block) -> None:
+        """Moves the second half of an overfull block into a new block after it."""
+        tail = _Block(block.items[self._load:], block.number + 1)
+        del block.items[self._load:]
+        self._blocks.insert(tail.number, tail)
+        self._rebuild()
+        for value in tail.items:
+            self._block_of[value] = tail
+
+    def _merge(self, block: _Block) -> None:
+        """Folds an underfull block into a neighbour, splitting the result if it is overfull."""
+        if len(self._blocks) < 2:
+            return
+        if block.number > 0:
+            left, right = self._blocks[block.number - 1], block
+        else:
+            left, right = block, self._blocks[1]
+
+        left.items.extend(right.items)
+        for value in right.items:
+            self._block_of[value] = left
+        del self._blocks[right.number]
+        self._rebuild()
+
+        if len(left.items) > 2 * self._load:
+            self._split(left)
+
+    ##################################################
+    # Sequence interface
+    ##################################################
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return chain.from_iterable(block.items for block in self._blocks)
+
+    def __contains__(self, value: object) -> bool:
+        return value in self._block_of
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return list(self)[index]
+        block, offset = self._locate(self._normalize(index))
+        return block.items[offset]
+
+    def __setitem__(self, index: Union[int, slice], value) -> None:
+        if isinstance(index, slice):
+            items = list(self)
+            items[index] = value
+            self.clear()
+            self.extend(items)
+            return
+
+        block, offset = self._locate(self._normalize(index))
+        old = block.items[offset]
+        if value == old:
+            return
+        self._check_new(value)
+        del self._block_of[old]
+        block.items[offset] = value
+        self._block_of[value] = block
+        self.membership_version += 1
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        if isinstance(index, slice):
+            items = list(self)
+            del items[index]
+            self.clear()
+            self.extend(items)
+            return
+
+        self._pop_at(self._normalize(index))
+        self.membership_version += 1
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (IndexedList, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"IndexedList({list(self)!r})"
+
+    def insert(self, index: int, value: Hashable) -> None:
+        """Inserts value before index, clamping the index the way list.insert does."""
+        self._check_new(value)
+        position = max(0, min(self._len, index if index >= 0 else self._len + index))
+        self._insert_at(position, value)
+        self.membership_version += 1
+
+    def append(self, value: Hashable) -> None:
+        """Appends value to the end of the list."""
+        self._check_new(value)
+        self._insert_at(self._len, value)
+        self.membership_version += 1
+
+    def index(self, value: Hashable, start: int = 0, stop: Optional[int] = None) -> int:
+        """Returns the position of value.
+
+        Raises:
+            ValueError: If value is not in the list (or not within start:stop).
+        """
+        block = self._block_of.get(value)
+        if block is None:
+            raise ValueError(f"{value!r} is not in list")
+        position = self._offset(block.number) + block.items.index(value)
+        if position < start or (stop is not None and position >= stop):
+            raise ValueError(f"{value!r} is not in list")
+        return position
+
+    def count(self, value: Hashable) -> int:
+        return 1 if value in self._block_of else 0
+
+    def remove(self, value: Hashable) -> None:
+        """Removes value from the list."""
+        self._pop_at(self.index(value))
+        self.membership_version += 1
+
+    def clear(self) -> None:
+        self._blocks.clear()
+        self._tree = [0]
+        self._block_of.clear()
+        self._len = 0
+        self.membership_version += 1
+
+    def swap(self, index1: int, index2: int) -> None:
+        """Swaps the items at two positions."""
+        block1, offset1 = self._locate(self._normalize(index1))
+        block2, offset2 = self._locate(self._normalize(index2))
+        value1, value2 = block1.items[offset1], block2.items[offset2]
+        block1.items[offset1], block2.items[offset2] = value2, value1
+        self._block_of[value1], self._block_of[value2] = block2, block1
+
+    def move(self, source: int, destination: int) -> None:
+        """
+        Moves the item at source to destination, shifting the items in between.
+
+        Args:
+            source (int): The current position of the item.
+            destination (int): The position the item should end up at.
+        """
+        source = self._normalize(source)
+        destination = self._normalize(destination)
+        if source != destination:
+            self._insert_at(destination, self._pop_at(source))
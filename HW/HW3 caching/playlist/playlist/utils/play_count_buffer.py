@@ -0,0 +1,230 @@
+import atexit
+from collections import Counter
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Mapping, Optional
+
+from sqlalchemy import Table, bindparam
+from sqlalchemy.exc import SQLAlchemyError
+
+from playlist.db import db
+from playlist.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class PlayCountBuffer:
+    """
+    A write-behind accumulator for song play counts.
+
+    Increments are summed per song in memory and written in one batched
+    ``UPDATE ... SET play_count = play_count + :delta`` statement when the number
+    of buffered plays reaches the flush threshold, when the flush interval has
+    elapsed, or when flush() is called. Because the database applies the delta,
+    concurrent writers never overwrite each other's increments.
+
+    """
+
+    def __init__(self, table: Table, flush_threshold: int = 100, flush_interval: float = 5.0,
+                 synchronous: bool = False):
+        """Initializes the buffer for the given songs table.
+
+        Args:
+            table (Table): The table holding the id and play_count columns.
+            flush_threshold (int): The number of buffered plays that triggers a flush.
+            flush_interval (float): The maximum number of seconds between flushes.
+            synchronous (bool): If True, every increment is flushed immediately.
+
+        """
+        self.flush_threshold = flush_threshold
+        self.flush_interval = flush_interval
+        self.synchronous = synchronous
+
+        self._statement = (
+            table.update()
+            .where(table.c.id == bindparam("song_id"))
+            .values(play_count=table.c.play_count + bindparam("delta"))
+        )
+        self._flush_listeners: List[Callable[[Dict[int, int]], None]] = []
+        self._pending: Counter = Counter()
+        self._pending_total = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._stop_event: Optional[threading.Event] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_at_exit = False
+
+    def configure(self, flush_threshold: Optional[int] = None, flush_interval: Optional[float] = None,
+                  synchronous: Optional[bool] = None) -> None:
+        """Updates the flush settings. Arguments left as None keep their current value."""
+        if flush_threshold is not None:
+            self.flush_threshold = flush_threshold
+        if flush_interval is not None:
+            self.flush_interval = flush_interval
+        if synchronous is not None:
+            self.synchronous = synchronous
+
+    def add_flush_listener(self, listener: Callable[[Dict[int, int]], None]) -> None:
+        """Registers a callback invoked with the {song_id: delta} mapping after each successful flush."""
+        self._flush_listeners.append(listener)
+
+    def increment(self, song_id: int, delta: int = 1) -> Optional[int]:
+        """
+        Buffers a play count increment, flushing if a flush is due.
+
+        Args:
+            song_id (int): The ID of the song that was played.
+            delta (int): The number of plays to add. Defaults to 1.
+
+        Returns:
+            int | None: The number of songs updated if a flush ran, otherwise None.
+
+        Raises:
+            SQLAlchemyError: If a triggered flush fails.
+        """
+        with self._lock:
+            self._pending[song_id] += delta
+            self._pending_total += delta
+            flush_due = (
+                self.synchronous
+                or self._pending_total >= self.flush_threshold
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+
+        if flush_due:
+            return self.flush()
+        return None
+
+    def increment_many(self, deltas: Mapping[int, int]) -> Optional[int]:
+        """
+        Buffers play count increments for several songs at once, flushing if a flush is due.
+
+        All increments are added under one lock acquisition, so a due flush writes them
+        together in a single batched UPDATE and transaction.
+
+        Args:
+            deltas (Mapping[int, int]): The number of plays to add per song ID.
+
+        Returns:
+            int | None: The number of songs updated if a flush ran, otherwise None.
+
+        Raises:
+            SQLAlchemyError: If a triggered flush fails.
+        """
+        with self._lock:
+            self._pending.update(deltas)
+            self._pending_total += sum(deltas.values())
+            flush_due = (
+                self.synchronous
+                or self._pending_total >= self.flush_threshold
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+
+        if flush_due:
+            return self.flush()
+        return None
+
+    def pending(self, song_id: int) -> int:
+        """Returns the number of buffered, unwritten plays for a song."""
+        with self._lock:
+            return self._pending.get(song_id, 0)
+
+    def discard(self, song_id: int) -> None:
+        """Drops any buffered plays for a song, e.g. after it has been deleted."""
+        with self._lock:
+            self._pending_total -= self._pending.pop(song_id, 0)
+
+    def flush(self) -> int:
+        """
+        Writes all buffered increments in a single batched UPDATE and commits.
+
+        The UPDATE runs in its own transaction on a dedicated connection, so a flush
+        triggered inside a request never commits or rolls back the request's session.
+        Must be called inside an application context. If the write fails the
+        increments are put back into the buffer.
+
+        Returns:
+            int: The number of songs whose play count was updated.
+
+        Raises:
+            SQLAlchemyError: If the database update fails.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._pending_total = 0
+            self._last_flush = time.monotonic()
+
+        if not pending:
+            return 0
+
+        rows = [{"song_id": song_id, "delta": delta} for song_id, delta in pending.items()]
+
+        try:
+            with db.engine.begin() as connection:
+                result = connection.execute(self._statement, rows)
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while flushing play counts for {len(rows)} songs: {e}")
+            with self._lock:
+                self._pending.update(pending)
+                self._pending_total += sum(pending.values())
+            raise
+
+        if result.rowcount < len(rows):
+            logger.warning(f"Play counts flushed for {result.rowcount} of {len(rows)} songs; the rest no longer exist")
+        logger.info(f"Flushed {sum(pending.values())} plays across {len(rows)} songs")
+
+        for listener in self._flush_listeners:
+            listener(dict(pending))
+
+        return result.rowcount
+
+    def start(self, app) -> None:
+        """
+        Starts a daemon thread that flushes the buffer every flush_interval seconds.
+
+        The first start registers stop() with atexit, so buffered plays are written when
+        the process exits; restarting the flusher, e.g. for another app, does not add
+        another exit hook.
+
+        Args:
+            app (Flask): The application whose context the flushes run in.
+        """
+        self.stop()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(app, self._stop_event), name="play-count-flusher", daemon=True
+        )
+        self._thread.start()
+        if not self._stop_at_exit:
+            atexit.register(self.stop)
+            self._stop_at_exit = True
+        logger.info(f"Started play count flusher (interval {self.flush_interval}s)")
+
+    def stop(self) -> None:
+        """Stops the background flusher, which flushes once more before exiting."""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self._stop_event = None
+        logger.info("Stopped play count flusher")
+
+    def _run(self, app, stop_event: threading.Event) -> None:
+        """Background loop: flush on every interval, and one last time when stopped."""
+        while True:
+            stopped = stop_event.wait(self.flush_interval)
+            with app.app_context():
+                try:
+                    self.flush()
+                except SQLAlchemyError:
+                    # Increments stay buffered and are retried on the next pass
+                    pass
+                finally:
+                    # Flush listeners may have used the session
+                    db.session.remove()
+            if stopped:
+                return
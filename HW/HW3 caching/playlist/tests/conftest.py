@@ -3,6 +3,7 @@ import pytest
 from app import create_app
 from config import TestConfig
 from playlist.db import db
+from playlist.models.song_model import song_cache
 
 @pytest.fixture
 def app():
@@ -13,6 +14,11 @@ def app():
         db.session.remove()
         db.drop_all()
 
+@pytest.fixture(autouse=True)
+def clear_song_cache():
+    """The song cache is process-wide, so empty it between tests."""
+    song_cache.clear()
+
 @pytest.fixture
 def client(app):
     return app.test_client()
@@ -1,10 +1,20 @@
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import threading
+
+from flask import Flask
 import pytest
 import requests
 
-from playlist.utils.api_utils import get_random
+from playlist.utils import api_utils
+from playlist.utils.api_utils import (
+    RANDOM_ORG_INTEGERS_URL, LocalRandomProvider, RandomOrgProvider, RandomProvider, SeededRandomProvider,
+    create_random_provider, get_random, get_random_batch, get_random_provider, register_seed_header,
+    seeded_random, set_random_provider
+)
+from playlist.utils.http_client import http_client
 
 
-RANDOM_NUMBER = 4
+RANDOM_NUMBERS = [3, 999_999_999, 13]
 
 
 @pytest.fixture
@@ -13,43 +23,79 @@ def mock_random_org(mocker):
     # requests.get returns an object, which we have replaced with a mock object
     mock_response = mocker.Mock()
     # We are giving that object a text attribute
-    mock_response.text = f"{RANDOM_NUMBER}"
-    mocker.patch("requests.get", return_value=mock_response)
+    mock_response.text = "\n".join(str(number) for number in RANDOM_NUMBERS)
+    mocker.patch.object(http_client.session, "get", return_value=mock_response)
     return mock_response
 
-def test_get_random(mock_random_org):
-    """Test retrieving a random number from random.org.
+
+@pytest.fixture(autouse=True)
+def reset_http_client(mocker):
+    """Closes the shared client's circuit breaker and skips retry backoff."""
+    mocker.patch("playlist.utils.http_client.time.sleep")
+    http_client.breaker.reset()
+    yield
+    http_client.breaker.reset()
+
+
+@pytest.fixture
+def provider():
+    """Fixture for a pooled provider that never refills in the background."""
+    return RandomOrgProvider(pool_size=3, low_water=-1)
+
+
+@pytest.fixture
+def random_org_stub():
+    """Fixture for a local HTTP server standing in for random.org, serving 1, 2, 3, ..."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = "\n".join(str(number) for number in range(1, 11)).encode()
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/integers/?min=0&max=999999999&format=plain"
+    server.shutdown()
+
+
+def test_get_random(mock_random_org, provider):
+    """Test integers are fetched from random.org in one request and drawn from the pool.
 
     """
-    result = get_random(10)
+    assert provider.refill() == 3
 
-    # Assert that the result is the mocked random number
-    assert result == RANDOM_NUMBER, f"Expected random number {RANDOM_NUMBER}, but got {result}"
+    # 999999999 is rejected to keep results unbiased, so 3 and 13 map to 4 and 7
+    assert [provider.randint(7) for _ in range(2)] == [4, 7]
 
     # Ensure that the correct URL was called
-    requests.get.assert_called_once_with("https://www.random.org/integers/?num=1&min=1&col=1&base=10&format=plain&rnd=new&max=10", timeout=5)
+    http_client.session.get.assert_called_once_with(f"{RANDOM_ORG_INTEGERS_URL}&num=3", timeout=5)
 
-def test_get_random_request_failure(mocker):
+def test_get_random_request_failure(mocker, provider):
     """Test handling of a request failure when calling random.org.
 
     """
     # Simulate a request failure
-    mocker.patch("requests.get", side_effect=requests.exceptions.RequestException("Connection error"))
+    mocker.patch.object(http_client.session, "get", side_effect=requests.exceptions.RequestException("Connection error"))
 
     with pytest.raises(RuntimeError, match="Request to random.org failed: Connection error"):
-        get_random(10)
+        provider.refill()
 
-def test_get_random_timeout(mocker):
+def test_get_random_timeout(mocker, provider):
     """Test handling of a timeout when calling random.org.
 
     """
     # Simulate a timeout
-    mocker.patch("requests.get", side_effect=requests.exceptions.Timeout)
+    mocker.patch.object(http_client.session, "get", side_effect=requests.exceptions.Timeout)
 
     with pytest.raises(RuntimeError, match="Request to random.org timed out."):
-        get_random(10)
+        provider.refill()
 
-def test_get_random_invalid_response(mock_random_org):
+def test_get_random_invalid_response(mock_random_org, provider):
     """Test handling of an invalid response from random.org.
 
     """
@@ -57,4 +103,123 @@ def test_get_random_invalid_response(mock_random_org):
     mock_random_org.text = "invalid_response"
 
     with pytest.raises(ValueError, match="Invalid response from random.org: invalid_response"):
-        get_random(10)
+        provider.refill()
+
+def test_randints_takes_batch_from_pool(mock_random_org, provider):
+    """Test a batch is taken from one pooled request, skipping rejected values."""
+    provider.refill()
+
+    assert provider.randints(2, 7) == [4, 7]
+    http_client.session.get.assert_called_once_with(f"{RANDOM_ORG_INTEGERS_URL}&num=3", timeout=5)
+    assert len(provider) == 0
+
+def test_randints_falls_back_when_pool_runs_out(mocker, mock_random_org, provider):
+    """Test the part of a batch the pool cannot cover comes from the fallback."""
+    provider.refill()
+    provider.fallback = mocker.Mock(spec=LocalRandomProvider)
+    provider.fallback.randint.return_value = 1
+
+    assert provider.randints(4, 7) == [4, 7, 1, 1]
+    assert provider.fallbacks == 2
+
+def test_empty_pool_falls_back_and_refills(mocker, random_org_stub):
+    """Test an empty pool is served by the fallback while it refills in the background."""
+    fallback = mocker.Mock(spec=LocalRandomProvider)
+    fallback.randint.return_value = 7
+    provider = RandomOrgProvider(url=random_org_stub, pool_size=10, low_water=2, fallback=fallback)
+
+    assert provider.randint(100) == 7
+    for _ in range(500):
+        if len(provider) == 10:
+            break
+        threading.Event().wait(0.01)
+
+    assert [provider.randint(100) for _ in range(3)] == [2, 3, 4]
+    assert provider.fallbacks == 1
+
+def test_get_random_uses_configured_provider():
+    """Test get_random draws from the provider set with set_random_provider."""
+    previous = get_random_provider()
+    set_random_provider(LocalRandomProvider())
+    try:
+        assert all(1 <= get_random(3) <= 3 for _ in range(50))
+        with pytest.raises(ValueError):
+            get_random(0)
+    finally:
+        set_random_provider(previous)
+
+def test_seeded_provider_is_reproducible():
+    """Test two seeded providers with the same seed draw the same sequence."""
+    a, b = SeededRandomProvider(42), SeededRandomProvider(42)
+    draws = [a.randint(10) for _ in range(20)]
+    assert draws == [b.randint(10) for _ in range(20)]
+    assert all(1 <= n <= 10 for n in draws)
+
+def test_create_seeded_provider():
+    """Test the seeded provider is created from a seed and refused without one."""
+    assert isinstance(create_random_provider("seeded", seed="7"), SeededRandomProvider)
+    with pytest.raises(ValueError, match="needs a seed"):
+        create_random_provider("seeded", seed=None)
+    with pytest.raises(ValueError, match="Unknown random provider"):
+        create_random_provider("dice")
+
+def test_provider_is_abstract():
+    """Test a provider must implement randint."""
+    with pytest.raises(TypeError):
+        RandomProvider()
+
+def test_provider_created_on_first_use(monkeypatch):
+    """Test the provider is built from the environment when first needed, reporting a bad setting there."""
+    monkeypatch.setattr(api_utils, "_provider", None)
+    monkeypatch.setattr(api_utils, "RANDOM_PROVIDER", "seeded")
+    monkeypatch.setattr(api_utils, "RANDOM_SEED", None)
+    with pytest.raises(ValueError, match="needs a seed"):
+        get_random(6)
+
+    monkeypatch.setattr(api_utils, "RANDOM_SEED", "7")
+    provider = get_random_provider()
+    assert isinstance(provider, SeededRandomProvider)
+    assert get_random_provider() is provider
+
+def test_seeded_random_scope():
+    """Test get_random draws from the seed inside a seeded_random block and from the provider after it."""
+    previous = get_random_provider()
+    with seeded_random(5):
+        first = [get_random(100) for _ in range(10)]
+    with seeded_random(5) as provider:
+        assert get_random_provider() is provider
+        assert [get_random(100) for _ in range(10)] == first
+    assert get_random_provider() is previous
+
+def test_register_seed_header():
+    """Test a request carrying the seed header draws from that seed, and one without it from the provider."""
+    previous = get_random_provider()
+    set_random_provider(SeededRandomProvider("server"))
+    app = Flask(__name__)
+    register_seed_header(app, "X-Random-Seed")
+
+    @app.route("/draw")
+    def draw():
+        return str([get_random(100) for _ in range(5)])
+
+    try:
+        client = app.test_client()
+        with seeded_random("replay"):
+            expected = str([get_random(100) for _ in range(5)])
+        assert client.get("/draw", headers={"X-Random-Seed": "replay"}).text == expected
+        assert client.get("/draw", headers={"X-Random-Seed": "replay"}).text == expected
+
+        unseeded = SeededRandomProvider("server")
+        assert client.get("/draw").text == str([unseeded.randint(100) for _ in range(5)])
+    finally:
+        set_random_provider(previous)
+
+def test_get_random_batch():
+    """Test get_random_batch draws n numbers from the configured provider."""
+    with seeded_random(3):
+        expected = [get_random(6) for _ in range(5)]
+    with seeded_random(3):
+        assert get_random_batch(5, 6) == expected
+    assert get_random_batch(0, 6) == []
+    with pytest.raises(ValueError, match="n must not be negative"):
+        get_random_batch(-1, 6)
@@ -0,0 +1,184 @@
+import threading
+import time
+
+import pytest
+
+from playlist.utils.cache import TTLCache
+
+
+@pytest.fixture
+def cache():
+    """Fixture for a small cache."""
+    return TTLCache(max_entries=2, ttl_seconds=60)
+
+
+def test_get_and_set(cache):
+    """Test values can be cached and read back, counting hits and misses."""
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+
+
+def test_lru_eviction(cache):
+    """Test the least recently used entry is evicted when the cache is full."""
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expiry(cache, mocker):
+    """Test entries are not served once their TTL has passed."""
+    monotonic = mocker.patch("playlist.utils.cache.time.monotonic", return_value=100.0)
+    cache.set("a", 1)
+
+    monotonic.return_value = 161.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_pop_and_clear(cache):
+    """Test entries can be removed individually or all at once."""
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.pop("a") == 1
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_sweep_counts_expirations(cache, mocker):
+    """Test sweeping removes expired entries and counts them as expirations."""
+    monotonic = mocker.patch("playlist.utils.cache.time.monotonic", return_value=100.0)
+    cache.set("a", 1)
+    monotonic.return_value = 130.0
+    cache.set("b", 2)
+
+    monotonic.return_value = 161.0
+    assert cache.sweep() == 1
+    assert cache.get("b") == 2
+    assert cache.stats()["expirations"] == 1
+
+
+def test_get_or_load(cache):
+    """Test get_or_load calls the loader only on a miss."""
+    loader = lambda: "loaded"
+    assert cache.get_or_load("a", loader) == "loaded"
+    assert cache.get_or_load("a", lambda: pytest.fail("loader called on a hit")) == "loaded"
+
+
+def test_stale_while_revalidate(mocker):
+    """Test a recently expired entry is served while it is reloaded in the background."""
+    cache = TTLCache(max_entries=2, ttl_seconds=60, stale_seconds=30)
+    monotonic = mocker.patch("playlist.utils.cache.time.monotonic", return_value=100.0)
+    cache.set("a", "old")
+    refreshed = threading.Event()
+
+    def refresh():
+        refreshed.set()
+        return "new"
+
+    monotonic.return_value = 170.0
+    assert cache.get_or_load("a", lambda: pytest.fail("loader called on a stale hit"), refresh=refresh) == "old"
+    assert refreshed.wait(5)
+    cache._executor.shutdown(wait=True)
+
+    assert cache.get("a") == "new"
+    assert cache.stats()["stale_hits"] == 1
+
+    monotonic.return_value = 1000.0
+    assert cache.get_or_load("a", lambda: "reloaded") == "reloaded"
+
+
+def test_get_or_load_coalesces_concurrent_misses(cache):
+    """Test concurrent misses on one key run the loader once and share its result."""
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "loaded"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(cache.get_or_load("a", loader)))
+    leader.start()
+    assert started.wait(5)
+    waiters = [threading.Thread(target=lambda: results.append(cache.get_or_load("a", loader))) for _ in range(3)]
+    for thread in waiters:
+        thread.start()
+    while cache.stats()["coalesced"] < 3:
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader, *waiters]:
+        thread.join(5)
+
+    assert results == ["loaded"] * 4
+    assert len(calls) == 1
+
+
+def test_get_or_load_shares_loader_errors(cache):
+    """Test waiters receive the leader's exception and nothing is cached."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def loader():
+        started.set()
+        release.wait(5)
+        raise ValueError("not found")
+
+    errors = []
+
+    def load():
+        try:
+            cache.get_or_load("a", loader)
+        except ValueError as e:
+            errors.append(str(e))
+
+    leader = threading.Thread(target=load)
+    leader.start()
+    assert started.wait(5)
+    waiter = threading.Thread(target=load)
+    waiter.start()
+    while cache.stats()["coalesced"] < 1:
+        time.sleep(0.001)
+    release.set()
+    leader.join(5)
+    waiter.join(5)
+
+    assert errors == ["not found", "not found"]
+    assert cache.get("a") is None
+
+
+def test_pop_during_load_is_not_overwritten(cache):
+    """Test an in-flight load does not cache its value once the key has been popped."""
+    def loader():
+        cache.pop("a")
+        return "old"
+
+    assert cache.get_or_load("a", loader) == "old"
+    assert cache.get("a") is None
+
+
+def test_ttl_jitter_spreads_expiry(mocker):
+    """Test jitter shortens each entry's TTL by up to the configured fraction."""
+    mocker.patch("playlist.utils.cache.time.monotonic", return_value=100.0)
+    mocker.patch("playlist.utils.cache.random.uniform", side_effect=[0.0, 0.1])
+    cache = TTLCache(max_entries=2, ttl_seconds=60, ttl_jitter=0.1)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    assert cache._entries["a"][1] == 160.0
+    assert cache._entries["b"][1] == pytest.approx(154.0)
+
+    with pytest.raises(ValueError):
+        cache.configure(ttl_jitter=1)
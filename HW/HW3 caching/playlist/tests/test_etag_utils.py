@@ -0,0 +1,46 @@
+from playlist.utils.etag_utils import SharedVersion, VersionCounter, make_etag, not_modified
+
+
+def test_bump_changes_etag():
+    """Test an ETag changes when any of its counters is bumped."""
+    playlist, catalog = VersionCounter("playlist"), VersionCounter("catalog")
+    before = make_etag(playlist, catalog)
+
+    assert make_etag(playlist, catalog) == before
+    catalog.bump()
+    assert make_etag(playlist, catalog) != before
+
+
+def test_not_modified_on_matching_etag(app):
+    """Test a matching If-None-Match header yields a 304 carrying the ETag."""
+    etag = make_etag(VersionCounter("catalog"))
+
+    with app.test_request_context(headers={"If-None-Match": f'"{etag}"'}):
+        response = not_modified(etag)
+
+    assert response.status_code == 304
+    assert response.get_etag() == (etag, False)
+
+
+def test_not_modified_on_stale_etag(app):
+    """Test a stale or missing If-None-Match header does not short-circuit."""
+    counter = VersionCounter("catalog")
+    stale = make_etag(counter)
+    counter.bump()
+
+    with app.test_request_context(headers={"If-None-Match": f'"{stale}"'}):
+        assert not_modified(make_etag(counter)) is None
+    with app.test_request_context():
+        assert not_modified(make_etag(counter)) is None
+
+
+def test_shared_etag_is_the_same_on_every_worker():
+    """Test ETags built only from shared versions carry no per-process token."""
+    stored = {"catalog": 3}
+    catalog = SharedVersion("catalog", read=lambda: stored["catalog"])
+
+    assert make_etag(catalog) == "catalog.3"
+    assert make_etag(catalog, VersionCounter("playlist")) != "catalog.3-playlist.0"
+
+    stored["catalog"] = 4
+    assert make_etag(catalog) == "catalog.4"
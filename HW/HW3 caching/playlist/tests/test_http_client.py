@@ -0,0 +1,144 @@
+import pytest
+import requests
+
+from playlist.utils.http_client import CircuitBreaker, CircuitOpenError, HttpClient
+
+
+URL = "https://upstream.example/numbers"
+
+
+@pytest.fixture
+def client(mocker):
+    """Fixture for a client with a mocked session and no backoff sleeps."""
+    mocker.patch("playlist.utils.http_client.time.sleep")
+    client = HttpClient(max_retries=2, breaker=CircuitBreaker(failure_threshold=2, reset_seconds=30))
+    mocker.patch.object(client.session, "get")
+    return client
+
+
+def _http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.exceptions.HTTPError(f"{status} error", response=response)
+
+
+def test_get_success(client, mocker):
+    """Test a successful request is returned and timed."""
+    response = mocker.Mock()
+    client.session.get.return_value = response
+
+    assert client.get(URL, timeout=3) is response
+    client.session.get.assert_called_once_with(URL, timeout=3)
+
+    stats = client.stats()
+    assert (stats["requests"], stats["failures"], stats["retries"]) == (1, 0, 0)
+    assert stats["circuit"] == "closed"
+    assert set(stats["latency_ms"]) == {"avg", "p95", "max"}
+
+
+def test_get_retries_transient_failures(client, mocker):
+    """Test timeouts and 5xx responses are retried with backoff until a request succeeds."""
+    unavailable, response = mocker.Mock(), mocker.Mock()
+    unavailable.raise_for_status.side_effect = _http_error(503)
+    client.session.get.side_effect = [requests.exceptions.Timeout, unavailable, response]
+
+    assert client.get(URL) is response
+    assert client.session.get.call_count == 3
+    assert client.stats()["retries"] == 2
+
+
+def test_get_does_not_retry_client_errors(client, mocker):
+    """Test 4xx responses fail at once."""
+    response = mocker.Mock()
+    response.raise_for_status.side_effect = _http_error(404)
+    client.session.get.return_value = response
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get(URL)
+    assert client.session.get.call_count == 1
+
+
+def test_get_gives_up_after_max_retries(client):
+    """Test the last error is raised once the retries are used up."""
+    client.session.get.side_effect = requests.exceptions.ConnectionError("refused")
+
+    with pytest.raises(requests.exceptions.ConnectionError, match="refused"):
+        client.get(URL)
+    assert client.session.get.call_count == 3
+    assert client.stats()["failures"] == 1
+
+
+def test_backoff_is_capped(client):
+    """Test the jittered backoff never exceeds backoff_max."""
+    client.backoff_base, client.backoff_max = 1, 4
+    assert all(0 <= client._backoff(10) <= 4 for _ in range(100))
+
+
+def test_circuit_opens_and_short_circuits(client):
+    """Test the breaker opens after repeated failures and then refuses calls without sending them."""
+    client.session.get.side_effect = requests.exceptions.Timeout
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.Timeout):
+            client.get(URL)
+    calls = client.session.get.call_count
+
+    with pytest.raises(CircuitOpenError):
+        client.get(URL)
+    assert client.session.get.call_count == calls
+
+    stats = client.stats()
+    assert (stats["circuit"], stats["short_circuits"]) == ("open", 1)
+
+
+def test_circuit_half_open_trial(mocker):
+    """Test a single trial call is allowed after reset_seconds, and its success closes the breaker."""
+    monotonic = mocker.patch("playlist.utils.http_client.time.monotonic", return_value=100.0)
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    monotonic.return_value = 130.0
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    assert not breaker.allow(), "Only one trial call should be let through"
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_trial_ended_by_unexpected_error(client, mocker):
+    """Test a half-open trial that raises something other than a request error still records a failure."""
+    monotonic = mocker.patch("playlist.utils.http_client.time.monotonic", return_value=100.0)
+    client.session.get.side_effect = requests.exceptions.Timeout
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.Timeout):
+            client.get(URL)
+
+    monotonic.return_value = 130.0
+    client.session.get.side_effect = ValueError("bad payload")
+    with pytest.raises(ValueError):
+        client.get(URL)
+    assert client.breaker.state == "open"
+
+    monotonic.return_value = 160.0
+    client.session.get.side_effect = None
+    client.get(URL)
+    assert client.breaker.state == "closed"
+
+
+def test_circuit_trial_failure_reopens(mocker):
+    """Test a failed trial call reopens the breaker for another reset_seconds."""
+    monotonic = mocker.patch("playlist.utils.http_client.time.monotonic", return_value=100.0)
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    breaker.record_failure()
+
+    monotonic.return_value = 130.0
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+    monotonic.return_value = 159.0
+    assert not breaker.allow()
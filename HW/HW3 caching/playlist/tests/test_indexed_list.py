@@ -0,0 +1,144 @@
+import random
+
+import pytest
+
+from playlist.utils.indexed_list import IndexedList
+
+
+@pytest.fixture
+def items():
+    """Fixture for a list of five items."""
+    return IndexedList([10, 20, 30, 40, 50])
+
+
+def assert_indexed(items):
+    """Checks every item's indexed position matches its place in the list."""
+    assert [items.index(item) for item in items] == list(range(len(items)))
+
+
+def test_membership_and_index(items):
+    """Test membership and positions are answered from the index."""
+    assert 30 in items
+    assert 60 not in items
+    assert items.index(40) == 3
+    with pytest.raises(ValueError):
+        items.index(60)
+
+
+def test_duplicates_rejected(items):
+    """Test items must be unique."""
+    with pytest.raises(ValueError):
+        items.append(10)
+    with pytest.raises(ValueError):
+        items.insert(0, 20)
+    with pytest.raises(ValueError):
+        IndexedList([1, 1])
+
+
+@pytest.mark.parametrize("source, destination, expected", [
+    (4, 0, [50, 10, 20, 30, 40]),
+    (0, -1, [20, 30, 40, 50, 10]),
+    (1, 3, [10, 30, 40, 20, 50]),
+    (2, 2, [10, 20, 30, 40, 50]),
+])
+def test_move(items, source, destination, expected):
+    """Test moving an item shifts the items in between and keeps the index in step."""
+    items.move(source, destination)
+    assert items == expected
+    assert_indexed(items)
+
+
+def test_swap(items):
+    """Test swapping two items."""
+    items.swap(0, 4)
+    assert items == [50, 20, 30, 40, 10]
+    assert_indexed(items)
+
+
+def test_list_mutations_keep_index(items):
+    """Test the standard list mutations keep the index in step."""
+    items.remove(20)
+    items.insert(1, 60)
+    del items[0]
+    items[0] = 70
+    items.extend([80])
+    items[1:3] = [90]
+
+    assert items == [70, 90, 50, 80]
+    assert_indexed(items)
+    assert 30 not in items and 60 not in items
+
+    items.clear()
+    assert len(items) == 0 and 70 not in items
+
+
+def test_operations_across_blocks():
+    """Test moves and removals spanning many small blocks match a plain list."""
+    items, expected = IndexedList(range(20), load=2), list(range(20))
+
+    for source, destination in [(19, 0), (0, 19), (5, 12), (12, 5)]:
+        items.move(source, destination)
+        expected.insert(destination, expected.pop(source))
+    for value in [0, 7, 19]:
+        items.remove(value)
+        expected.remove(value)
+
+    assert items == expected
+    assert [items[position] for position in range(len(items))] == expected
+    assert_indexed(items)
+
+
+def test_underfull_blocks_are_merged():
+    """Test removing most items merges the emptied blocks instead of leaving many tiny ones."""
+    items, expected = IndexedList(range(400), load=8), list(range(400))
+
+    for value in range(0, 400, 5):
+        items.move(items.index(value), 0)
+        expected.insert(0, expected.pop(expected.index(value)))
+    for value in [value for value in range(400) if value % 10]:
+        items.remove(value)
+        expected.remove(value)
+
+    assert items == expected
+    assert all(len(block.items) >= 4 for block in items._blocks[:-1]), "Only the last block may be underfull"
+    assert len(items._blocks) <= len(items) // 4 + 1
+    assert_indexed(items)
+
+
+def test_random_operations_match_list():
+    """Test a long random mix of operations, splitting and merging small blocks, behaves like a list."""
+    generator = random.Random(0)
+    items, expected = IndexedList(load=4), []
+
+    for value in range(3000):
+        operation = generator.random()
+        if operation < 0.4 or not expected:
+            position = generator.randint(0, len(expected))
+            items.insert(position, value)
+            expected.insert(position, value)
+        elif operation < 0.7:
+            position = generator.randrange(len(expected))
+            del items[position]
+            del expected[position]
+        else:
+            source, destination = generator.randrange(len(expected)), generator.randrange(len(expected))
+            items.move(source, destination)
+            expected.insert(destination, expected.pop(source))
+        if value % 100 == 0:
+            assert items == expected
+            assert_indexed(items)
+
+    assert items == expected
+    assert [items[position] for position in range(len(expected))] == expected
+
+
+def test_membership_version(items):
+    """Test only additions and removals change the membership version."""
+    version = items.membership_version
+    items.move(0, 3)
+    items.swap(1, 2)
+    assert items.membership_version == version
+
+    items.append(60)
+    items.remove(10)
+    assert items.membership_version == version + 2
@@ -0,0 +1,81 @@
+import pytest
+
+from playlist.models.leaderboard_model import SongLeaderboard, song_leaderboard
+from playlist.models.song_model import Songs
+
+
+@pytest.fixture
+def leaderboard(monkeypatch):
+    """Fixture for the shared leaderboard, shrunk to two songs and reset."""
+    monkeypatch.setattr(song_leaderboard, "size", 2)
+    song_leaderboard.invalidate()
+    yield song_leaderboard
+    song_leaderboard.invalidate()
+
+
+@pytest.fixture
+def songs(session):
+    """Fixture for three songs with distinct play counts."""
+    songs = [
+        Songs(artist="The Beatles", title="Come Together", year=1969, genre="Rock", duration=259, play_count=5),
+        Songs(artist="Nirvana", title="Smells Like Teen Spirit", year=1991, genre="Grunge", duration=301, play_count=3),
+        Songs(artist="Queen", title="Bohemian Rhapsody", year=1975, genre="Rock", duration=354, play_count=1),
+    ]
+    session.add_all(songs)
+    session.commit()
+    return songs
+
+
+def titles(entries):
+    """Extracts the song titles from leaderboard entries."""
+    return [entry["title"] for entry in entries]
+
+
+def test_get_leaderboard(leaderboard, songs):
+    """Test the leaderboard ranks songs by play count."""
+    assert titles(leaderboard.get_leaderboard()) == ["Come Together", "Smells Like Teen Spirit"]
+    assert titles(leaderboard.get_leaderboard(limit=1, offset=1)) == ["Smells Like Teen Spirit"]
+
+
+def test_get_leaderboard_beyond_board(leaderboard, songs):
+    """Test ranks past the board size are read from the database."""
+    assert titles(leaderboard.get_leaderboard(limit=2, offset=1)) == ["Smells Like Teen Spirit", "Bohemian Rhapsody"]
+
+
+def test_leaderboard_tracks_plays_without_rescanning(leaderboard, songs, mocker):
+    """Test play count increments update ranked songs in memory."""
+    leaderboard.get_leaderboard()
+    query_top = mocker.spy(SongLeaderboard, "_query_top")
+
+    for _ in range(3):
+        songs[1].update_play_count()
+
+    assert titles(leaderboard.get_leaderboard()) == ["Smells Like Teen Spirit", "Come Together"]
+    assert leaderboard.get_leaderboard()[0]["play_count"] == 6
+    query_top.assert_not_called()
+
+
+def test_leaderboard_promotes_unranked_song(leaderboard, songs):
+    """Test a song outside the board enters it once it is played enough."""
+    leaderboard.get_leaderboard()
+
+    for _ in range(4):
+        songs[2].update_play_count()
+
+    assert titles(leaderboard.get_leaderboard()) == ["Come Together", "Bohemian Rhapsody"]
+
+
+def test_leaderboard_rebuilt_after_delete(leaderboard, songs):
+    """Test deleting a ranked song removes it from the board."""
+    leaderboard.get_leaderboard()
+
+    Songs.delete_song(songs[0].id)
+
+    assert titles(leaderboard.get_leaderboard()) == ["Smells Like Teen Spirit", "Bohemian Rhapsody"]
+
+
+@pytest.mark.parametrize("limit, offset", [(0, 0), (1, -1)])
+def test_get_leaderboard_invalid(leaderboard, limit, offset):
+    """Test invalid pagination parameters are rejected."""
+    with pytest.raises(ValueError):
+        leaderboard.get_leaderboard(limit=limit, offset=offset)
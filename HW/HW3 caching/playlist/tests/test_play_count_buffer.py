@@ -0,0 +1,129 @@
+import pytest
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import SQLAlchemyError
+
+from playlist.models.song_model import Songs
+from playlist.utils.play_count_buffer import PlayCountBuffer
+
+
+@pytest.fixture
+def songs(session):
+    """Fixture for two songs in the catalog."""
+    songs = [
+        Songs(artist="The Beatles", title="Come Together", year=1969, genre="Rock", duration=259),
+        Songs(artist="Nirvana", title="Smells Like Teen Spirit", year=1991, genre="Grunge", duration=301),
+    ]
+    session.add_all(songs)
+    session.commit()
+    return songs
+
+
+@pytest.fixture
+def buffer():
+    """Fixture for a buffer that only flushes when asked to."""
+    return PlayCountBuffer(Songs.__table__, flush_threshold=1000, flush_interval=3600)
+
+
+def play_counts(session, songs):
+    """Reads the stored play counts of the given songs."""
+    session.expire_all()
+    return [song.play_count for song in songs]
+
+
+def test_increments_are_buffered(session, songs, buffer):
+    """Test increments are held in memory until a flush."""
+    buffer.increment(songs[0].id)
+    buffer.increment(songs[0].id)
+
+    assert buffer.pending(songs[0].id) == 2
+    assert play_counts(session, songs) == [0, 0]
+
+
+def test_flush_applies_deltas(session, songs, buffer, mocker):
+    """Test a flush writes every buffered increment in one batched statement."""
+    buffer.increment(songs[0].id)
+    buffer.increment(songs[0].id)
+    buffer.increment(songs[1].id, delta=5)
+    session.expire_all()
+    execute = mocker.spy(Connection, "execute")
+
+    assert buffer.flush() == 2
+
+    execute.assert_called_once()
+    assert play_counts(session, songs) == [2, 5]
+    assert buffer.pending(songs[0].id) == 0
+
+
+def test_flush_on_threshold(session, songs, buffer):
+    """Test reaching the flush threshold writes the buffer."""
+    buffer.configure(flush_threshold=3)
+    for _ in range(3):
+        buffer.increment(songs[1].id)
+
+    assert play_counts(session, songs) == [0, 3]
+
+
+def test_increment_many(session, songs, buffer, mocker):
+    """Test several songs' increments are buffered together and flushed in one statement."""
+    buffer.configure(flush_threshold=4)
+    deltas = {songs[0].id: 1, songs[1].id: 3}
+    execute = mocker.spy(Connection, "execute")
+
+    assert buffer.increment_many(deltas) == 2
+
+    execute.assert_called_once()
+    assert play_counts(session, songs) == [1, 3]
+
+
+def test_synchronous_flush(session, songs, buffer):
+    """Test synchronous mode writes every increment immediately."""
+    buffer.configure(synchronous=True)
+
+    assert buffer.increment(songs[0].id) == 1
+    assert play_counts(session, songs) == [1, 0]
+
+
+def test_failed_flush_keeps_increments(session, songs, buffer, mocker):
+    """Test increments are restored to the buffer if the flush fails."""
+    buffer.increment(songs[0].id)
+    mocker.patch.object(Connection, "execute", side_effect=SQLAlchemyError("boom"))
+
+    with pytest.raises(SQLAlchemyError):
+        buffer.flush()
+
+    assert buffer.pending(songs[0].id) == 1
+
+
+def test_flush_leaves_session_alone(session, songs, buffer):
+    """Test a flush commits on its own connection, not the caller's pending session work."""
+    song_id = songs[0].id
+    session.add(Songs(artist="Queen", title="Bohemian Rhapsody", year=1975, genre="Rock", duration=354))
+    buffer.increment(song_id)
+
+    buffer.flush()
+    session.rollback()
+
+    assert Songs.query.filter_by(title="Bohemian Rhapsody").first() is None
+    assert play_counts(session, songs) == [1, 0]
+
+
+def test_stop_flushes(app, session, songs, buffer):
+    """Test stopping the background flusher writes the increments still buffered."""
+    buffer.start(app)
+    buffer.increment(songs[1].id, delta=2)
+
+    buffer.stop()
+
+    assert buffer.pending(songs[1].id) == 0
+    assert play_counts(session, songs) == [0, 2]
+
+
+def test_start_registers_one_exit_hook(app, buffer, mocker):
+    """Test stop() is registered with atexit once, however often the flusher is started."""
+    register = mocker.patch("playlist.utils.play_count_buffer.atexit.register")
+
+    buffer.start(app)
+    buffer.start(app)
+    buffer.stop()
+
+    register.assert_called_once_with(buffer.stop)
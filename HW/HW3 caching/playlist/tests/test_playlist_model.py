@@ -50,7 +50,7 @@ def sample_playlist(song_beatles, song_nirvana):
 
 def test_add_song_to_playlist(playlist_model, song_beatles, mocker):
     """Test adding a song to the playlist."""
-    mocker.patch("playlist.models.playlist_model.Songs.get_song_by_id", return_value=song_beatles)
+    mocker.patch("playlist.models.playlist_model.Songs.get_song_snapshot", return_value=song_beatles)
     playlist_model.add_song_to_playlist(1)
     assert len(playlist_model.playlist) == 1
     assert playlist_model.playlist[0] == 1
@@ -58,7 +58,7 @@ def test_add_song_to_playlist(playlist_model, song_beatles, mocker):
 
 def test_add_duplicate_song_to_playlist(playlist_model, song_beatles, mocker):
     """Test error when adding a duplicate song to the playlist by ID."""
-    mocker.patch("playlist.models.playlist_model.Songs.get_song_by_id", side_effect=[song_beatles] * 2)
+    mocker.patch("playlist.models.playlist_model.Songs.get_song_snapshot", side_effect=[song_beatles] * 2)
     playlist_model.add_song_to_playlist(1)
     with pytest.raises(ValueError, match="Song with ID 1 already exists in the playlist"):
         playlist_model.add_song_to_playlist(1)
@@ -66,7 +66,7 @@ def test_add_duplicate_song_to_playlist(playlist_model, song_beatles, mocker):
 
 def test_remove_song_from_playlist_by_song_id(playlist_model, mocker):
     """Test removing a song from the playlist by song_id."""
-    mocker.patch("playlist.models.playlist_model.Songs.get_song_by_id", return_value=song_beatles)
+    mocker.patch("playlist.models.playlist_model.Songs.get_song_snapshot", return_value=song_beatles)
 
     playlist_model.playlist = [1,2]
 
@@ -100,7 +100,7 @@ def test_clear_playlist(playlist_model):
 
 def test_move_song_to_track_number(playlist_model, sample_playlist, mocker):
     """Test moving a song to a specific track number in the playlist."""
-    mocker.patch("playlist.models.playlist_model.Songs.get_song_by_id", side_effect=sample_playlist)
+    mocker.patch("playlist.models.playlist_model.Songs.get_song_snapshot", side_effect=sample_playlist)
 
     playlist_model.playlist.extend([1, 2])
 
@@ -111,7 +111,7 @@ def test_move_song_to_track_number(playlist_model, sample_playlist, mocker):
 
 def test_swap_songs_in_playlist(playlist_model, sample_playlist, mocker):
     """Test swapping the positions of two songs in the playlist."""
-    mocker.patch("playlist.models.playlist_model.Songs.get_song_by_id", side_effect=sample_playlist)
+    mocker.patch("playlist.models.playlist_model.Songs.get_song_snapshot", side_effect=sample_playlist)
 
     playlist_model.playlist.extend([1, 2])
 
@@ -120,9 +120,29 @@ def test_swap_songs_in_playlist(playlist_model, sample_playlist, mocker):
     assert playlist_model.playlist[1] == 1, "Expected Song 1 to be in the second position"
 
 
+def test_playlist_version_bumped_on_changes(playlist_model, sample_playlist, mocker):
+    """Test every change to the playlist's songs or order bumps its version."""
+    mocker.patch("playlist.models.playlist_model.Songs.get_song_snapshot", side_effect=sample_playlist * 5)
+    versions = [playlist_model.version.value]
+
+    for change in [
+        lambda: playlist_model.add_song_to_playlist(1),
+        lambda: playlist_model.add_song_to_playlist(2),
+        lambda: playlist_model.move_song_to_end(1),
+        lambda: playlist_model.swap_songs_in_playlist(1, 2),
+        lambda: playlist_model.clear_playlist(),
+    ]:
+        change()
+        versions.append(playlist_model.version.value)
+
+    assert versions == sorted(set(versions))
+    playlist_model.get_playlist_length()
+    assert playlist_model.version.value == versions[-1]
+
+
 def test_swap_song_with_itself(playlist_model, song_beatles, mocker):
     """Test swapping the position of a song with itself raises an error."""
-    mocker.patch("playlist.models.playlist_model.Songs.get_song_by_id", side_effect=[song_beatles] * 2)
+    mocker.patch("playlist.models.playlist_model.Songs.get_song_snapshot", side_effect=[song_beatles] * 2)
     playlist_model.playlist.append(1)
 
     with pytest.raises(ValueError, match="Cannot swap a song with itself"):
@@ -131,7 +151,7 @@ def test_swap_song_with_itself(playlist_model, song_beatles, mocker):
 
 def test_move_song_to_end(playlist_model, sample_playlist, mocker):
     """Test moving a song to the end of the playlist."""
-    mocker.patch("playlist.models.playlist_model.Songs.get_song_by_id", side_effect=sample_playlist)
+    mocker.patch("playlist.models.playlist_model.Songs.get_song_snapshot", side_effect=sample_playlist)
 
     playlist_model.playlist.extend([1, 2])
 
@@ -141,7 +161,7 @@ def test_move_song_to_end(playlist_model, sample_playlist, mocker):
 
 def test_move_song_to_beginning(playlist_model, sample_playlist, mocker):
     """Test moving a song to the beginning of the playlist."""
-    mocker.patch("playlist.models.playlist_model.Songs.get_song_by_id", side_effect=sample_playlist)
+    mocker.patch("playlist.models.playlist_model.Songs.get_song_snapshot", side_effect=sample_playlist)
 
     playlist_model.playlist.extend([1, 2])
 
@@ -156,7 +176,7 @@ def test_move_song_to_beginning(playlist_model, sample_playlist, mocker):
 
 def test_get_song_by_track_number(playlist_model, song_beatles, mocker):
     """Test successfully retrieving a song from the playlist by track number."""
-    mocker.patch("playlist.models.playlist_model.Songs.get_song_by_id", return_value=song_beatles)
+    mocker.patch("playlist.models.playlist_model.Songs.get_song_snapshot", return_value=song_beatles)
     playlist_model.playlist.append(1)
 
     retrieved_song = playlist_model.get_song_by_track_number(1)
@@ -170,7 +190,7 @@ def test_get_song_by_track_number(playlist_model, song_beatles, mocker):
 
 def test_get_all_songs(playlist_model, sample_playlist, mocker):
     """Test successfully retrieving all songs from the playlist."""
-    mocker.patch("playlist.models.playlist_model.PlaylistModel._get_song_from_cache_or_db", side_effect=sample_playlist)
+    mocker.patch("playlist.models.playlist_model.PlaylistModel._get_songs_from_cache_or_db", return_value=sample_playlist)
 
     playlist_model.playlist.extend([1, 2])
 
@@ -183,7 +203,7 @@ def test_get_all_songs(playlist_model, sample_playlist, mocker):
 
 def test_get_song_by_song_id(playlist_model, song_beatles, mocker):
     """Test successfully retrieving a song from the playlist by song ID."""
-    mocker.patch("playlist.models.playlist_model.Songs.get_song_by_id", return_value=song_beatles)
+    mocker.patch("playlist.models.playlist_model.Songs.get_song_snapshot", return_value=song_beatles)
     playlist_model.playlist.append(1)
 
     retrieved_song = playlist_model.get_song_by_song_id(1)
@@ -198,7 +218,7 @@ def test_get_song_by_song_id(playlist_model, song_beatles, mocker):
 
 def test_get_current_song(playlist_model, song_beatles, mocker):
     """Test successfully retrieving the current song from the playlist."""
-    mocker.patch("playlist.models.playlist_model.Songs.get_song_by_id", return_value=song_beatles)
+    mocker.patch("playlist.models.playlist_model.Songs.get_song_snapshot", return_value=song_beatles)
 
     playlist_model.playlist.append(1)
 
@@ -211,6 +231,14 @@ def test_get_current_song(playlist_model, song_beatles, mocker):
     assert current_song.genre == 'Rock'
 
 
+def test_get_all_songs_missing_song(playlist_model, sample_playlist):
+    """Test retrieving the playlist fails if one of its songs no longer exists."""
+    playlist_model.playlist.extend([song.id for song in sample_playlist] + [999])
+
+    with pytest.raises(ValueError, match="Song ID 999 not found in database"):
+        playlist_model.get_all_songs()
+
+
 def test_get_playlist_length(playlist_model):
     """Test getting the length of the playlist."""
     playlist_model.playlist.extend([1, 2])
@@ -219,11 +247,40 @@ def test_get_playlist_length(playlist_model):
 
 def test_get_playlist_duration(playlist_model, sample_playlist, mocker):
     """Test getting the total duration of the playlist."""
-    mocker.patch("playlist.models.playlist_model.PlaylistModel._get_song_from_cache_or_db", side_effect=sample_playlist)
+    mocker.patch("playlist.models.playlist_model.PlaylistModel._get_songs_from_cache_or_db", return_value=sample_playlist)
     playlist_model.playlist.extend([1, 2])
     assert playlist_model.get_playlist_duration() == 560, "Expected playlist duration to be 560 seconds"
 
 
+def test_running_playlist_duration(playlist_model, song_beatles, song_nirvana, mocker):
+    """Test the running duration follows adds, removals, song refreshes and clears."""
+    playlist_model.add_song_to_playlist(song_beatles.id)
+    playlist_model.add_song_to_playlist(song_nirvana.id)
+
+    lookups = mocker.spy(Songs, "get_cached_songs_by_ids")
+    assert playlist_model.get_playlist_duration() == 560
+    lookups.assert_not_called()
+
+    Songs.create_song("The Beatles", "Come Together", 1969, "Rock", 300, upsert=True)
+    playlist_model.get_all_songs()
+    assert playlist_model.get_playlist_duration() == 601
+    assert playlist_model.check_duration_consistency()
+
+    playlist_model.remove_song_by_track_number(1)
+    assert playlist_model.get_playlist_duration() == 301
+    playlist_model.clear_playlist()
+    assert playlist_model.get_playlist_duration() == 0
+
+
+def test_running_playlist_duration_after_direct_change(playlist_model, song_beatles, song_nirvana):
+    """Test the running duration is rebuilt when the playlist list is modified directly."""
+    playlist_model.add_song_to_playlist(song_beatles.id)
+    playlist_model.playlist.append(song_nirvana.id)
+
+    assert playlist_model.get_playlist_duration() == 560
+    assert playlist_model.check_duration_consistency()
+
+
 ##################################################
 # Utility Function Test Cases
 ##################################################
@@ -276,12 +333,37 @@ def test_validate_song_id_invalid_id(playlist_model):
 
 def test_validate_song_id_not_in_playlist(playlist_model, song_nirvana, mocker):
     """Test validate_song_id raises error for song ID not in the playlist."""
-    mocker.patch("playlist.models.playlist_model.Songs.get_song_by_id", return_value=song_nirvana)
+    mocker.patch("playlist.models.playlist_model.Songs.get_song_snapshot", return_value=song_nirvana)
     playlist_model.playlist.append(1)
     with pytest.raises(ValueError, match="Song with id 2 not found in playlist"):
         playlist_model.validate_song_id(2)
 
 
+def test_reorders_skip_song_lookups(playlist_model, mocker):
+    """Test reordering songs already in the playlist does not look them up again."""
+    lookup = mocker.patch("playlist.models.playlist_model.PlaylistModel._get_song_from_cache_or_db")
+    playlist_model.playlist.extend([1, 2, 3])
+
+    playlist_model.move_song_to_beginning(3)
+    playlist_model.move_song_to_end(1)
+    playlist_model.move_song_to_track_number(2, 1)
+    playlist_model.swap_songs_in_playlist(2, 1)
+    playlist_model.remove_song_by_song_id(3)
+
+    assert playlist_model.playlist == [1, 2]
+    lookup.assert_not_called()
+
+
+def test_validate_song_ids(playlist_model, sample_playlist):
+    """Test validating several song IDs checks each against the playlist."""
+    song_ids = [song.id for song in sample_playlist]
+    playlist_model.playlist.extend(song_ids)
+
+    assert playlist_model.validate_song_ids(song_ids) == song_ids
+    with pytest.raises(ValueError, match="Song with id 999 not found in playlist"):
+        playlist_model.validate_song_ids(song_ids + [999])
+
+
 def test_validate_track_number(playlist_model):
     """Test validate_track_number does not raise error for valid track number."""
     playlist_model.playlist.append(1)
@@ -312,7 +394,7 @@ def test_validate_track_number_invalid(playlist_model, track_number, expected_er
 def test_play_current_song(playlist_model, sample_playlist, mocker):
     """Test playing the current song."""
     mock_update_play_count = mocker.patch("playlist.models.playlist_model.Songs.update_play_count")
-    mocker.patch("playlist.models.playlist_model.Songs.get_song_by_id", side_effect=sample_playlist)
+    mocker.patch("playlist.models.playlist_model.Songs.get_song_snapshot", side_effect=sample_playlist)
 
     playlist_model.playlist.extend([1, 2])
 
@@ -363,16 +445,16 @@ def test_go_to_random_track(playlist_model, mocker):
 
 def test_play_entire_playlist(playlist_model, sample_playlist, mocker):
     """Test playing the entire playlist."""
-    mock_update_play_count = mocker.patch("playlist.models.playlist_model.Songs.update_play_count")
-    mocker.patch("playlist.models.playlist_model.PlaylistModel._get_song_from_cache_or_db", side_effect=sample_playlist)
+    mock_update_play_counts = mocker.patch("playlist.models.playlist_model.Songs.update_play_counts")
+    mocker.patch("playlist.models.playlist_model.PlaylistModel._get_songs_from_cache_or_db", return_value=sample_playlist)
 
     playlist_model.playlist.extend([1,2])
 
-    playlist_model.play_entire_playlist()
+    summary = playlist_model.play_entire_playlist()
 
-    # Check that all play counts were updated
-    mock_update_play_count.assert_any_call()
-    assert mock_update_play_count.call_count == len(playlist_model.playlist)
+    # Check that all play counts were updated in one batch
+    mock_update_play_counts.assert_called_once_with([1, 2])
+    assert summary == {"first_track": 1, "tracks_played": 2, "duration": 259 + 301, "current_track_number": 1}
 
     # Check that the current track number was updated back to the first song
     assert playlist_model.current_track_number == 1, "Expected to loop back to the beginning of the playlist"
@@ -382,16 +464,64 @@ def test_play_rest_of_playlist(playlist_model, sample_playlist, mocker):
     """Test playing from the current position to the end of the playlist.
 
     """
-    mock_update_play_count = mocker.patch("playlist.models.playlist_model.Songs.update_play_count")
-    mocker.patch("playlist.models.playlist_model.PlaylistModel._get_song_from_cache_or_db", side_effect=sample_playlist)
+    mock_update_play_counts = mocker.patch("playlist.models.playlist_model.Songs.update_play_counts")
+    mocker.patch("playlist.models.playlist_model.PlaylistModel._get_songs_from_cache_or_db", return_value=sample_playlist[1:])
 
     playlist_model.playlist.extend([1, 2])
     playlist_model.current_track_number = 2
 
-    playlist_model.play_rest_of_playlist()
+    summary = playlist_model.play_rest_of_playlist()
 
     # Check that play counts were updated for the remaining songs
-    mock_update_play_count.assert_any_call()
-    assert mock_update_play_count.call_count == 1
+    mock_update_play_counts.assert_called_once_with([2])
+    assert summary["tracks_played"] == 1
+
+    assert playlist_model.current_track_number == 1, "Expected to loop back to the beginning of the playlist"
+
+
+def test_play_entire_playlist_updates_play_counts(playlist_model, session, sample_playlist):
+    """Test batch playback increments every song's stored play count."""
+    playlist_model.playlist.extend([song.id for song in sample_playlist])
+
+    playlist_model.play_entire_playlist()
+    playlist_model.play_rest_of_playlist()
+
+    session.expire_all()
+    assert [song.play_count for song in sample_playlist] == [2, 2]
+
+
+def test_apply_operations(playlist_model, sample_playlist, mocker):
+    """Test a batch of operations is applied in order, validating added songs in one lookup."""
+    beatles, nirvana = (song.id for song in sample_playlist)
+    lookup = mocker.spy(Songs, "get_cached_songs_by_ids")
+
+    summary = playlist_model.apply_operations([
+        {"op": "add", "song_id": beatles},
+        {"op": "add", "song_id": nirvana},
+        {"op": "move", "song_id": nirvana, "track_number": 1},
+        {"op": "swap", "song_id": nirvana, "other_song_id": beatles},
+        {"op": "remove", "song_id": nirvana},
+    ])
+
+    assert summary == {"operations": 5, "added": 1, "removed": 0, "playlist_length": 1}
+    assert playlist_model.playlist == [beatles]
+    assert playlist_model.get_playlist_duration() == 259
+    lookup.assert_called_once_with([beatles, nirvana])
+
+
+@pytest.mark.parametrize("operations, message", [
+    ([{"op": "add", "song_id": 999}], r"Songs with ids \[999\] not found in database"),
+    ([{"op": "remove", "song_id": 999}], r"Operation 2 \(remove\) failed"),
+    ([{"op": "move", "song_id": 1}], "missing: track_number"),
+    ([{"op": "shuffle", "song_id": 1}], "unknown op"),
+])
+def test_apply_operations_invalid(playlist_model, sample_playlist, operations, message):
+    """Test an invalid operation rejects the whole batch and leaves the playlist unchanged."""
+    playlist_model.playlist = [song.id for song in sample_playlist]
+    version = playlist_model.version.value
+
+    with pytest.raises(ValueError, match=message):
+        playlist_model.apply_operations([{"op": "swap", "song_id": 1, "other_song_id": 2}] + operations)
 
-    assert playlist_model.current_track_number == 1, "Expected to loop back to the beginning of the playlist"
\ No newline at end of file
+    assert playlist_model.playlist == [song.id for song in sample_playlist]
+    assert playlist_model.version.value == version
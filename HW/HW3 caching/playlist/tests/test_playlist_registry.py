@@ -0,0 +1,137 @@
+import threading
+import time
+
+import pytest
+
+from playlist.models.playlist_registry import PlaylistRegistry
+from playlist.models.playlist_store import SQLitePlaylistStore
+from playlist.models.song_model import Songs
+
+
+@pytest.fixture
+def registry():
+    """Fixture for a registry that drops playlists after a minute."""
+    return PlaylistRegistry(idle_seconds=60)
+
+
+def test_checkout_per_user(registry):
+    """Test each user gets their own playlist, kept across checkouts."""
+    with registry.checkout(1) as playlist:
+        playlist.playlist.append(10)
+    with registry.checkout(2) as other:
+        assert other.get_playlist_length() == 0
+    with registry.checkout(1) as again:
+        assert again is playlist
+
+    assert len(registry) == 2
+
+
+def test_checkout_serializes_a_users_requests(registry):
+    """Test a second checkout for the same user waits until the first is released."""
+    entered = threading.Event()
+    release = threading.Event()
+    order = []
+
+    def first():
+        with registry.checkout(1):
+            entered.set()
+            release.wait(5)
+            order.append("first")
+
+    def second():
+        with registry.checkout(1):
+            order.append("second")
+
+    threads = [threading.Thread(target=first), threading.Thread(target=second)]
+    threads[0].start()
+    assert entered.wait(5)
+    threads[1].start()
+    time.sleep(0.05)
+    with registry.checkout(2):
+        pass  # Other users are not blocked
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert order == ["first", "second"]
+
+
+def test_idle_playlists_are_dropped(registry, mocker):
+    """Test playlists unused for idle_seconds are dropped, but not while checked out."""
+    monotonic = mocker.patch("playlist.models.playlist_registry.time.monotonic", return_value=100.0)
+    with registry.checkout(1):
+        pass
+    with registry.checkout(2) as held:
+        monotonic.return_value = 200.0
+        assert registry.evict_idle() == 1
+    assert registry.stats() == {"size": 1, "active": 0, "evictions": 1}
+
+    with registry.checkout(2) as playlist:
+        assert playlist is held
+
+
+def test_discard_during_checkout(registry):
+    """Test a playlist discarded while checked out is not replaced until its checkouts are released."""
+    entered = threading.Event()
+    release = threading.Event()
+    seen = []
+
+    def holder():
+        with registry.checkout(1) as playlist:
+            seen.append(playlist)
+            entered.set()
+            release.wait(5)
+
+    def waiter():
+        with registry.checkout(1) as playlist:
+            seen.append(playlist)
+
+    threads = [threading.Thread(target=holder), threading.Thread(target=waiter)]
+    threads[0].start()
+    assert entered.wait(5)
+    registry.discard(1)
+    threads[1].start()
+    time.sleep(0.05)
+    assert len(seen) == 1, "The second checkout should wait for the first, not get a new playlist"
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert seen[0] is seen[1]
+    assert len(registry) == 0
+    with registry.checkout(1) as fresh:
+        assert fresh is not seen[0]
+
+
+@pytest.mark.parametrize("store", [None, SQLitePlaylistStore()], ids=["memory", "sqlite"])
+def test_deleted_song_is_removed_from_playlists(session, store):
+    """Test deleting a song that is in playlists drops it from them and from their running duration."""
+    registry = PlaylistRegistry(idle_seconds=60, store=store)
+    songs = [Songs(artist="Artist", title=f"Title {n}", year=2000, genre="Rock", duration=100 + n) for n in range(2)]
+    session.add_all(songs)
+    session.commit()
+    kept, deleted = (song.id for song in songs)
+
+    for user_id in (1, 2):
+        with registry.checkout(user_id) as playlist:
+            playlist.add_song_to_playlist(kept)
+            playlist.add_song_to_playlist(deleted)
+            assert playlist.get_playlist_duration() == 201
+    if store is not None:
+        store.place(3, deleted, None, None)  # A user whose playlist is not held here
+
+    Songs.delete_song(deleted)
+    assert registry.remove_song(deleted) == (3 if store else 2)
+
+    for user_id in (1, 2):
+        with registry.checkout(user_id) as playlist:
+            assert playlist.get_playlist_duration() == 100
+            assert [song.id for song in playlist.get_all_songs()] == [kept]
+    if store is not None:
+        assert store.load(3).song_ids == []
+
+
+def test_invalid_idle_seconds():
+    """Test a non-positive idle timeout is rejected."""
+    with pytest.raises(ValueError):
+        PlaylistRegistry(idle_seconds=0)
@@ -0,0 +1,177 @@
+import pytest
+from sqlalchemy import text
+
+from playlist.models import playlist_store
+from playlist.models.playlist_model import PlaylistModel
+from playlist.models.playlist_store import PlaylistEntry, PlaylistStore, RedisPlaylistStore, SQLitePlaylistStore
+from playlist.models.song_model import Songs
+from playlist.utils.etag_utils import make_etag
+
+
+@pytest.fixture
+def store(session):
+    """Fixture for a playlist store backed by the test database."""
+    return SQLitePlaylistStore()
+
+
+@pytest.fixture
+def song_ids(session):
+    """Fixture for the IDs of four catalog songs."""
+    songs = [
+        Songs(artist=f"Artist {n}", title=f"Title {n}", year=2000 + n, genre="Rock", duration=100 + n)
+        for n in range(4)
+    ]
+    session.add_all(songs)
+    session.commit()
+    return [song.id for song in songs]
+
+
+def positions(owner):
+    """Returns the stored ordering key of each of owner's songs."""
+    return {entry.song_id: entry.position for entry in PlaylistEntry.query.filter_by(owner=str(owner))}
+
+
+def test_place_remove_and_swap(store):
+    """Test tracks are stored in order and each change bumps the version."""
+    assert store.place(1, 10, None, None) == 1
+    store.place(1, 20, 10, None)
+    store.place(1, 30, None, 10)
+    store.place(1, 20, 30, 10)
+    assert store.load(1).song_ids == [30, 20, 10]
+
+    store.swap(1, 30, 10)
+    store.remove(1, 20)
+    assert store.load(1) == ([10, 30], 1, 6)
+    assert store.load(2) == ([], 1, 0)
+
+
+def test_version_is_incremented_in_the_database(store, session):
+    """Test each write increments the stored version rather than one read earlier."""
+    store.place(1, 10, None, None)
+    session.execute(text("UPDATE PlaylistHeads SET version = 5 WHERE owner = '1'"))
+    session.commit()  # Another process writing in between
+
+    assert store.remove(1, 10) == 6
+    assert store.head(1) == (6, 1)
+
+
+def test_writes_leave_the_session_alone(store, session, mocker):
+    """Test the store writes on its own connection, never committing or rolling back the caller's session."""
+    commit = mocker.spy(session, "commit")
+    rollback = mocker.spy(session, "rollback")
+
+    store.replace(1, [10, 20], 1)
+    store.place(1, 30, 10, 20)
+    store.swap(1, 10, 20)
+    store.set_current_track(1, 2)
+    store.remove(1, 30)
+
+    assert store.load(1) == ([20, 10], 2, 4)
+    commit.assert_not_called()
+    rollback.assert_not_called()
+
+
+def test_store_is_abstract():
+    """Test a store must implement every operation."""
+    with pytest.raises(TypeError):
+        PlaylistStore()
+
+
+def test_move_writes_one_row(store):
+    """Test moving a track changes only its own ordering key."""
+    store.replace(1, [10, 20, 30, 40], 1)
+    before = positions(1)
+
+    store.place(1, 40, 10, 20)
+
+    after = positions(1)
+    assert [song_id for song_id in before if before[song_id] != after[song_id]] == [40]
+    assert store.load(1).song_ids == [10, 40, 20, 30]
+
+
+def test_place_respaces_when_keys_run_out(store, monkeypatch):
+    """Test tracks are respaced once two neighbours' keys are adjacent."""
+    monkeypatch.setattr(playlist_store, "POSITION_GAP", 2)
+    store.replace(1, [10, 20], 1)
+
+    store.place(1, 30, 10, 20)
+    store.place(1, 40, 10, 30)
+
+    assert store.load(1).song_ids == [10, 40, 30, 20]
+
+
+def test_model_persists_changes(store, song_ids):
+    """Test a playlist written through the store is reloaded by a fresh model."""
+    model = PlaylistModel(store=store, owner=7)
+    for song_id in song_ids:
+        model.add_song_to_playlist(song_id)
+    model.move_song_to_beginning(song_ids[3])
+    model.swap_songs_in_playlist(song_ids[0], song_ids[1])
+    model.remove_song_by_track_number(4)
+    model.go_to_track_number(2)
+
+    reloaded = PlaylistModel(store=store, owner=7)
+    assert list(reloaded.playlist) == [song_ids[3], song_ids[1], song_ids[0]]
+    assert reloaded.current_track_number == 2
+    assert reloaded.get_playlist_duration() == model.get_playlist_duration()
+
+
+def test_model_sync_picks_up_other_writers(store, song_ids):
+    """Test sync() reloads the playlist only after another model changed it."""
+    mine = PlaylistModel(store=store, owner=7)
+    theirs = PlaylistModel(store=store, owner=7)
+    theirs.add_song_to_playlist(song_ids[0])
+    theirs.add_song_to_playlist(song_ids[1])
+
+    version = mine.version.value
+    mine.sync()
+    assert list(mine.playlist) == song_ids[:2]
+    assert mine.version.value > version
+    assert make_etag(mine.version) == make_etag(theirs.version), "Workers sharing a store should agree on ETags"
+
+    theirs.go_to_track_number(2)
+    version = mine.version.value
+    mine.sync()
+    assert mine.current_track_number == 2
+    assert mine.version.value == version
+
+
+def test_clear_all(store):
+    """Test every owner's playlist can be deleted."""
+    store.replace(1, [10], 1)
+    store.replace(2, [20], 1)
+    store.clear_all()
+    assert store.load(1) == ([], 1, 0)
+    assert store.load(2) == ([], 1, 0)
+
+
+def test_remove_song_everywhere(store):
+    """Test a song is removed from every playlist holding it, bumping only their versions."""
+    store.replace(1, [10, 20], 1)
+    store.replace(2, [20], 1)
+    store.replace(3, [30], 1)
+
+    assert store.remove_song_everywhere(20) == 2
+    assert store.load(1) == ([10], 1, 2)
+    assert store.load(2) == ([], 1, 2)
+    assert store.load(3) == ([30], 1, 1)
+
+
+def test_redis_store():
+    """Test the Redis store against an in-process Redis server."""
+    fakeredis = pytest.importorskip("fakeredis")
+    store = RedisPlaylistStore(fakeredis.FakeRedis())
+
+    store.replace(1, [10, 20, 30], 2)
+    store.place(1, 30, None, 10)
+    store.swap(1, 10, 20)
+    store.remove(1, 30)
+
+    assert store.load(1) == ([20, 10], 2, 4)
+    assert store.head(1) == (4, 2)
+    store.replace(2, [30], 1)
+    assert store.remove_song_everywhere(20) == 1
+    assert store.load(1) == ([10], 2, 5)
+    assert store.load(2) == ([30], 1, 1)
+    store.clear_all()
+    assert store.load(1) == ([], 1, 0)
@@ -1,6 +1,10 @@
+from collections import Counter
+import random
+
 import pytest
+from sqlalchemy.exc import IntegrityError
 
-from playlist.models.song_model import Songs
+from playlist.models.song_model import SongSnapshot, Songs, catalog_version, iter_songs_from_csv, song_cache
 
 
 # --- Fixtures ---
@@ -38,6 +42,25 @@ def test_create_duplicate_song(session, song_beatles):
         Songs.create_song("The Beatles", "Hey Jude", 1968, "Rock", 431)
 
 
+def test_duplicate_song_rejected_by_database(session, song_beatles):
+    """Test the unique (artist, title, year) constraint is enforced by the database."""
+    session.add(Songs(artist="The Beatles", title="Hey Jude", year=1968, genre="Pop", duration=100))
+    with pytest.raises(IntegrityError):
+        session.commit()
+    session.rollback()
+
+
+def test_create_song_upsert(session, song_beatles):
+    """Test upserting an existing song updates it in place."""
+    Songs.create_song("The Beatles", "Hey Jude", 1968, "Pop", 425, upsert=True)
+    Songs.create_song("Queen", "Bohemian Rhapsody", 1975, "Rock", 354, upsert=True)
+
+    session.expire_all()
+    song = Songs.get_song_by_compound_key("The Beatles", "Hey Jude", 1968)
+    assert (song.id, song.genre, song.duration) == (song_beatles.id, "Pop", 425)
+    assert session.query(Songs).count() == 2
+
+
 @pytest.mark.parametrize("artist, title, year, genre, duration", [
     ("", "Valid Title", 2000, "Pop", 180),
     ("Valid Artist", "", 2000, "Pop", 180),
@@ -51,6 +74,36 @@ def test_create_song_invalid_data(artist, title, year, genre, duration):
         Songs.create_song(artist, title, year, genre, duration)
 
 
+# --- Bulk Create ---
+
+def test_bulk_create(session, song_beatles):
+    """Test bulk creating songs reports created, duplicate and invalid rows."""
+    report = Songs.bulk_create([
+        {"artist": "Queen", "title": "Bohemian Rhapsody", "year": 1975, "genre": "Rock", "duration": 354},
+        {"artist": "The Beatles", "title": "Hey Jude", "year": 1968, "genre": "Rock", "duration": 431},
+        {"artist": "Queen", "title": "Bohemian Rhapsody", "year": 1975, "genre": "Rock", "duration": 354},
+        {"artist": "Queen", "title": "Under Pressure", "year": 1899, "genre": "Rock", "duration": 248},
+        {"artist": "Queen", "title": "Radio Ga Ga"},
+    ], chunk_size=2)
+
+    assert [result["status"] for result in report] == ["created", "duplicate", "duplicate", "invalid", "invalid"]
+    assert [result["row"] for result in report] == [1, 2, 3, 4, 5]
+    assert session.query(Songs).count() == 2
+
+
+def test_iter_songs_from_csv(session):
+    """Test CSV uploads are parsed into song dictionaries for bulk creation."""
+    stream = [
+        b"artist,title,year,genre,duration\n",
+        b"Queen,Bohemian Rhapsody,1975,Rock,354\n",
+        b"Queen,Under Pressure,not-a-year,Rock,248\n",
+    ]
+    report = Songs.bulk_create(iter_songs_from_csv(stream))
+
+    assert [result["status"] for result in report] == ["created", "invalid"]
+    assert Songs.get_song_by_compound_key("Queen", "Bohemian Rhapsody", 1975).duration == 354
+
+
 # --- Get Song ---
 
 def test_get_song_by_id(song_beatles):
@@ -64,6 +117,85 @@ def test_get_song_by_id_not_found(app):
         Songs.get_song_by_id(999)
 
 
+def test_get_cached_song_by_id(session, song_beatles, mocker):
+    """Test songs fetched by ID are cached as detached snapshots and reused on repeat lookups."""
+    get_song_snapshot = mocker.spy(Songs, "get_song_snapshot")
+
+    song = Songs.get_cached_song_by_id(song_beatles.id)
+    session.remove()
+
+    assert isinstance(song, SongSnapshot)
+    assert Songs.get_cached_song_by_id(song_beatles.id) is song
+    assert song.to_dict()["title"] == "Hey Jude"
+    assert get_song_snapshot.call_count == 1
+
+
+def test_get_cached_song_by_compound_key(song_nirvana, mocker):
+    """Test songs fetched by compound key are cached and shared with lookups by ID."""
+    get_song_snapshot_by_compound_key = mocker.spy(Songs, "get_song_snapshot_by_compound_key")
+    get_song_snapshot = mocker.spy(Songs, "get_song_snapshot")
+
+    Songs.get_cached_song_by_compound_key("Nirvana", "Smells Like Teen Spirit", 1991)
+    song = Songs.get_cached_song_by_compound_key("Nirvana", "Smells Like Teen Spirit", 1991)
+    Songs.get_cached_song_by_id(song.id)
+
+    assert song.genre == "Grunge"
+    assert get_song_snapshot_by_compound_key.call_count == 1
+    get_song_snapshot.assert_not_called()
+
+
+def test_cached_song_invalidated_at_commit(session, song_beatles):
+    """Test a song cached again between the flush and the commit of an update is dropped at the commit."""
+    stale = Songs.get_cached_song_by_id(song_beatles.id)
+    song_beatles.genre = "Pop"
+    session.flush()
+    song_cache.set(("id", song_beatles.id), stale)  # As a concurrent reader of the committed row would
+
+    session.commit()
+
+    assert Songs.get_cached_song_by_id(song_beatles.id).genre == "Pop"
+
+
+def test_get_cached_songs_by_ids(session, song_beatles, song_nirvana, mocker):
+    """Test uncached songs are loaded together in one query and cached."""
+    Songs.get_cached_song_by_id(song_beatles.id)
+    get_song_snapshots = mocker.spy(Songs, "get_song_snapshots")
+
+    songs = Songs.get_cached_songs_by_ids([song_nirvana.id, song_beatles.id, 999])
+
+    assert {song_id: song.title for song_id, song in songs.items()} == {
+        song_beatles.id: "Hey Jude", song_nirvana.id: "Smells Like Teen Spirit"
+    }
+    get_song_snapshots.assert_called_once_with([song_nirvana.id, 999])
+
+    Songs.get_cached_songs_by_ids([song_nirvana.id, song_beatles.id])
+    assert get_song_snapshots.call_count == 1
+
+
+def test_get_song_snapshot_not_found(app):
+    """Test snapshot loaders raise for songs that do not exist."""
+    with pytest.raises(ValueError, match="not found"):
+        Songs.get_song_snapshot(999)
+    with pytest.raises(ValueError, match="not found"):
+        Songs.get_song_snapshot_by_compound_key("Ghost", "Invisible Song", 2024)
+
+
+def test_cached_song_invalidated(session, song_beatles):
+    """Test cached songs are dropped when they are played, upserted or deleted."""
+    Songs.get_cached_song_by_id(song_beatles.id)
+    song_beatles.update_play_count()
+    assert Songs.get_cached_song_by_id(song_beatles.id).play_count == 1
+
+    Songs.create_song("The Beatles", "Hey Jude", 1968, "Pop", 425, upsert=True)
+    assert Songs.get_cached_song_by_compound_key("The Beatles", "Hey Jude", 1968).genre == "Pop"
+
+    Songs.delete_song(song_beatles.id)
+    with pytest.raises(ValueError, match="not found"):
+        Songs.get_cached_song_by_id(song_beatles.id)
+    with pytest.raises(ValueError, match="not found"):
+        Songs.get_cached_song_by_compound_key("The Beatles", "Hey Jude", 1968)
+
+
 def test_get_song_by_compound_key(song_nirvana):
     """Test fetching a song by compound key."""
     song = Songs.get_song_by_compound_key("Nirvana", "Smells Like Teen Spirit", 1991)
@@ -75,6 +207,32 @@ def test_get_song_by_compound_key_not_found(app):
         Songs.get_song_by_compound_key("Ghost", "Invisible Song", 2024)
 
 
+def test_catalog_version_bumped_on_writes(session, song_beatles):
+    """Test creating, playing and deleting songs each change the catalog version."""
+    versions = [catalog_version.value]
+
+    Songs.create_song("Queen", "Bohemian Rhapsody", 1975, "Rock", 354)
+    versions.append(catalog_version.value)
+    song_beatles.update_play_count()
+    versions.append(catalog_version.value)
+    Songs.delete_song(song_beatles.id)
+    versions.append(catalog_version.value)
+
+    assert versions == sorted(set(versions))
+
+
+def test_catalog_version_read_is_cached(session, song_beatles, mocker):
+    """Test repeated reads of the catalog version reuse the cached value until a write commits."""
+    version = catalog_version.value
+    execute = mocker.spy(session, "execute")
+
+    assert catalog_version.value == version
+    execute.assert_not_called()
+
+    Songs.create_song("Queen", "Bohemian Rhapsody", 1975, "Rock", 354)
+    assert catalog_version.value > version
+
+
 # --- Delete Song ---
 
 def test_delete_song_by_id(session, song_beatles):
@@ -98,6 +256,28 @@ def test_update_play_count(session, song_nirvana):
     assert song_nirvana.play_count == 1
 
 
+def test_update_play_count_deleted_song(session, song_nirvana):
+    """Test incrementing the play count of a song that no longer exists."""
+    Songs.delete_song(song_nirvana.id)
+    with pytest.raises(ValueError, match="not found"):
+        song_nirvana.update_play_count()
+
+
+def test_update_play_counts(session, song_beatles, song_nirvana):
+    """Test incrementing several play counts at once, once per occurrence of each ID."""
+    Songs.update_play_counts([song_beatles.id, song_nirvana.id, song_beatles.id])
+    session.refresh(song_beatles)
+    session.refresh(song_nirvana)
+    assert (song_beatles.play_count, song_nirvana.play_count) == (2, 1)
+
+
+def test_update_play_counts_deleted_song(session, song_beatles, song_nirvana):
+    """Test incrementing play counts when one of the songs no longer exists."""
+    Songs.delete_song(song_nirvana.id)
+    with pytest.raises(ValueError, match="1 of 2 songs not found"):
+        Songs.update_play_counts([song_beatles.id, song_nirvana.id])
+
+
 # --- Get All Songs ---
 
 def test_get_all_songs(session, song_beatles, song_nirvana):
@@ -114,6 +294,90 @@ def test_get_all_songs_sorted(session, song_beatles, song_nirvana):
     assert sorted_songs[0]["title"] == "Smells Like Teen Spirit"
 
 
+# --- Catalog Pagination ---
+
+def test_get_songs_page(session, song_beatles, song_nirvana):
+    """Test keyset pagination returns one page and a cursor for the next."""
+    songs, next_after_id = Songs.get_songs_page(after_id=0, limit=1)
+    assert [song["title"] for song in songs] == ["Hey Jude"]
+    assert next_after_id == song_beatles.id
+
+    songs, next_after_id = Songs.get_songs_page(after_id=next_after_id, limit=1)
+    assert [song["title"] for song in songs] == ["Smells Like Teen Spirit"]
+    assert next_after_id is None
+
+
+@pytest.mark.parametrize("after_id, limit", [(-1, 10), (0, 0)])
+def test_get_songs_page_invalid(app, after_id, limit):
+    """Test invalid pagination parameters are rejected."""
+    with pytest.raises(ValueError):
+        Songs.get_songs_page(after_id=after_id, limit=limit)
+
+
+def test_iter_songs(session, song_beatles, song_nirvana):
+    """Test iterating over the catalog in batches yields every song in ID order."""
+    songs = list(Songs.iter_songs(batch_size=1))
+    assert [song["id"] for song in songs] == [song_beatles.id, song_nirvana.id]
+
+
+# --- Search ---
+
+@pytest.fixture
+def song_queen(session):
+    """Fixture for Queen - Bohemian Rhapsody."""
+    song = Songs(artist="Queen", title="Bohemian Rhapsody", year=1975, genre="Rock", duration=354)
+    session.add(song)
+    session.commit()
+    return song
+
+
+def test_search_songs_by_text(song_beatles, song_nirvana, song_queen):
+    """Test full-text search matches artist and title words, including prefixes."""
+    songs, next_offset = Songs.search_songs(query="beat")
+    assert [song["title"] for song in songs] == ["Hey Jude"]
+    assert next_offset is None
+
+    songs, _ = Songs.search_songs(query="teen spirit")
+    assert [song["artist"] for song in songs] == ["Nirvana"]
+
+
+def test_search_songs_with_facets(song_beatles, song_nirvana, song_queen):
+    """Test facet filters narrow the results without a text query."""
+    songs, _ = Songs.search_songs(genre="Rock", year_min=1970)
+    assert [song["title"] for song in songs] == ["Bohemian Rhapsody"]
+
+    songs, _ = Songs.search_songs(duration_max=360)
+    assert [song["title"] for song in songs] == ["Smells Like Teen Spirit", "Bohemian Rhapsody"]
+
+
+def test_search_songs_paginated(song_beatles, song_nirvana, song_queen):
+    """Test search results are paginated by offset."""
+    songs, next_offset = Songs.search_songs(limit=2)
+    assert len(songs) == 2
+    assert next_offset == 2
+
+    songs, next_offset = Songs.search_songs(limit=2, offset=next_offset)
+    assert [song["title"] for song in songs] == ["Bohemian Rhapsody"]
+    assert next_offset is None
+
+
+def test_search_index_follows_catalog(session, song_beatles):
+    """Test the search index is kept in sync as songs are updated and deleted."""
+    song_beatles.title = "Let It Be"
+    session.commit()
+    assert Songs.search_songs(query="jude")[0] == []
+    assert len(Songs.search_songs(query="let it")[0]) == 1
+
+    Songs.delete_song(song_beatles.id)
+    assert Songs.search_songs(query="beatles")[0] == []
+
+
+def test_search_songs_quotes_operators(song_beatles):
+    """Test FTS syntax in the query is treated as plain text."""
+    songs, _ = Songs.search_songs(query='hey "OR jude')
+    assert songs == []
+
+
 # --- Random Song ---
 
 def test_get_random_song(session, song_beatles, song_nirvana):
@@ -133,3 +397,66 @@ def test_get_random_song_empty(session):
     session.commit()
     with pytest.raises(ValueError, match="empty"):
         Songs.get_random_song()
+
+
+def test_get_random_song_by_index(session, song_beatles, song_nirvana, mocker):
+    """Test the random index maps to the matching song without loading the catalog."""
+    mocker.patch("playlist.models.song_model.get_random", return_value=2)
+    mock_get_all_songs = mocker.patch("playlist.models.song_model.Songs.get_all_songs")
+
+    song = Songs.get_random_song()
+
+    assert song["title"] == "Smells Like Teen Spirit"
+    mock_get_all_songs.assert_not_called()
+
+
+def test_get_random_song_with_id_gaps(session, song_beatles, song_nirvana, mocker):
+    """Test random selection still covers every song when IDs are not contiguous."""
+    Songs.create_song("Queen", "Bohemian Rhapsody", 1975, "Rock", 354)
+    Songs.delete_song(song_nirvana.id)
+    mocker.patch("playlist.models.song_model.get_random", return_value=2)
+
+    song = Songs.get_random_song()
+
+    assert song["title"] == "Bohemian Rhapsody"
+
+
+def test_get_random_song_stale_stats(session, song_beatles, song_nirvana, mocker):
+    """Test stale catalog stats are recounted when no song is found."""
+    assert Songs.get_catalog_stats() == (2, song_beatles.id, song_nirvana.id)
+    # Deleted outside the ORM, so the cached count and highest ID are now stale
+    session.execute(Songs.__table__.delete().where(Songs.id == song_nirvana.id))
+    session.commit()
+    mocker.patch("playlist.models.song_model.get_random", side_effect=lambda max: max)
+
+    song = Songs.get_random_song()
+
+    assert song["title"] == song_beatles.title
+
+
+def test_get_random_song_is_uniform_with_sparse_ids(session, mocker):
+    """Test every song is equally likely however large the ID gap before it."""
+    songs = [Songs(artist="Artist", title=f"Title {n}", year=2000, genre="Rock", duration=100) for n in range(10)]
+    session.add_all(songs)
+    session.commit()
+    first, last = songs[0].id, songs[-1].id
+    for song in songs[1:-1]:
+        Songs.delete_song(song.id)
+    generator = random.Random(0)
+    mocker.patch("playlist.models.song_model.get_random", side_effect=lambda max: generator.randint(1, max))
+
+    picks = Counter(Songs.get_random_song()["id"] for _ in range(2000))
+
+    assert set(picks) == {first, last}
+    assert abs(picks[first] - picks[last]) < 200, f"Expected a uniform choice, got {picks}"
+
+
+def test_get_catalog_stats_invalidated(session, song_beatles):
+    """Test the cached song count is refreshed after creating and deleting songs."""
+    assert Songs.get_catalog_stats()[0] == 1
+
+    Songs.create_song("Queen", "Bohemian Rhapsody", 1975, "Rock", 354)
+    assert Songs.get_catalog_stats()[0] == 2
+
+    Songs.delete_song(song_beatles.id)
+    assert Songs.get_catalog_stats()[0] == 1